@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from ..models.schemas import ChatRequest, ChatResponse, QueryResult, KnowledgeNodeResponse, RelationResponse
+from fastapi import APIRouter, HTTPException, Depends, Response
+from ..models.schemas import ChatRequest, ChatResponse, normalize_node_type
+from ..models.structs import NodeStruct, RelationStruct, QueryResultStruct, ChatResponseStruct
 from ..services.graphiti_service import GraphitiService
+from ..services.query_cache import TTLCache, get_data_version
+from .dependencies import get_graphiti_service
+import hashlib
+import msgspec
 import uuid
 import logging
 
@@ -8,23 +13,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-def get_graphiti_service(request: Request) -> GraphitiService:
-    return request.app.state.graphiti_service
+# The chat payload is built from trusted graphiti output, so it is encoded directly
+# with msgspec instead of going through pydantic validation + jsonable_encoder.
+_encoder = msgspec.json.Encoder()
 
-def _normalize_node_type(raw_type: str) -> str:
-    """Normalize node type from various formats to valid enum values"""
-    if not isinstance(raw_type, str):
-        return 'entity'
-    
-    # Handle enum-like strings (e.g., "NodeType.ENTITY", "nodetype.entity" -> "entity")
-    type_str = raw_type.split('.')[-1].lower() if '.' in raw_type else raw_type.lower()
-    # Remove any prefix like "nodetype"
-    node_type = type_str.replace('nodetype', '').strip('.')
-    
-    if node_type not in ['entity', 'event', 'concept', 'episode']:
-        node_type = 'entity'
-    
-    return node_type
+# Chat query results keyed by (message, limit, data version); see query_cache
+_CHAT_LIMIT = 20
+_chat_cache = TTLCache(maxsize=2048, ttl=30)
 
 @router.post("/", response_model=ChatResponse)
 async def chat(
@@ -35,20 +30,33 @@ async def chat(
     try:
         session_id = chat_req.session_id or str(uuid.uuid4())
         
+        # Identical messages are answered from cache until the graph data changes.
         # Use the same limit as temporal queries for consistency
-        response_text, query_result_data = await graphiti_service.process_chat_query(
-            message=chat_req.message,
-            session_id=session_id,
-            limit=20  # Same as temporal queries
+        cache_key = (
+            hashlib.blake2b(chat_req.message.encode(), digest_size=16).digest(),
+            _CHAT_LIMIT,
+            get_data_version()
         )
+        try:
+            response_text, query_result_data = await _chat_cache.get_or_set(
+                cache_key,
+                lambda: graphiti_service.process_chat_query(
+                    message=chat_req.message,
+                    session_id=session_id,
+                    limit=_CHAT_LIMIT
+                )
+            )
+        except Exception:
+            # Failures are not cached, so the next identical message retries
+            response_text, query_result_data = "Sorry, I encountered an error processing your query.", None
         
         query_result = None
         if query_result_data:
             nodes = [
-                KnowledgeNodeResponse(
+                NodeStruct(
                     id=node['id'],
                     name=node['name'],
-                    type=_normalize_node_type(node['type']),
+                    type=normalize_node_type(node['type']),
                     content=node['content'],
                     properties=node['properties'],
                     created_at=node['created_at'],
@@ -57,7 +65,7 @@ async def chat(
             ]
             
             relations = [
-                RelationResponse(
+                RelationStruct(
                     id=rel['id'],
                     source_id=rel['source_id'],
                     target_id=rel['target_id'],
@@ -70,17 +78,21 @@ async def chat(
                 ) for rel in query_result_data.get('relations', [])
             ]
             
-            query_result = QueryResult(
+            query_result = QueryResultStruct(
                 nodes=nodes,
                 relations=relations,
                 confidence=query_result_data['confidence'],
                 explanation=query_result_data['explanation']
             )
         
-        return ChatResponse(
-            response=response_text,
-            session_id=session_id,
-            query_result=query_result
+        # Returning a Response skips response_model validation; the model stays for OpenAPI docs
+        return Response(
+            content=_encoder.encode(ChatResponseStruct(
+                response=response_text,
+                session_id=session_id,
+                query_result=query_result
+            )),
+            media_type="application/json"
         )
         
     except Exception as e:
@@ -0,0 +1,35 @@
+import logging
+
+from fastapi import HTTPException, Request
+
+from ..services.falkordb_service import FalkorDBService
+from ..services.graphiti_service import GraphitiService
+from ..services.temporal_graphiti_service import TemporalGraphitiService, temporal_graphiti_service
+
+logger = logging.getLogger(__name__)
+
+
+# Shared request dependencies: the services are process-wide singletons created
+# in the app lifespan and stored on app.state. Kept async so FastAPI calls them
+# inline instead of dispatching to its threadpool.
+
+async def get_graphiti_service(request: Request) -> GraphitiService:
+    return request.app.state.graphiti_service
+
+async def get_falkordb_service(request: Request) -> FalkorDBService:
+    return request.app.state.falkordb_service
+
+async def get_temporal_graphiti_service() -> TemporalGraphitiService:
+    """Return the temporal service, retrying initialization if startup failed.
+
+    Handlers that dereference ``temporal_db_service`` or ``transition_engine``
+    depend on this so an uninitialized service yields 503 instead of an
+    AttributeError surfacing as 500.
+    """
+    if not temporal_graphiti_service.initialized:
+        try:
+            await temporal_graphiti_service.initialize()
+        except Exception as e:
+            logger.warning(f"Temporal service unavailable: {e}")
+            raise HTTPException(status_code=503, detail="Temporal service is not initialized")
+    return temporal_graphiti_service
@@ -3,56 +3,167 @@
 支持事件创建、查询、聚合和生命周期管理
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional, Union, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+from functools import lru_cache
+import asyncio
+import hashlib
+import logging
+import msgspec
+import uuid
+from pydantic import TypeAdapter, ValidationError
 
 from ..models.schemas import (
-    UnifiedEvent, UnifiedEventCreate, UnifiedEventResponse, 
+    UnifiedEvent, UnifiedEventCreate,
     EventFilter, EventAggregation, EventType, EventSeverity, 
     TemporalValidityState, DetectionMethod, ComponentType,
-    BaseResponse
+    BaseResponse, RelationCreate
 )
 from ..services.graphiti_service import GraphitiService
-from ..services.falkordb_service import FalkorDBService
+from ..services.falkordb_service import FalkorDBService, FalkorDBError, FalkorDBQueryError
+from ..services.falkor_event_writer import FalkorEventWriter
 from ..services.event_normalization_service import EventNormalizationService, DataSource
 from ..services.causality_engine import CausalityOrchestrator
 from ..services.state_machine_service import StateManager
 from ..services.event_deduplication_service import EventDeduplicationService, DeduplicationStrategy
+from ..services.query_cache import EVENTS_CACHE_SCOPE, TTLCache, bump_data_version
+from .responses import encoded_response
+from .dependencies import get_graphiti_service, get_falkordb_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/events", tags=["统一事件管理"])
 
-# 依赖注入
-def get_graphiti_service() -> GraphitiService:
-    return GraphitiService()
+# 批量接入时单个请求内并发写图的最大事件数
+INGEST_CONCURRENCY = 32
+
+_json_encoder = msgspec.json.Encoder()
+
+# 仪表盘轮询的概览/统计接口短期缓存：并发轮询合并为一次计算
+OVERVIEW_CACHE_TTL = 2.0
+_overview_cache = TTLCache(maxsize=8, ttl=OVERVIEW_CACHE_TTL)
+
+# 数据源字符串到枚举的映射，用于快速校验 source 参数
+_SOURCE_MAP: Dict[str, DataSource] = {ds.value: ds for ds in DataSource}
+
+# 图关系列表一次性序列化（pydantic-core 内完成，无需逐条 .dict()）
+_RELATION_LIST_ADAPTER = TypeAdapter(List[RelationCreate])
+
+# 图数据库读出的事件批量校验为 UnifiedEvent 列表（单次 pydantic-core 调用）
+_EVENT_LIST_ADAPTER = TypeAdapter(List[UnifiedEvent])
+
+# ETag 前缀带上进程启动标识，避免重启后版本号归零导致客户端误用旧缓存
+_ETAG_EPOCH = uuid.uuid4().hex[:8]
 
-def get_falkordb_service() -> FalkorDBService:
-    return FalkorDBService()
+def _make_etag(*parts: Any) -> str:
+    return 'W/"' + "-".join([_ETAG_EPOCH, *(str(p) for p in parts)]) + '"'
 
-def get_normalization_service() -> EventNormalizationService:
-    return EventNormalizationService()
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """If-None-Match 命中时返回 304 响应，否则返回 None"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
 
-def get_causality_orchestrator() -> CausalityOrchestrator:
-    return CausalityOrchestrator()
+# 依赖注入（服务实例在应用启动时创建并挂载到 app.state）
+async def get_event_writer(request: Request) -> FalkorEventWriter:
+    return request.app.state.event_writer
 
-def get_state_manager() -> StateManager:
-    return StateManager()
+async def get_normalization_service(request: Request) -> EventNormalizationService:
+    return request.app.state.normalization_service
 
-def get_deduplication_service() -> EventDeduplicationService:
-    return EventDeduplicationService()
+async def get_causality_orchestrator(request: Request) -> CausalityOrchestrator:
+    return request.app.state.causality_orchestrator
+
+async def get_state_manager(request: Request) -> StateManager:
+    return request.app.state.state_manager
+
+async def get_deduplication_service(request: Request) -> EventDeduplicationService:
+    return request.app.state.deduplication_service
 
 # =============================================================================
 # 原始事件接入和标准化
 # =============================================================================
 
+# UnifiedEvent 以 use_enum_values 存储枚举字段的字符串值
+_UNIFIED_EVENT_ENUM_FIELDS = {
+    "event_type": EventType,
+    "severity": EventSeverity,
+    "detection_method": DetectionMethod,
+    "component_type": ComponentType,
+}
+
+# 图数据库记录缺失枚举字段时使用的默认值
+_ENUM_FIELD_DEFAULTS = {
+    "event_type": "FAULT",
+    "severity": "INFO",
+    "detection_method": "MANUAL",
+    "component_type": "k8s-pod",
+}
+
+# 预先构建 值 -> 枚举成员 的查找表，逐行解码时免去 Enum.__call__ 的开销
+_ENUM_VALUE_LOOKUP = {
+    name: {member.value: member for member in enum_cls}
+    for name, enum_cls in _UNIFIED_EVENT_ENUM_FIELDS.items()
+}
+
+def _coerce_enum_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """单次遍历将枚举字段的字符串值转换为对应枚举（缺失时使用默认值）"""
+    for name, enum_cls in _UNIFIED_EVENT_ENUM_FIELDS.items():
+        value = data.get(name) or _ENUM_FIELD_DEFAULTS[name]
+        if type(value) is str:
+            member = _ENUM_VALUE_LOOKUP[name].get(value)
+            # 未知取值仍交给枚举构造，保持原有的报错行为
+            value = member if member is not None else enum_cls(value)
+        data[name] = value
+    return data
+
+# 同一批事件的时间戳重复度高，缓存解析结果（datetime 不可变，可安全共享）
+_parse_timestamp = lru_cache(maxsize=4096)(datetime.fromisoformat)
+
+def _build_unified_event(event: UnifiedEventCreate, fingerprint: str) -> UnifiedEvent:
+    """
+    将已校验的 UnifiedEventCreate 直接构造为 UnifiedEvent
+    
+    输入已经过 UnifiedEventCreate 校验，这里用 model_construct 跳过重复校验，
+    并补齐校验器原本负责生成的 event_id、fingerprint 以及缺省的 timestamp。
+    """
+    fields = dict(event.__dict__)
+    for name in _UNIFIED_EVENT_ENUM_FIELDS:
+        value = fields[name]
+        fields[name] = value.value if hasattr(value, 'value') else value
+    fields["fingerprint"] = fingerprint
+    if fields["timestamp"] is None:
+        fields["timestamp"] = datetime.now(timezone.utc)
+    return UnifiedEvent.model_construct(event_id=f"evt_{uuid.uuid4().hex[:16]}", **fields)
+
+# 写入 Graphiti 事件节点的属性字段；时间字段单独转换为ISO字符串
+_EVENT_NODE_FIELDS = (
+    "event_id", "event_type", "severity", "confidence", "source", "detection_method",
+    "fingerprint", "trace_id", "correlation_id", "service", "component", "component_type",
+    "namespace", "cluster", "region", "owner", "metrics", "evidence_refs", "ttl_sec"
+)
+_EVENT_NODE_DATETIME_FIELDS = ("timestamp", "observed_start", "observed_end")
+
+def _event_node_properties(event: UnifiedEvent) -> Dict[str, Any]:
+    """按字段表构建事件图节点属性"""
+    properties = {name: getattr(event, name) for name in _EVENT_NODE_FIELDS}
+    for name in _EVENT_NODE_DATETIME_FIELDS:
+        value = getattr(event, name)
+        properties[name] = value.isoformat() if value else None
+    return properties
+
 @router.post("/ingest/{source}", response_model=BaseResponse, summary="接入原始事件数据")
 async def ingest_raw_events(
     source: str,
     raw_events: Union[Dict[str, Any], List[Dict[str, Any]]],
     normalization_service: EventNormalizationService = Depends(get_normalization_service),
     graphiti_service: GraphitiService = Depends(get_graphiti_service),
-    falkor_service: FalkorDBService = Depends(get_falkordb_service),
-    state_manager: StateManager = Depends(get_state_manager)
+    event_writer: FalkorEventWriter = Depends(get_event_writer),
+    state_manager: StateManager = Depends(get_state_manager),
+    deduplication_service: EventDeduplicationService = Depends(get_deduplication_service)
 ):
     """
     接入原始事件数据并进行标准化处理
@@ -63,13 +174,12 @@ async def ingest_raw_events(
     - loki: Loki日志数据
     - manual: 手动输入数据
     """
+    # 验证数据源（在 try 之外，避免 400 被包装成 500）
+    data_source = _SOURCE_MAP.get(source)
+    if data_source is None:
+        raise HTTPException(status_code=400, detail=f"不支持的数据源: {source}")
+    
     try:
-        # 验证数据源
-        try:
-            data_source = DataSource(source)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"不支持的数据源: {source}")
-        
         # 转换为列表格式
         raw_event_list = raw_events if isinstance(raw_events, list) else [raw_events]
         
@@ -83,67 +193,101 @@ async def ingest_raw_events(
                 data={"processed": 0, "failed": len(raw_event_list)}
             )
         
-        # 批量创建事件
-        created_events = []
-        failed_count = 0
-        state_updates = []
+        # 创建统一事件，并按精确指纹去除同批次内的重复事件（如同一告警多次抓取）
+        unified_events = []
+        failed_errors = []
+        seen_fingerprints = set()
+        suppressed_count = 0
         
         for normalized_event in normalized_events:
             try:
-                # 创建统一事件
-                unified_event = UnifiedEvent(**normalized_event.dict())
-                
-                # 存储到图数据库
-                node_data = {
-                    "name": f"{unified_event.event_type}_{unified_event.component}",
-                    "type": "event",
-                    "content": unified_event.message,
-                    "properties": {
-                        **unified_event.dict(),
-                        "timestamp": unified_event.timestamp.isoformat(),
-                        "observed_start": unified_event.observed_start.isoformat() if unified_event.observed_start else None,
-                        "observed_end": unified_event.observed_end.isoformat() if unified_event.observed_end else None
-                    }
-                }
-                
-                # 使用Graphiti服务创建节点
-                result = await graphiti_service.create_node(
-                    name=node_data["name"],
-                    content=node_data["content"],
-                    node_type="event",
-                    properties=node_data["properties"]
+                batch_fingerprint = deduplication_service.generate_fingerprint(
+                    normalized_event, DeduplicationStrategy.EXACT_MATCH
                 )
-                
-                # 存储到FalkorDB
-                await store_event_to_falkor(unified_event, falkor_service)
-                
+            except Exception as e:
+                failed_errors.append(e)
+                continue
+            
+            if batch_fingerprint in seen_fingerprints:
+                suppressed_count += 1
+                continue
+            seen_fingerprints.add(batch_fingerprint)
+            unified_events.append(_build_unified_event(normalized_event, batch_fingerprint))
+        
+        # 批量创建事件：图写入并发执行（信号量限制并发度），状态机按原始顺序处理
+        semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
+        
+        async def _ingest_one(unified_event):
+            async with semaphore:
+                # Graphiti节点与FalkorDB事件节点相互独立，并发写入
+                node_id, _ = await asyncio.gather(
+                    graphiti_service.create_node(
+                        name=f"{unified_event.event_type}_{unified_event.component}",
+                        content=unified_event.message,
+                        node_type="event",
+                        properties=_event_node_properties(unified_event),
+                        cache_scope=EVENTS_CACHE_SCOPE
+                    ),
+                    store_event_to_falkor(unified_event, event_writer)
+                )
+            
+            return unified_event, node_id
+        
+        results = await asyncio.gather(
+            *[_ingest_one(e) for e in unified_events],
+            return_exceptions=True
+        )
+        
+        created_events = []
+        state_updates = []
+        
+        for result in results:
+            if isinstance(result, Exception):
+                failed_errors.append(result)
+                continue
+            
+            unified_event, node_id = result
+            try:
                 # 处理状态机事件
                 state_result = await state_manager.process_event(unified_event)
-                if state_result:
-                    state_updates.append({
-                        "event_id": unified_event.event_id,
-                        "state_result": state_result
-                    })
-                
-                created_events.append({
+            except Exception as e:
+                logger.warning(f"状态机处理失败: {unified_event.event_id}", exc_info=e)
+                state_result = None
+            
+            if state_result:
+                state_updates.append({
                     "event_id": unified_event.event_id,
-                    "graphiti_node_id": result.get("id"),
-                    "fingerprint": unified_event.fingerprint,
-                    "state_updated": state_result is not None
+                    "state_result": state_result
                 })
-                
-            except Exception as e:
-                print(f"创建事件失败: {e}")
-                failed_count += 1
+            
+            created_events.append({
+                "event_id": unified_event.event_id,
+                "graphiti_node_id": node_id,
+                "fingerprint": unified_event.fingerprint,
+                "state_updated": state_result is not None
+            })
+        
+        # 失败汇总为一条日志，避免失败突发时逐条输出
+        failed_count = len(failed_errors)
+        if failed_errors:
+            logger.warning(
+                f"批量接入 {source}: {failed_count}/{len(normalized_events)} 个事件创建失败",
+                exc_info=failed_errors[0]
+            )
+        
+        # 新事件入图后使查询缓存失效
+        if created_events:
+            bump_data_version(EVENTS_CACHE_SCOPE)
         
         return BaseResponse(
             success=True,
-            message=f"批量接入完成: 成功 {len(created_events)}, 失败 {failed_count}, 状态更新 {len(state_updates)}",
+            message=f"批量接入完成: 成功 {len(created_events)}, 失败 {failed_count}, 去重 {suppressed_count}, 状态更新 {len(state_updates)}",
             data={
                 "source": source,
                 "processed": len(raw_event_list),
                 "created": len(created_events),
                 "failed": failed_count,
+                "deduplicated": suppressed_count,
                 "state_updates_count": len(state_updates),
                 "events": created_events,
                 "state_updates": state_updates
@@ -153,64 +297,77 @@ async def ingest_raw_events(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"批量接入失败: {str(e)}")
 
+# 各数据源的说明与示例（静态内容，模块加载时构建一次）
+_SOURCES_INFO = {
+    "prometheus": {
+        "description": "Prometheus告警数据",
+        "example": {
+            "alertname": "HighErrorRate",
+            "labels": {
+                "service": "order-service",
+                "severity": "critical",
+                "namespace": "prod"
+            },
+            "annotations": {
+                "summary": "订单服务错误率过高",
+                "runbook_url": "http://runbook.example.com"
+            },
+            "startsAt": "2025-09-04T08:15:30Z"
+        }
+    },
+    "k8s": {
+        "description": "Kubernetes事件数据",
+        "example": {
+            "kind": "Event",
+            "reason": "CrashLoopBackOff",
+            "message": "Back-off restarting failed container",
+            "type": "Warning",
+            "involvedObject": {
+                "kind": "Pod",
+                "name": "order-service-abc123",
+                "namespace": "prod"
+            },
+            "firstTimestamp": "2025-09-04T08:15:30Z"
+        }
+    },
+    "loki": {
+        "description": "Loki日志数据",
+        "example": {
+            "message": "ERROR: Database connection timeout",
+            "timestamp": "2025-09-04T08:15:30Z",
+            "level": "error",
+            "service": "order-service",
+            "namespace": "prod"
+        }
+    }
+}
+
+# 按支持的数据源列表缓存预编码的 data 部分
+_sources_data_cache: Dict[tuple, msgspec.Raw] = {}
+
 @router.get("/sources", response_model=BaseResponse, summary="获取支持的数据源")
 async def get_supported_sources(
+    request: Request,
     normalization_service: EventNormalizationService = Depends(get_normalization_service)
 ):
     """获取支持的数据源列表和示例格式"""
+    supported_sources = tuple(normalization_service.get_supported_sources())
+    etag = _make_etag("sources", *supported_sources)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
     
-    sources_info = {
-        "prometheus": {
-            "description": "Prometheus告警数据",
-            "example": {
-                "alertname": "HighErrorRate",
-                "labels": {
-                    "service": "order-service",
-                    "severity": "critical",
-                    "namespace": "prod"
-                },
-                "annotations": {
-                    "summary": "订单服务错误率过高",
-                    "runbook_url": "http://runbook.example.com"
-                },
-                "startsAt": "2025-09-04T08:15:30Z"
-            }
-        },
-        "k8s": {
-            "description": "Kubernetes事件数据",
-            "example": {
-                "kind": "Event",
-                "reason": "CrashLoopBackOff",
-                "message": "Back-off restarting failed container",
-                "type": "Warning",
-                "involvedObject": {
-                    "kind": "Pod",
-                    "name": "order-service-abc123",
-                    "namespace": "prod"
-                },
-                "firstTimestamp": "2025-09-04T08:15:30Z"
-            }
-        },
-        "loki": {
-            "description": "Loki日志数据",
-            "example": {
-                "message": "ERROR: Database connection timeout",
-                "timestamp": "2025-09-04T08:15:30Z",
-                "level": "error",
-                "service": "order-service",
-                "namespace": "prod"
-            }
-        }
-    }
+    data = _sources_data_cache.get(supported_sources)
+    if data is None:
+        data = msgspec.Raw(_json_encoder.encode({
+            "supported_sources": list(supported_sources),
+            "source_details": _SOURCES_INFO
+        }))
+        _sources_data_cache[supported_sources] = data
     
-    return BaseResponse(
-        success=True,
-        message="数据源信息获取成功",
-        data={
-            "supported_sources": normalization_service.get_supported_sources(),
-            "source_details": sources_info
-        }
-    )
+    response = encoded_response("数据源信息获取成功", data)
+    response.headers["ETag"] = etag
+    return response
 
 @router.post("/normalize/preview", response_model=BaseResponse, summary="预览事件标准化结果")
 async def preview_normalization(
@@ -219,13 +376,12 @@ async def preview_normalization(
     normalization_service: EventNormalizationService = Depends(get_normalization_service)
 ):
     """预览原始事件的标准化结果，不实际创建事件"""
+    # 验证数据源（在 try 之外，避免 400 被包装成 500）
+    data_source = _SOURCE_MAP.get(source)
+    if data_source is None:
+        raise HTTPException(status_code=400, detail=f"不支持的数据源: {source}")
+    
     try:
-        # 验证数据源
-        try:
-            data_source = DataSource(source)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"不支持的数据源: {source}")
-        
         # 执行标准化
         normalized_event = normalization_service.normalize_event(raw_event, data_source)
         
@@ -270,14 +426,25 @@ async def analyze_event_causality(
     - 基于故障模式库的因果推理
     - 多引擎并行处理和结果融合
     """
+    # 指定事件ID时先校验数量，避免无意义的数据库查询
+    if event_ids is not None:
+        if not event_ids:
+            raise HTTPException(status_code=400, detail="event_ids 不能为空列表")
+        if len(event_ids) < 2:
+            return BaseResponse(
+                success=False,
+                message="需要至少2个事件才能进行因果分析",
+                data={"event_count": len(event_ids)}
+            )
+    
     try:
         # 获取分析事件
-        if event_ids:
+        if event_ids is not None:
             # 基于指定事件ID获取事件
             events = await get_events_by_ids(event_ids, falkor_service)
         else:
             # 获取最近时间范围内的事件
-            end_time = datetime.utcnow()
+            end_time = datetime.now(timezone.utc)
             start_time = end_time - timedelta(minutes=time_range_minutes)
             events = await get_events_by_time_range(start_time, end_time, falkor_service)
         
@@ -288,11 +455,10 @@ async def analyze_event_causality(
                 data={"event_count": len(events)}
             )
         
-        # 设置置信度阈值
-        causality_orchestrator.set_confidence_threshold(min_confidence)
-        
-        # 执行因果推理
-        causality_relations = await causality_orchestrator.infer_causality_relations(events)
+        # 执行因果推理（置信度阈值按请求传入，编排器为全局共享实例，不可修改其状态）
+        causality_relations = await causality_orchestrator.infer_causality_relations(
+            events, min_confidence=min_confidence
+        )
         
         # 生成图关系格式
         graph_relations = await causality_orchestrator.create_graph_relations(causality_relations)
@@ -301,28 +467,15 @@ async def analyze_event_causality(
         causality_stats = {
             "total_events_analyzed": len(events),
             "causality_relations_found": len(causality_relations),
-            "confidence_distribution": _calculate_confidence_distribution(causality_relations),
-            "causality_types": _calculate_causality_types(causality_relations),
-            "methods_used": _calculate_methods_used(causality_relations)
+            **_calculate_causality_statistics(causality_relations)
         }
         
-        return BaseResponse(
-            success=True,
-            message=f"因果分析完成: 发现 {len(causality_relations)} 个因果关系",
-            data={
-                "causality_relations": [
-                    {
-                        "cause_event_id": r.cause_event_id,
-                        "effect_event_id": r.effect_event_id,
-                        "causality_type": r.causality_type.value,
-                        "confidence": r.confidence,
-                        "method": r.method.value,
-                        "time_gap_seconds": r.time_gap_seconds,
-                        "evidence": r.evidence
-                    }
-                    for r in causality_relations
-                ],
-                "graph_relations": [gr.dict() for gr in graph_relations],
+        # CausalityRelation 为 dataclass，msgspec 可直接编码
+        return encoded_response(
+            f"因果分析完成: 发现 {len(causality_relations)} 个因果关系",
+            {
+                "causality_relations": causality_relations,
+                "graph_relations": msgspec.Raw(_RELATION_LIST_ADAPTER.dump_json(graph_relations)),
                 "statistics": causality_stats
             }
         )
@@ -332,11 +485,19 @@ async def analyze_event_causality(
 
 @router.get("/causality/engines", response_model=BaseResponse, summary="获取因果推理引擎状态")
 async def get_causality_engines_status(
+    request: Request,
+    response: Response,
     causality_orchestrator: CausalityOrchestrator = Depends(get_causality_orchestrator)
 ):
     """获取因果推理引擎状态和配置"""
+    etag = _make_etag("engines", causality_orchestrator.config_version)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
     try:
         status = causality_orchestrator.get_engine_status()
+        response.headers["ETag"] = etag
         
         return BaseResponse(
             success=True,
@@ -373,16 +534,14 @@ async def toggle_causality_engine(
 
 @router.get("/causality/topology", response_model=BaseResponse, summary="获取服务拓扑信息")
 async def get_service_topology(
+    request: Request,
+    response: Response,
     causality_orchestrator: CausalityOrchestrator = Depends(get_causality_orchestrator)
 ):
     """获取用于因果推理的服务拓扑信息"""
     try:
         # 从拓扑引擎获取服务拓扑
-        topology_engine = None
-        for engine in causality_orchestrator.engines:
-            if engine.name == "Topology_Causality_Engine":
-                topology_engine = engine
-                break
+        topology_engine = causality_orchestrator.engines_by_name.get("Topology_Causality_Engine")
         
         if not topology_engine:
             return BaseResponse(
@@ -391,6 +550,12 @@ async def get_service_topology(
                 data={}
             )
         
+        etag = _make_etag("topology", topology_engine.topology_version)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        response.headers["ETag"] = etag
+        
         topology_data = {
             "services": []
         }
@@ -420,7 +585,7 @@ async def get_service_topology(
 async def create_event(
     event: UnifiedEventCreate,
     graphiti_service: GraphitiService = Depends(get_graphiti_service),
-    falkor_service: FalkorDBService = Depends(get_falkordb_service),
+    event_writer: FalkorEventWriter = Depends(get_event_writer),
     state_manager: StateManager = Depends(get_state_manager),
     deduplication_service: EventDeduplicationService = Depends(get_deduplication_service)
 ):
@@ -434,55 +599,15 @@ async def create_event(
     - 存储到图数据库
     """
     try:
-        # 创建统一事件对象 - 补充缺失字段
-        event_data = event.dict()
-        
-        # 生成event_id (UUID)
-        if not event_data.get("event_id"):
-            import uuid
-            event_data["event_id"] = str(uuid.uuid4())
-        
-        # 生成fingerprint使用智能去重服务
-        if not event_data.get("fingerprint"):
-            # 设置默认值
-            if not event_data.get("timestamp"):
-                event_data["timestamp"] = datetime.utcnow()
-            
-            # 确保枚举类型正确
-            if isinstance(event_data.get("event_type"), str):
-                event_data["event_type"] = EventType(event_data["event_type"])
-            if isinstance(event_data.get("severity"), str):
-                event_data["severity"] = EventSeverity(event_data["severity"])
-            if isinstance(event_data.get("detection_method"), str):
-                event_data["detection_method"] = DetectionMethod(event_data["detection_method"])
-            if isinstance(event_data.get("component_type"), str):
-                event_data["component_type"] = ComponentType(event_data["component_type"])
-            
-            # 创建UnifiedEvent对象用于指纹生成
-            temp_event = UnifiedEvent(**event_data)
-            event_data["fingerprint"] = deduplication_service.generate_fingerprint(
-                temp_event, DeduplicationStrategy.FUZZY_MATCH
-            )
-        
-        # 设置默认timestamp (如果之前没有设置)
-        if not event_data.get("timestamp"):
-            event_data["timestamp"] = datetime.utcnow()
-        
-        # 再次确保枚举类型正确 (以防之前没有设置)
-        if isinstance(event_data.get("event_type"), str):
-            event_data["event_type"] = EventType(event_data["event_type"])
-        if isinstance(event_data.get("severity"), str):
-            event_data["severity"] = EventSeverity(event_data["severity"])  
-        if isinstance(event_data.get("detection_method"), str):
-            event_data["detection_method"] = DetectionMethod(event_data["detection_method"])
-        if isinstance(event_data.get("component_type"), str):
-            event_data["component_type"] = ComponentType(event_data["component_type"])
-            
-        unified_event = UnifiedEvent(**event_data)
+        # 指纹只依赖请求中的字段，直接基于已校验的请求模型生成，无需临时构造事件
+        fuzzy_fingerprint = deduplication_service.generate_fingerprint(
+            event, DeduplicationStrategy.FUZZY_MATCH
+        )
+        unified_event = _build_unified_event(event, event.fingerprint or fuzzy_fingerprint)
         
-        # 智能去重处理
+        # 智能去重处理（复用已算好的模糊指纹）
         is_duplicate, event_group = deduplication_service.deduplicate_event(
-            unified_event, DeduplicationStrategy.FUZZY_MATCH
+            unified_event, DeduplicationStrategy.FUZZY_MATCH, fingerprint=fuzzy_fingerprint
         )
         
         if is_duplicate:
@@ -497,70 +622,46 @@ async def create_event(
                     "group_info": {
                         "fingerprint": event_group.fingerprint,
                         "occurrence_count": event_group.occurrence_count,
-                        "first_seen": event_group.first_seen.isoformat(),
-                        "last_seen": event_group.last_seen.isoformat(),
+                        "first_seen": event_group.first_seen,
+                        "last_seen": event_group.last_seen,
                         "canonical_event_id": event_group.canonical_event.event_id
                     },
                     "deduplication_strategy": "fuzzy_match"
                 }
             )
         
-        # 创建图节点
-        node_data = {
-            "name": f"{unified_event.event_type}_{unified_event.component}",
-            "type": "event",
-            "content": unified_event.message,
-            "properties": {
-                "event_id": unified_event.event_id,
-                "event_type": unified_event.event_type,
-                "severity": unified_event.severity,
-                "confidence": unified_event.confidence,
-                "source": unified_event.source,
-                "detection_method": unified_event.detection_method,
-                "fingerprint": unified_event.fingerprint,
-                "trace_id": unified_event.trace_id,
-                "correlation_id": unified_event.correlation_id,
-                "service": unified_event.service,
-                "component": unified_event.component,
-                "component_type": unified_event.component_type,
-                "namespace": unified_event.namespace,
-                "cluster": unified_event.cluster,
-                "region": unified_event.region,
-                "owner": unified_event.owner,
-                "metrics": unified_event.metrics,
-                "evidence_refs": unified_event.evidence_refs,
-                "ttl_sec": unified_event.ttl_sec,
-                "timestamp": unified_event.timestamp.isoformat(),
-                "observed_start": unified_event.observed_start.isoformat() if unified_event.observed_start else None,
-                "observed_end": unified_event.observed_end.isoformat() if unified_event.observed_end else None
-            }
-        }
-        
         # 使用Graphiti服务创建节点
-        result = await graphiti_service.create_node(
-            name=node_data["name"],
-            content=node_data["content"],
+        node_id = await graphiti_service.create_node(
+            name=f"{unified_event.event_type}_{unified_event.component}",
+            content=unified_event.message,
             node_type="event",
-            properties=node_data["properties"]
+            properties=_event_node_properties(unified_event),
+            cache_scope=EVENTS_CACHE_SCOPE
         )
         
         # 同时存储到FalkorDB以支持高性能查询
-        await store_event_to_falkor(unified_event, falkor_service)
+        await store_event_to_falkor(unified_event, event_writer)
         
-        # 处理状态机事件
-        state_result = await state_manager.process_event(unified_event)
+        # 状态机更新不影响写入结果，入队后由后台worker处理；
+        # 需要同步拿到状态机结果的调用方使用 /state-machine/process-event
+        state_manager.enqueue_event(unified_event)
         
         return BaseResponse(
             success=True,
             message="统一事件创建成功",
             data={
                 "event_id": unified_event.event_id,
-                "graphiti_node_id": result.get("id"),
+                "graphiti_node_id": node_id,
                 "fingerprint": unified_event.fingerprint,
-                "state_machine_result": state_result
+                "state_machine_result": "queued"
             }
         )
         
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"事件数据校验失败: {str(e)}")
+    except FalkorDBError as e:
+        # 图数据库暂不可用，返回 503 让客户端退避重试
+        raise HTTPException(status_code=503, detail=f"图数据库暂不可用: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"创建事件失败: {str(e)}")
 
@@ -577,6 +678,7 @@ async def query_events(
     validity_states: Optional[List[TemporalValidityState]] = Query(None, description="有效性状态过滤"),
     limit: int = Query(20, ge=1, le=1000, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
+    include_total: bool = Query(False, description="是否统计满足条件的事件总数（额外执行一次COUNT查询）"),
     falkor_service: FalkorDBService = Depends(get_falkordb_service)
 ):
     """
@@ -604,18 +706,26 @@ async def query_events(
             offset=offset
         )
         
-        # 执行查询
-        events = await query_events_from_falkor(event_filter, start_time, end_time, falkor_service)
+        # 执行查询；需要总数时与分页查询并发执行COUNT
+        if include_total:
+            events, total_count = await asyncio.gather(
+                query_events_from_falkor(event_filter, start_time, end_time, falkor_service),
+                count_events_from_falkor(event_filter, start_time, end_time, falkor_service)
+            )
+        else:
+            events = await query_events_from_falkor(event_filter, start_time, end_time, falkor_service)
+            total_count = None
+        
+        data = {
+            "events": events,
+            "filter": event_filter.model_dump(),
+            # 本页取满说明可能还有下一页
+            "next_offset": offset + len(events) if len(events) == limit else None
+        }
+        if total_count is not None:
+            data["total_count"] = total_count
         
-        return BaseResponse(
-            success=True,
-            message=f"查询到 {len(events)} 个事件",
-            data={
-                "events": events,
-                "filter": event_filter.dict(),
-                "total_count": len(events)  # 简化实现，实际应该返回总数
-            }
-        )
+        return encoded_response(f"查询到 {len(events)} 个事件", data)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"查询事件失败: {str(e)}")
@@ -647,20 +757,19 @@ async def get_event_aggregation(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"聚合统计失败: {str(e)}")
 
+# 枚举在运行期不可变，响应 data 部分在导入时一次性编码为不可变字节
+_EVENT_TYPES_DATA = msgspec.Raw(_json_encoder.encode({
+    "event_types": [{"value": t.value, "name": t.value} for t in EventType],
+    "severities": [{"value": s.value, "name": s.value} for s in EventSeverity],
+    "detection_methods": [{"value": d.value, "name": d.value} for d in DetectionMethod],
+    "component_types": [{"value": c.value, "name": c.value} for c in ComponentType],
+    "validity_states": [{"value": v.value, "name": v.value} for v in TemporalValidityState]
+}))
+
 @router.get("/types", response_model=BaseResponse, summary="获取事件类型枚举")
 async def get_event_types():
     """获取所有可用的事件类型"""
-    return BaseResponse(
-        success=True,
-        message="事件类型枚举获取成功",
-        data={
-            "event_types": [{"value": t.value, "name": t.value} for t in EventType],
-            "severities": [{"value": s.value, "name": s.value} for s in EventSeverity],
-            "detection_methods": [{"value": d.value, "name": d.value} for d in DetectionMethod],
-            "component_types": [{"value": c.value, "name": c.value} for c in ComponentType],
-            "validity_states": [{"value": v.value, "name": v.value} for v in TemporalValidityState]
-        }
-    )
+    return encoded_response("事件类型枚举获取成功", _EVENT_TYPES_DATA)
 
 # =============================================================================
 # 事件去重管理
@@ -672,7 +781,10 @@ async def get_deduplication_stats(
 ):
     """获取事件去重系统的统计信息"""
     try:
-        stats = deduplication_service.get_deduplication_stats()
+        async def compute_stats():
+            return deduplication_service.get_deduplication_stats()
+        
+        stats = await _overview_cache.get_or_set("deduplication_stats", compute_stats)
         
         return BaseResponse(
             success=True,
@@ -691,40 +803,35 @@ async def get_event_groups(
 ):
     """获取事件去重分组列表"""
     try:
-        # 获取高频事件分组
-        frequent_groups = deduplication_service.get_event_groups_by_frequency(min_frequency)
-        
-        # 限制返回数量并转换为可序列化格式
-        limited_groups = frequent_groups[:limit]
+        # 获取出现次数最高的 limit 个分组（服务内部用有界堆筛选）
+        limited_groups = deduplication_service.get_event_groups_by_frequency(min_frequency, limit=limit)
+        total_groups = deduplication_service.count_event_groups_by_frequency(min_frequency)
         
+        # 转换为可序列化格式
         groups_data = []
         for group in limited_groups:
             group_data = {
                 "fingerprint": group.fingerprint,
                 "occurrence_count": group.occurrence_count,
-                "first_seen": group.first_seen.isoformat(),
-                "last_seen": group.last_seen.isoformat(),
+                "first_seen": group.first_seen,
+                "last_seen": group.last_seen,
                 "canonical_event": {
                     "event_id": group.canonical_event.event_id,
-                    "event_type": group.canonical_event.event_type.value,
-                    "severity": group.canonical_event.severity.value,
+                    "event_type": group.canonical_event.event_type,
+                    "severity": group.canonical_event.severity,
                     "service": group.canonical_event.service,
                     "component": group.canonical_event.component,
-                    "message": group.canonical_event.message[:200] + "..." if len(group.canonical_event.message) > 200 else group.canonical_event.message
+                    "message": group.canonical_event.message_preview
                 },
                 "aggregated_data": group.aggregated_data
             }
             groups_data.append(group_data)
         
-        return BaseResponse(
-            success=True,
-            message=f"获取到 {len(groups_data)} 个事件分组",
-            data={
-                "groups": groups_data,
-                "total_groups": len(frequent_groups),
-                "returned_count": len(groups_data)
-            }
-        )
+        return encoded_response(f"获取到 {len(groups_data)} 个事件分组", {
+            "groups": groups_data,
+            "total_groups": total_groups,
+            "returned_count": len(groups_data)
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取事件分组失败: {str(e)}")
@@ -738,24 +845,26 @@ async def analyze_event_similarity(
 ):
     """分析两个事件之间的相似度"""
     try:
-        # 从数据库获取事件
-        events1 = await get_events_by_ids([event1_id], falkor_service)
-        events2 = await get_events_by_ids([event2_id], falkor_service)
+        # 一次查询同时取回两个事件（WHERE e.event_id IN $event_ids）
+        events = await get_events_by_ids([event1_id, event2_id], falkor_service)
+        events_by_id = {event.event_id: event for event in events}
+        event1 = events_by_id.get(event1_id)
+        event2 = events_by_id.get(event2_id)
         
-        if not events1 or not events2:
+        if event1 is None or event2 is None:
             raise HTTPException(status_code=404, detail="未找到指定的事件")
         
-        event1, event2 = events1[0], events2[0]
-        
         # 计算相似度
         similarity = deduplication_service.calculate_similarity(event1, event2)
         
-        # 生成不同策略的指纹
+        # 生成不同策略的指纹（公共字段只预处理一次，各策略复用）
+        pre1 = deduplication_service.preprocess(event1)
+        pre2 = deduplication_service.preprocess(event2)
         fingerprints = {}
         for strategy in DeduplicationStrategy:
             try:
-                fp1 = deduplication_service.generate_fingerprint(event1, strategy)
-                fp2 = deduplication_service.generate_fingerprint(event2, strategy)
+                fp1 = deduplication_service.fingerprint_from_preprocessed(pre1, strategy)
+                fp2 = deduplication_service.fingerprint_from_preprocessed(pre2, strategy)
                 fingerprints[strategy.value] = {
                     "event1_fingerprint": fp1,
                     "event2_fingerprint": fp2,
@@ -781,19 +890,21 @@ async def analyze_event_similarity(
                     "event1": {
                         "service": event1.service,
                         "component": event1.component,
-                        "event_type": event1.event_type.value,
-                        "message": event1.message[:100] + "..." if len(event1.message) > 100 else event1.message
+                        "event_type": event1.event_type,
+                        "message": event1.message_summary
                     },
                     "event2": {
                         "service": event2.service,
                         "component": event2.component,
-                        "event_type": event2.event_type.value,
-                        "message": event2.message[:100] + "..." if len(event2.message) > 100 else event2.message
+                        "event_type": event2.event_type,
+                        "message": event2.message_summary
                     }
                 }
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"相似度分析失败: {str(e)}")
 
@@ -805,6 +916,7 @@ async def cleanup_event_groups(
     """清理过期的事件分组"""
     try:
         cleaned_count = deduplication_service.cleanup_old_groups(ttl_hours)
+        _overview_cache.pop("deduplication_stats")
         
         return BaseResponse(
             success=True,
@@ -812,7 +924,7 @@ async def cleanup_event_groups(
             data={
                 "cleaned_groups_count": cleaned_count,
                 "ttl_hours": ttl_hours,
-                "cleanup_time": datetime.utcnow().isoformat()
+                "cleanup_time": datetime.now(timezone.utc).isoformat()
             }
         )
         
@@ -826,11 +938,12 @@ async def reset_deduplication_stats(
     """重置去重系统的统计信息"""
     try:
         deduplication_service.reset_statistics()
+        _overview_cache.pop("deduplication_stats")
         
         return BaseResponse(
             success=True,
             message="去重统计信息已重置",
-            data={"reset_time": datetime.utcnow().isoformat()}
+            data={"reset_time": datetime.now(timezone.utc).isoformat()}
         )
         
     except Exception as e:
@@ -846,7 +959,10 @@ async def get_services_health_overview(
 ):
     """获取所有服务的健康状态概览"""
     try:
-        services_status = state_manager.get_services_status()
+        async def compute_services_status():
+            return state_manager.get_services_status()
+        
+        services_status = await _overview_cache.get_or_set("services_status", compute_services_status)
         
         return BaseResponse(
             success=True,
@@ -886,7 +1002,10 @@ async def get_episodes_overview(
 ):
     """获取所有Episode的状态概览"""
     try:
-        episodes_status = state_manager.get_episodes_status()
+        async def compute_episodes_status():
+            return state_manager.get_episodes_status()
+        
+        episodes_status = await _overview_cache.get_or_set("episodes_status", compute_episodes_status)
         
         return BaseResponse(
             success=True,
@@ -901,45 +1020,24 @@ async def get_episodes_overview(
 async def process_event_state_machine(
     event: UnifiedEventCreate,
     state_manager: StateManager = Depends(get_state_manager),
-    falkor_service: FalkorDBService = Depends(get_falkordb_service)
+    event_writer: FalkorEventWriter = Depends(get_event_writer)
 ):
     """处理事件并更新状态机状态"""
     try:
-        # 创建统一事件对象 - 补充缺失字段
-        event_data = event.dict()
-        
-        # 生成event_id (UUID)
-        if not event_data.get("event_id"):
-            import uuid
-            event_data["event_id"] = str(uuid.uuid4())
-        
-        # 生成fingerprint
-        if not event_data.get("fingerprint"):
-            import hashlib
-            fingerprint_data = f"{event_data['event_type']}:{event_data['service']}:{event_data['component']}:{event_data.get('message', '')}"
-            event_data["fingerprint"] = hashlib.sha256(fingerprint_data.encode()).hexdigest()[:16]
-        
-        # 设置默认timestamp
-        if not event_data.get("timestamp"):
-            event_data["timestamp"] = datetime.utcnow()
-        
-        # 确保枚举类型正确
-        if isinstance(event_data.get("event_type"), str):
-            event_data["event_type"] = EventType(event_data["event_type"])
-        if isinstance(event_data.get("severity"), str):
-            event_data["severity"] = EventSeverity(event_data["severity"])  
-        if isinstance(event_data.get("detection_method"), str):
-            event_data["detection_method"] = DetectionMethod(event_data["detection_method"])
-        if isinstance(event_data.get("component_type"), str):
-            event_data["component_type"] = ComponentType(event_data["component_type"])
-            
-        unified_event = UnifiedEvent(**event_data)
+        # 直接读取已校验请求模型的字段生成指纹，event_id/timestamp 由 _build_unified_event 补齐
+        fingerprint = event.fingerprint
+        if not fingerprint:
+            event_type = event.event_type.value if hasattr(event.event_type, 'value') else event.event_type
+            fingerprint_data = f"{event_type}:{event.service}:{event.component}:{event.message}"
+            fingerprint = hashlib.blake2b(fingerprint_data.encode(), digest_size=8).hexdigest()
+        
+        unified_event = _build_unified_event(event, fingerprint)
         
         # 处理状态机事件
         state_result = await state_manager.process_event(unified_event)
         
         # 同时存储事件到数据库
-        await store_event_to_falkor(unified_event, falkor_service)
+        await store_event_to_falkor(unified_event, event_writer)
         
         return BaseResponse(
             success=True,
@@ -1025,61 +1123,123 @@ async def delete_event(
 # 辅助函数
 # =============================================================================
 
+def _utc_iso(value: Optional[datetime]) -> Optional[str]:
+    """时间过滤参数转为 UTC ISO 字符串（无时区按 UTC 处理），与存储的事件时间戳按字符串比较时格式一致"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+def _enum_values(items: Optional[List[Any]]) -> Optional[List[str]]:
+    """将枚举列表转换为纯字符串列表，作为Cypher查询参数"""
+    if not items:
+        return None
+    return [item.value if hasattr(item, 'value') else item for item in items]
+
 async def check_event_fingerprint(fingerprint: str, falkor_service: FalkorDBService) -> Optional[dict]:
     """检查事件指纹是否已存在"""
-    query = f"""
-    MATCH (e:Event {{fingerprint: '{fingerprint}'}})
+    query = """
+    MATCH (e:Event {fingerprint: $fingerprint})
     RETURN e
     LIMIT 1
     """
     
     try:
-        result = await falkor_service.execute_query(query)
+        result = await falkor_service.execute_query(query, params={"fingerprint": fingerprint})
         return result[0] if result else None
-    except:
+    except FalkorDBQueryError:
+        # 查询本身出错视为未命中；连接类错误继续上抛，由调用方决定如何处理
         return None
 
 async def merge_duplicate_event(existing: dict, new_event: UnifiedEvent, falkor_service: FalkorDBService) -> dict:
     """合并重复事件"""
     # 简化实现：更新现有事件的时间范围和计数
-    update_query = f"""
-    MATCH (e:Event {{fingerprint: '{new_event.fingerprint}'}})
-    SET e.last_seen = '{new_event.timestamp.isoformat()}',
+    update_query = """
+    MATCH (e:Event {fingerprint: $fingerprint})
+    SET e.last_seen = $last_seen,
         e.occurrence_count = COALESCE(e.occurrence_count, 1) + 1
     RETURN e
     """
     
-    result = await falkor_service.execute_query(update_query)
+    result = await falkor_service.execute_query(update_query, params={
+        "fingerprint": new_event.fingerprint,
+        "last_seen": new_event.timestamp.isoformat()
+    })
+    if result:
+        bump_data_version(EVENTS_CACHE_SCOPE)
     return result[0] if result else existing
 
-async def store_event_to_falkor(event: UnifiedEvent, falkor_service: FalkorDBService):
-    """将事件存储到FalkorDB"""
-    query = f"""
-    CREATE (e:Event {{
-        event_id: '{event.event_id}',
-        event_type: '{event.event_type}',
-        severity: '{event.severity}',
-        confidence: {event.confidence},
-        timestamp: '{event.timestamp.isoformat()}',
-        source: '{event.source}',
-        detection_method: '{event.detection_method}',
-        fingerprint: '{event.fingerprint}',
-        service: '{event.service}',
-        component: '{event.component}',
-        component_type: '{event.component_type}',
-        namespace: '{event.namespace}',
-        cluster: '{event.cluster}',
-        region: '{event.region}',
-        owner: '{event.owner}',
-        message: '{event.message.replace("'", "\\'")}',
-        ttl_sec: {event.ttl_sec or 3600},
-        occurrence_count: 1,
-        created_at: '{datetime.utcnow().isoformat()}'
-    }})
+async def store_event_to_falkor(event: UnifiedEvent, event_writer: FalkorEventWriter):
+    """将事件存储到FalkorDB（经批量写入器合并为 UNWIND 批次）"""
+    props = {
+        "event_id": event.event_id,
+        "event_type": event.event_type,
+        "severity": event.severity,
+        "confidence": event.confidence,
+        "timestamp": event.timestamp.isoformat(),
+        "source": event.source,
+        "detection_method": event.detection_method,
+        "fingerprint": event.fingerprint,
+        "service": event.service,
+        "component": event.component,
+        "component_type": event.component_type,
+        "namespace": event.namespace,
+        "cluster": event.cluster,
+        "region": event.region,
+        "owner": event.owner,
+        "message": event.message,
+        "ttl_sec": event.ttl_sec or 3600,
+        "occurrence_count": 1,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    
+    await event_writer.submit(props)
+
+# 静态查询模板：所有过滤条件均以参数传入，不同过滤组合共享同一个缓存的执行计划
+_EVENT_FILTER_MATCH = """
+    MATCH (e:Event)
+    WHERE ($event_types IS NULL OR e.event_type IN $event_types)
+      AND ($severities IS NULL OR e.severity IN $severities)
+      AND ($services IS NULL OR e.service IN $services)
+      AND ($components IS NULL OR e.component IN $components)
+      AND ($namespaces IS NULL OR e.namespace IN $namespaces)
+      AND ($clusters IS NULL OR e.cluster IN $clusters)
+      AND ($owners IS NULL OR e.owner IN $owners)
+      AND ($start_time IS NULL OR e.timestamp >= $start_time)
+      AND ($end_time IS NULL OR e.timestamp <= $end_time)
+      AND ($search_query IS NULL OR e.message CONTAINS $search_query)
+    """
+
+_QUERY_EVENTS_CYPHER = _EVENT_FILTER_MATCH + """
     RETURN e
+    ORDER BY e.timestamp DESC
+    SKIP $offset
+    LIMIT $limit
     """
-    
-    return await falkor_service.execute_query(query)
+
+_COUNT_EVENTS_CYPHER = _EVENT_FILTER_MATCH + """
+    RETURN count(e) AS total
+    """
+
+def _event_filter_params(
+    event_filter: EventFilter,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime]
+) -> Dict[str, Any]:
+    """将过滤条件转换为查询模板参数，未设置的条件传 None"""
+    return {
+        "event_types": _enum_values(event_filter.event_types),
+        "severities": _enum_values(event_filter.severities),
+        "services": event_filter.services or None,
+        "components": event_filter.components or None,
+        "namespaces": event_filter.namespaces or None,
+        "clusters": event_filter.clusters or None,
+        "owners": event_filter.owners or None,
+        "start_time": _utc_iso(start_time),
+        "end_time": _utc_iso(end_time),
+        "search_query": event_filter.search_query or None
+    }
 
 async def query_events_from_falkor(
     event_filter: EventFilter, 
@@ -1088,43 +1248,22 @@ async def query_events_from_falkor(
     falkor_service: FalkorDBService
 ) -> List[dict]:
     """从FalkorDB查询事件"""
+    params = _event_filter_params(event_filter, start_time, end_time)
+    params["offset"] = event_filter.offset
+    params["limit"] = event_filter.limit
     
-    # 构建查询条件
-    conditions = []
-    
-    if event_filter.event_types:
-        types_str = "', '".join(event_filter.event_types)
-        conditions.append(f"e.event_type IN ['{types_str}']")
-        
-    if event_filter.severities:
-        severities_str = "', '".join(event_filter.severities)
-        conditions.append(f"e.severity IN ['{severities_str}']")
-        
-    if event_filter.services:
-        services_str = "', '".join(event_filter.services)
-        conditions.append(f"e.service IN ['{services_str}']")
-        
-    if start_time:
-        conditions.append(f"e.timestamp >= '{start_time.isoformat()}'")
-        
-    if end_time:
-        conditions.append(f"e.timestamp <= '{end_time.isoformat()}'")
-        
-    if event_filter.search_query:
-        conditions.append(f"e.message CONTAINS '{event_filter.search_query}'")
-    
-    where_clause = " AND ".join(conditions) if conditions else "1=1"
-    
-    query = f"""
-    MATCH (e:Event)
-    WHERE {where_clause}
-    RETURN e
-    ORDER BY e.timestamp DESC
-    SKIP {event_filter.offset}
-    LIMIT {event_filter.limit}
-    """
-    
-    return await falkor_service.execute_query(query)
+    return await falkor_service.execute_query(_QUERY_EVENTS_CYPHER, params=params)
+
+async def count_events_from_falkor(
+    event_filter: EventFilter,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    falkor_service: FalkorDBService
+) -> int:
+    """统计满足过滤条件的事件总数（与查询共用同一过滤模板）"""
+    params = _event_filter_params(event_filter, start_time, end_time)
+    result = await falkor_service.execute_query(_COUNT_EVENTS_CYPHER, params=params)
+    return result[0]['total'] if result else 0
 
 async def get_event_stats(
     start_time: Optional[datetime],
@@ -1134,50 +1273,34 @@ async def get_event_stats(
 ) -> EventAggregation:
     """获取事件统计"""
     
-    # 时间条件
-    time_conditions = []
-    if start_time:
-        time_conditions.append(f"e.timestamp >= '{start_time.isoformat()}'")
-    if end_time:
-        time_conditions.append(f"e.timestamp <= '{end_time.isoformat()}'")
-    
-    time_clause = " AND " + " AND ".join(time_conditions) if time_conditions else ""
+    # 时间条件以参数传入，查询字符串保持不变
+    params = {
+        "start_time": _utc_iso(start_time),
+        "end_time": _utc_iso(end_time)
+    }
     
-    # 基础统计查询
-    base_query = f"""
+    # 单次扫描：按 (严重程度, 类型, 服务) 组合分组计数，三个维度的分布在Python中汇总
+    stats_query = """
     MATCH (e:Event)
-    WHERE 1=1 {time_clause}
-    """
-    
-    # 总数查询
-    count_query = base_query + "RETURN count(e) as total"
-    total_result = await falkor_service.execute_query(count_query)
-    total_count = total_result[0]['total'] if total_result else 0
-    
-    # 严重程度分布
-    severity_query = base_query + """
-    RETURN e.severity as severity, count(*) as count
-    ORDER BY count DESC
+    WHERE ($start_time IS NULL OR e.timestamp >= $start_time)
+      AND ($end_time IS NULL OR e.timestamp <= $end_time)
+    RETURN e.severity as severity, e.event_type as type, e.service as service, count(*) as count
     """
-    severity_result = await falkor_service.execute_query(severity_query)
-    severity_breakdown = {r['severity']: r['count'] for r in severity_result}
+    rows = await falkor_service.execute_query(stats_query, params=params)
     
-    # 类型分布
-    type_query = base_query + """
-    RETURN e.event_type as type, count(*) as count
-    ORDER BY count DESC
-    """
-    type_result = await falkor_service.execute_query(type_query)
-    type_breakdown = {r['type']: r['count'] for r in type_result}
+    severity_counter: Counter = Counter()
+    type_counter: Counter = Counter()
+    service_counter: Counter = Counter()
+    for row in rows:
+        count = row['count']
+        severity_counter[row['severity']] += count
+        type_counter[row['type']] += count
+        service_counter[row['service']] += count
     
-    # 服务分布
-    service_query = base_query + """
-    RETURN e.service as service, count(*) as count
-    ORDER BY count DESC
-    LIMIT 10
-    """
-    service_result = await falkor_service.execute_query(service_query)
-    service_breakdown = {r['service']: r['count'] for r in service_result}
+    total_count = sum(severity_counter.values())
+    severity_breakdown = dict(severity_counter.most_common())
+    type_breakdown = dict(type_counter.most_common())
+    service_breakdown = dict(service_counter.most_common(10))
     
     return EventAggregation(
         total_count=total_count,
@@ -1195,118 +1318,106 @@ async def update_event_validity_state(
     falkor_service: FalkorDBService
 ) -> dict:
     """更新事件有效性状态"""
-    query = f"""
-    MATCH (e:Event {{event_id: '{event_id}'}})
-    SET e.validity_state = '{validity_state}',
-        e.validity_updated_at = '{datetime.utcnow().isoformat()}',
-        e.validity_reason = '{reason or ""}'
+    query = """
+    MATCH (e:Event {event_id: $event_id})
+    SET e.validity_state = $validity_state,
+        e.validity_updated_at = $updated_at,
+        e.validity_reason = $reason
     RETURN e
     """
     
-    result = await falkor_service.execute_query(query)
+    result = await falkor_service.execute_query(query, params={
+        "event_id": event_id,
+        "validity_state": validity_state.value if hasattr(validity_state, 'value') else validity_state,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "reason": reason or ""
+    })
+    if result:
+        bump_data_version(EVENTS_CACHE_SCOPE)
     return result[0] if result else {}
 
 async def remove_event_from_falkor(event_id: str, falkor_service: FalkorDBService) -> dict:
     """从FalkorDB删除事件"""
-    query = f"""
-    MATCH (e:Event {{event_id: '{event_id}'}})
+    query = """
+    MATCH (e:Event {event_id: $event_id})
     DELETE e
     RETURN count(*) as deleted_count
     """
     
-    result = await falkor_service.execute_query(query)
-    return {"deleted_count": result[0]['deleted_count'] if result else 0}
+    result = await falkor_service.execute_query(query, params={"event_id": event_id})
+    deleted_count = result[0]['deleted_count'] if result else 0
+    if deleted_count:
+        bump_data_version(EVENTS_CACHE_SCOPE)
+    return {"deleted_count": deleted_count}
 
 # =============================================================================
 # 因果分析辅助函数
 # =============================================================================
 
+def _event_record_fields(event_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """将图数据库中的 Event 节点属性映射为 UnifiedEvent 字段（简化映射，缺失时间戳取 now）"""
+    fields = _coerce_enum_fields({name: event_data.get(name) for name in _UNIFIED_EVENT_ENUM_FIELDS})
+    timestamp = event_data.get('timestamp')
+    return dict(
+        event_id=event_data.get('event_id', ''),
+        confidence=event_data.get('confidence', 1.0),
+        timestamp=_parse_timestamp(timestamp) if timestamp is not None else now,
+        source=event_data.get('source', ''),
+        fingerprint=event_data.get('fingerprint', ''),
+        service=event_data.get('service', ''),
+        component=event_data.get('component', ''),
+        namespace=event_data.get('namespace', ''),
+        cluster=event_data.get('cluster', ''),
+        region=event_data.get('region', ''),
+        owner=event_data.get('owner', ''),
+        message=event_data.get('message', ''),
+        trace_id=event_data.get('trace_id'),
+        correlation_id=event_data.get('correlation_id'),
+        **fields
+    )
+
+def _events_from_records(results: List[Dict[str, Any]]) -> List[UnifiedEvent]:
+    """将查询结果中的 Event 节点批量转换为 UnifiedEvent"""
+    now = datetime.now(timezone.utc)
+    return _EVENT_LIST_ADAPTER.validate_python([_event_record_fields(result['e'], now) for result in results])
+
 async def get_events_by_ids(event_ids: List[str], falkor_service: FalkorDBService) -> List[UnifiedEvent]:
     """根据事件ID获取事件"""
     if not event_ids:
         return []
     
-    ids_str = "', '".join(event_ids)
-    query = f"""
+    query = """
     MATCH (e:Event)
-    WHERE e.event_id IN ['{ids_str}']
+    WHERE e.event_id IN $event_ids
     RETURN e
     ORDER BY e.timestamp DESC
     """
     
-    results = await falkor_service.execute_query(query)
-    events = []
-    
-    for result in results:
-        event_data = result['e']
-        # 简化的UnifiedEvent构造（实际应该完整映射）
-        event = UnifiedEvent(
-            event_id=event_data.get('event_id', ''),
-            event_type=EventType(event_data.get('event_type', 'FAULT')),
-            severity=EventSeverity(event_data.get('severity', 'INFO')),
-            confidence=event_data.get('confidence', 1.0),
-            timestamp=datetime.fromisoformat(event_data.get('timestamp', datetime.utcnow().isoformat())),
-            source=event_data.get('source', ''),
-            detection_method=DetectionMethod(event_data.get('detection_method', 'MANUAL')),
-            fingerprint=event_data.get('fingerprint', ''),
-            service=event_data.get('service', ''),
-            component=event_data.get('component', ''),
-            component_type=ComponentType(event_data.get('component_type', 'k8s-pod')),
-            namespace=event_data.get('namespace', ''),
-            cluster=event_data.get('cluster', ''),
-            region=event_data.get('region', ''),
-            owner=event_data.get('owner', ''),
-            message=event_data.get('message', ''),
-            trace_id=event_data.get('trace_id'),
-            correlation_id=event_data.get('correlation_id')
-        )
-        events.append(event)
-    
-    return events
+    results = await falkor_service.execute_query(query, params={"event_ids": list(event_ids)})
+    return _events_from_records(results)
 
 async def get_events_by_time_range(start_time: datetime, end_time: datetime, falkor_service: FalkorDBService) -> List[UnifiedEvent]:
     """根据时间范围获取事件"""
-    query = f"""
+    query = """
     MATCH (e:Event)
-    WHERE e.timestamp >= '{start_time.isoformat()}' 
-      AND e.timestamp <= '{end_time.isoformat()}'
+    WHERE e.timestamp >= $start_time
+      AND e.timestamp <= $end_time
     RETURN e
     ORDER BY e.timestamp DESC
     LIMIT 100
     """
     
-    results = await falkor_service.execute_query(query)
-    events = []
-    
-    for result in results:
-        event_data = result['e']
-        event = UnifiedEvent(
-            event_id=event_data.get('event_id', ''),
-            event_type=EventType(event_data.get('event_type', 'FAULT')),
-            severity=EventSeverity(event_data.get('severity', 'INFO')),
-            confidence=event_data.get('confidence', 1.0),
-            timestamp=datetime.fromisoformat(event_data.get('timestamp', datetime.utcnow().isoformat())),
-            source=event_data.get('source', ''),
-            detection_method=DetectionMethod(event_data.get('detection_method', 'MANUAL')),
-            fingerprint=event_data.get('fingerprint', ''),
-            service=event_data.get('service', ''),
-            component=event_data.get('component', ''),
-            component_type=ComponentType(event_data.get('component_type', 'k8s-pod')),
-            namespace=event_data.get('namespace', ''),
-            cluster=event_data.get('cluster', ''),
-            region=event_data.get('region', ''),
-            owner=event_data.get('owner', ''),
-            message=event_data.get('message', ''),
-            trace_id=event_data.get('trace_id'),
-            correlation_id=event_data.get('correlation_id')
-        )
-        events.append(event)
-    
-    return events
+    results = await falkor_service.execute_query(query, params={
+        "start_time": _utc_iso(start_time),
+        "end_time": _utc_iso(end_time)
+    })
+    return _events_from_records(results)
 
-def _calculate_confidence_distribution(relations) -> Dict[str, int]:
-    """计算置信度分布"""
+def _calculate_causality_statistics(relations) -> Dict[str, Dict[str, int]]:
+    """单次遍历同时计算置信度分布、因果类型分布和推理方法分布"""
     distribution = {"high": 0, "medium": 0, "low": 0}
+    types: Dict[str, int] = {}
+    methods: Dict[str, int] = {}
     for relation in relations:
         if relation.confidence >= 0.8:
             distribution["high"] += 1
@@ -1314,20 +1425,15 @@ def _calculate_confidence_distribution(relations) -> Dict[str, int]:
             distribution["medium"] += 1
         else:
             distribution["low"] += 1
-    return distribution
-
-def _calculate_causality_types(relations) -> Dict[str, int]:
-    """计算因果类型分布"""
-    types = {}
-    for relation in relations:
+        
         causality_type = relation.causality_type.value
         types[causality_type] = types.get(causality_type, 0) + 1
-    return types
-
-def _calculate_methods_used(relations) -> Dict[str, int]:
-    """计算推理方法分布"""
-    methods = {}
-    for relation in relations:
+        
         method = relation.method.value
         methods[method] = methods.get(method, 0) + 1
-    return methods
\ No newline at end of file
+    
+    return {
+        "confidence_distribution": distribution,
+        "causality_types": types,
+        "methods_used": methods
+    }
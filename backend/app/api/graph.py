@@ -4,20 +4,54 @@
 
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+import asyncio
+import contextvars
+import heapq
+import json
+import logging
+import re
+import zlib
+
+import msgspec
 
 from ..models.schemas import BaseResponse
+from .responses import encoded_response
 from ..services.graphiti_service import GraphitiService
-from ..services.falkordb_service import FalkorDBService
+from ..services.falkordb_service import FalkorDBService, FULLTEXT_SEARCH_LABELS, INTERNAL_NODE_PROPERTIES
+from ..services.query_cache import EVENTS_CACHE_SCOPE, TTLCache, get_data_version
+from .dependencies import get_graphiti_service, get_falkordb_service
 
+# 图数据响应体积大，路由直接以 msgspec 编码 BaseResponse 结构，跳过 pydantic 校验
 router = APIRouter(prefix="/api/graph", tags=["图形化数据"])
 
-# 依赖注入
-def get_graphiti_service() -> GraphitiService:
-    return GraphitiService()
+logger = logging.getLogger(__name__)
+
+# 图查询读缓存：键中包含数据版本号，相关写入后旧条目自动失效
+GRAPH_CACHE_MAXSIZE = 1024
+GRAPH_CACHE_TTL = 30.0
+_graph_cache = TTLCache(maxsize=GRAPH_CACHE_MAXSIZE, ttl=GRAPH_CACHE_TTL)
+
+# 编码后超过该大小的查询结果压缩后再入缓存，降低大结果集的常驻内存
+GRAPH_CACHE_COMPRESS_THRESHOLD = 64 * 1024
+_json_encoder = msgspec.json.Encoder()
+_json_decoder = msgspec.json.Decoder()
+
+class _CompressedResult:
+    """缓存中压缩存放的查询结果（zlib 压缩的 JSON）"""
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+
+# 图统计变化缓慢，按固定周期刷新，不随数据版本失效
+GRAPH_STATS_CACHE_TTL = 60.0
+_graph_stats_cache = TTLCache(maxsize=1, ttl=GRAPH_STATS_CACHE_TTL)
 
-def get_falkordb_service() -> FalkorDBService:
-    return FalkorDBService()
+# 预热期间为预热条目的过期时间（非预热时为 None）：缓存读取改为无条件重算并按该时间写入，
+# 而不是返回尚未过期的旧条目；过期时间需覆盖预热间隔，否则条目会在下次预热前过期
+_warming: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("graph_cache_warming", default=None)
 
 @router.post("/managed-object", response_model=BaseResponse, summary="查询受管对象关系图")
 async def query_managed_object_graph(
@@ -55,11 +89,7 @@ async def query_managed_object_graph(
             falkor_service=falkor_service
         )
         
-        return BaseResponse(
-            success=True,
-            message=f"成功查询受管对象 {managed_object} 的关系图",
-            data=graph_data
-        )
+        return encoded_response(f"成功查询受管对象 {managed_object} 的关系图", graph_data)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"查询失败: {str(e)}")
@@ -74,11 +104,7 @@ async def get_node_neighbors(
     try:
         neighbors = await query_node_neighbors(node_id, depth, falkor_service)
         
-        return BaseResponse(
-            success=True,
-            message=f"成功查询节点 {node_id} 的邻居",
-            data=neighbors
-        )
+        return encoded_response(f"成功查询节点 {node_id} 的邻居", neighbors)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"查询邻居失败: {str(e)}")
@@ -99,11 +125,7 @@ async def search_graph_nodes(
             falkor_service=falkor_service
         )
         
-        return BaseResponse(
-            success=True,
-            message=f"找到 {len(search_results)} 个匹配节点",
-            data=search_results
-        )
+        return encoded_response(f"找到 {len(search_results)} 个匹配节点", search_results)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"搜索失败: {str(e)}")
@@ -116,19 +138,163 @@ async def get_graph_statistics(
     try:
         stats = await get_graph_stats(falkor_service)
         
-        return BaseResponse(
-            success=True,
-            message="成功获取图统计信息",
-            data=stats
-        )
+        return encoded_response("成功获取图统计信息", stats)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取统计信息失败: {str(e)}")
 
+@router.get("/cache/stats", response_model=BaseResponse, summary="获取图查询缓存统计")
+async def get_graph_cache_stats():
+    """获取图查询读缓存的命中统计"""
+    return encoded_response("成功获取图查询缓存统计", _graph_cache.stats())
+
+@router.post("/cache/clear", response_model=BaseResponse, summary="清空图查询缓存")
+async def clear_graph_cache():
+    """清空图查询读缓存"""
+    cleared = len(_graph_cache) + len(_graph_stats_cache)
+    _graph_cache.clear()
+    _graph_stats_cache.clear()
+    return encoded_response(f"已清空 {cleared} 条图查询缓存", {"cleared": cleared})
+
 # =============================================================================
 # 辅助函数
 # =============================================================================
 
+# 固定的参数化 Cypher 模板：查询文本恒定，FalkorDB 可直接复用已缓存的执行计划。
+# 关联查询只在服务端投影出前端展示用到的字段，避免传回完整的节点对象。
+_CYPHER = {
+    "related_services": """
+    MATCH (m:ManagedObject {name: $name})-[:MANAGES]->(s:Service)
+    RETURN s.id AS id, s.name AS name, {status: s.status} AS properties
+    LIMIT 10
+    """,
+    "related_events": """
+    MATCH (e:Event)-[:AFFECTS]->(m:ManagedObject {name: $name})
+    WHERE e.timestamp > $since
+    RETURN e.id AS id, e.message AS name, {severity: e.severity, timestamp: e.timestamp} AS properties
+    ORDER BY e.timestamp DESC
+    LIMIT 5
+    """,
+    "dependencies": """
+    MATCH (m:ManagedObject {name: $name})-[:DEPENDS_ON]->(d:Dependency)
+    RETURN d.id AS id, d.name AS name, {type: d.type} AS properties
+    LIMIT 5
+    """,
+    "search_nodes": """
+    MATCH (n)
+    WHERE (n.name CONTAINS $q OR n.label CONTAINS $q)
+      AND ($node_types IS NULL OR any(t IN labels(n) WHERE t IN $node_types))
+    RETURN n.id AS id, n.name AS name, labels(n) AS types, properties(n) AS properties
+    LIMIT $limit
+    """,
+    "fulltext_search": """
+    CALL db.idx.fulltext.queryNodes($label, $q) YIELD node, score
+    RETURN node.id AS id, node.name AS name, labels(node) AS types, properties(node) AS properties, score
+    ORDER BY score DESC
+    LIMIT $limit
+    """,
+    "labels": "CALL db.labels() YIELD label RETURN label",
+    "hot_managed_objects": """
+    MATCH (m:ManagedObject)
+    OPTIONAL MATCH (e:Event)-[:AFFECTS]->(m)
+    RETURN m.name AS name, count(e) AS event_count
+    ORDER BY event_count DESC
+    LIMIT $limit
+    """,
+    "edge_count": "MATCH ()-[r]->() RETURN count(r) AS edge_count",
+}
+
+def _neighbors_cypher(depth: int) -> str:
+    """
+    按跳逐层扩展邻居（BFS）：每一跳只保留去重后的新节点集合，
+    避免 [r*1..depth] 变长匹配先枚举全部路径再截断
+    """
+    lines = [
+        "MATCH (n {id: $node_id})-[]-(m1)",
+        "WHERE m1 <> n",
+        "WITH n, collect(DISTINCT m1) AS hop1",
+    ]
+    for hop in range(2, depth + 1):
+        frontier = f"hop{hop - 1}"
+        seen = " + ".join(f"hop{h}" for h in range(1, hop))
+        carried = ", ".join(f"hop{h}" for h in range(1, hop))
+        lines += [
+            # 上一跳为空时用 [null] 占位，保证已收集的各跳结果不因 UNWIND 空列表而丢失
+            f"UNWIND CASE WHEN size({frontier}) = 0 THEN [null] ELSE {frontier} END AS x{hop}",
+            f"OPTIONAL MATCH (x{hop})-[]-(m{hop})",
+            f"WHERE m{hop} <> n AND NOT m{hop} IN ({seen})",
+            f"WITH n, {carried}, collect(DISTINCT m{hop}) AS hop{hop}",
+        ]
+    pairs = " + ".join(f"[x IN hop{h} | [x, {h}]]" for h in range(1, depth + 1))
+    lines += [
+        f"UNWIND {pairs} AS pair",
+        "RETURN properties(pair[0]) AS neighbor, pair[1] AS hop",
+        "LIMIT 20",
+    ]
+    return "\n".join(lines)
+
+# 跳数不能参数化，按路由允许的深度 1-3 预先生成各自的固定模板
+_NEIGHBORS_CYPHER = {depth: _neighbors_cypher(depth) for depth in (1, 2, 3)}
+
+# 全文检索查询语法中的特殊字符，需要转义后才能按字面匹配
+_FULLTEXT_SPECIAL_CHARS = re.compile(r"([^\w\s])")
+
+def _fulltext_term(query: str) -> str:
+    """将搜索词转换为全文检索表达式：每个词转义后做前缀匹配，多个词同时满足"""
+    return " ".join(
+        _FULLTEXT_SPECIAL_CHARS.sub(r"\\\1", token) + "*" for token in query.split()
+    )
+
+def _label_counts_cypher(labels: List[str]) -> str:
+    """
+    为每个标签生成 MATCH (n:Label) RETURN count(n) 并以 UNION ALL 合并
+
+    按标签计数由 FalkorDB 直接从标签矩阵得出，无需像 labels(n) + UNWIND 那样扫描全部节点
+    """
+    return "\nUNION ALL\n".join(
+        "MATCH (n:`{escaped}`) RETURN '{literal}' AS node_type, count(n) AS count".format(
+            escaped=label.replace("`", "``"),
+            literal=label.replace("\\", "\\\\").replace("'", "\\'")
+        )
+        for label in labels
+    )
+
+# 受管对象一跳子查询的缓存作用域：服务与依赖只随拓扑写入失效，
+# 事件子查询还需随事件写入失效
+TOPOLOGY_CACHE_SCOPE = "topology"
+
+async def _cached_query(
+    falkor_service: FalkorDBService,
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    scope: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    带读缓存的 execute_query，键为 (查询文本, 参数, 数据版本)
+
+    scope 为空时任何写入都会使条目失效；指定后只有该作用域的写入与全局写入才会
+    """
+    key = (query, json.dumps(params, sort_keys=True, default=str), get_data_version(scope))
+    
+    async def load():
+        results = await falkor_service.execute_query(query, params=params)
+        try:
+            encoded = _json_encoder.encode(results)
+        except (TypeError, msgspec.EncodeError):
+            return results
+        if len(encoded) > GRAPH_CACHE_COMPRESS_THRESHOLD:
+            return _CompressedResult(zlib.compress(encoded, 3))
+        return results
+    
+    warm_ttl = _warming.get()
+    if warm_ttl is None:
+        cached = await _graph_cache.get_or_set(key, load)
+    else:
+        cached = await _graph_cache.refresh(key, load, ttl=warm_ttl)
+    if isinstance(cached, _CompressedResult):
+        return _json_decoder.decode(zlib.decompress(cached.payload))
+    return cached
+
 async def build_managed_object_graph(
     managed_object: str,
     depth: int,
@@ -139,81 +305,59 @@ async def build_managed_object_graph(
 ) -> Dict[str, Any]:
     """构建受管对象为中心的图数据"""
     
-    nodes = []
-    edges = []
-    
-    # 1. 添加中心受管对象节点
+    # 1. 中心受管对象节点
     center_node = {
         "id": managed_object,
         "label": managed_object,
         "type": "managed_object",
         "properties": {
             "status": "active",
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": datetime.now(timezone.utc).isoformat()
         }
     }
-    nodes.append(center_node)
     
     try:
-        # 2. 查询相关服务
-        if include_services:
-            services = await query_related_services(managed_object, falkor_service)
-            for service in services:
-                nodes.append({
-                    "id": service["id"],
-                    "label": service["name"],
-                    "type": "service",
-                    "properties": service.get("properties", {})
-                })
-                
-                # 添加管理关系边
-                edges.append({
-                    "id": f"{managed_object}-manages-{service['id']}",
-                    "source": managed_object,
-                    "target": service["id"],
-                    "type": "MANAGES",
-                    "label": "管理"
-                })
+        # 三类子查询互不依赖，并发发出以免串行等待三次往返；未请求的类别返回空列表
+        services, events, dependencies = await asyncio.gather(
+            query_related_services(managed_object, falkor_service) if include_services else _no_results(),
+            query_related_events(managed_object, falkor_service) if include_events else _no_results(),
+            query_dependencies(managed_object, falkor_service) if include_dependencies else _no_results()
+        )
         
-        # 3. 查询相关事件
-        if include_events:
-            events = await query_related_events(managed_object, falkor_service)
-            for event in events:
-                nodes.append({
-                    "id": event["id"],
-                    "label": event["name"],
-                    "type": "event",
-                    "properties": event.get("properties", {})
-                })
-                
-                # 添加影响关系边
-                edges.append({
-                    "id": f"{event['id']}-affects-{managed_object}",
-                    "source": event["id"],
-                    "target": managed_object,
-                    "type": "AFFECTS",
-                    "label": "影响"
-                })
+        # 2-4. 相关服务、事件、依赖节点，一次性由推导式生成
+        nodes = [center_node]
+        nodes += [
+            {"id": service["id"], "label": service["name"], "type": "service",
+             "properties": service.get("properties", {})}
+            for service in services
+        ]
+        nodes += [
+            {"id": event["id"], "label": event["name"], "type": "event",
+             "properties": event.get("properties", {})}
+            for event in events
+        ]
+        nodes += [
+            {"id": dep["id"], "label": dep["name"], "type": "dependency",
+             "properties": dep.get("properties", {})}
+            for dep in dependencies
+        ]
         
-        # 4. 查询依赖关系
-        if include_dependencies:
-            dependencies = await query_dependencies(managed_object, falkor_service)
-            for dep in dependencies:
-                nodes.append({
-                    "id": dep["id"],
-                    "label": dep["name"],
-                    "type": "dependency",
-                    "properties": dep.get("properties", {})
-                })
-                
-                # 添加依赖关系边
-                edges.append({
-                    "id": f"{managed_object}-depends-{dep['id']}",
-                    "source": managed_object,
-                    "target": dep["id"],
-                    "type": "DEPENDS_ON",
-                    "label": "依赖"
-                })
+        # 管理、影响、依赖关系边
+        edges = [
+            {"id": f"{managed_object}-manages-{service['id']}", "source": managed_object,
+             "target": service["id"], "type": "MANAGES", "label": "管理"}
+            for service in services
+        ]
+        edges += [
+            {"id": f"{event['id']}-affects-{managed_object}", "source": event["id"],
+             "target": managed_object, "type": "AFFECTS", "label": "影响"}
+            for event in events
+        ]
+        edges += [
+            {"id": f"{managed_object}-depends-{dep['id']}", "source": managed_object,
+             "target": dep["id"], "type": "DEPENDS_ON", "label": "依赖"}
+            for dep in dependencies
+        ]
     
     except Exception as e:
         # 如果查询失败，返回模拟数据
@@ -231,16 +375,17 @@ async def build_managed_object_graph(
         }
     }
 
+async def _no_results() -> List[Dict[str, Any]]:
+    """未请求的子查询占位"""
+    return []
+
 async def query_related_services(managed_object: str, falkor_service: FalkorDBService) -> List[Dict[str, Any]]:
     """查询相关服务"""
-    query = f"""
-    MATCH (m:ManagedObject {{name: '{managed_object}'}})-[r:MANAGES]->(s:Service)
-    RETURN s.id as id, s.name as name, s as properties
-    LIMIT 10
-    """
-    
     try:
-        results = await falkor_service.execute_query(query)
+        results = await _cached_query(
+            falkor_service, _CYPHER["related_services"],
+            params={"name": managed_object}, scope=TOPOLOGY_CACHE_SCOPE
+        )
         return [
             {
                 "id": result.get("id", f"service-{i}"),
@@ -258,16 +403,13 @@ async def query_related_services(managed_object: str, falkor_service: FalkorDBSe
 
 async def query_related_events(managed_object: str, falkor_service: FalkorDBService) -> List[Dict[str, Any]]:
     """查询相关事件"""
-    query = f"""
-    MATCH (e:Event)-[r:AFFECTS]->(m:ManagedObject {{name: '{managed_object}'}})
-    WHERE e.timestamp > '{(datetime.utcnow() - timedelta(hours=24)).isoformat()}'
-    RETURN e.id as id, e.message as name, e as properties
-    ORDER BY e.timestamp DESC
-    LIMIT 5
-    """
-    
     try:
-        results = await falkor_service.execute_query(query)
+        # 起始时间取整到分钟，使同一分钟内的请求共享缓存键
+        since = (datetime.now(timezone.utc) - timedelta(hours=24)).replace(second=0, microsecond=0)
+        results = await _cached_query(falkor_service, _CYPHER["related_events"], params={
+            "name": managed_object,
+            "since": since.isoformat()
+        }, scope=EVENTS_CACHE_SCOPE)
         return [
             {
                 "id": result.get("id", f"event-{i}"),
@@ -285,14 +427,11 @@ async def query_related_events(managed_object: str, falkor_service: FalkorDBServ
 
 async def query_dependencies(managed_object: str, falkor_service: FalkorDBService) -> List[Dict[str, Any]]:
     """查询依赖关系"""
-    query = f"""
-    MATCH (m:ManagedObject {{name: '{managed_object}'}})-[r:DEPENDS_ON]->(d:Dependency)
-    RETURN d.id as id, d.name as name, d as properties
-    LIMIT 5
-    """
-    
     try:
-        results = await falkor_service.execute_query(query)
+        results = await _cached_query(
+            falkor_service, _CYPHER["dependencies"],
+            params={"name": managed_object}, scope=TOPOLOGY_CACHE_SCOPE
+        )
         return [
             {
                 "id": result.get("id", f"dep-{i}"),
@@ -307,19 +446,20 @@ async def query_dependencies(managed_object: str, falkor_service: FalkorDBServic
             {"id": "dep-001", "name": "External API", "properties": {"type": "external"}},
         ]
 
+def _public_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """去掉仅供存储层使用的派生属性（如 *_epoch）"""
+    return {key: value for key, value in properties.items() if key not in INTERNAL_NODE_PROPERTIES}
+
 async def query_node_neighbors(node_id: str, depth: int, falkor_service: FalkorDBService) -> Dict[str, Any]:
     """查询节点邻居"""
-    query = f"""
-    MATCH (n {{id: '{node_id}'}})-[r*1..{depth}]-(neighbor)
-    RETURN neighbor, r, n
-    LIMIT 20
-    """
-    
     try:
-        results = await falkor_service.execute_query(query)
+        results = await _cached_query(falkor_service, _NEIGHBORS_CYPHER[depth], params={"node_id": node_id})
         return {
             "center_node": node_id,
-            "neighbors": results,
+            "neighbors": [
+                {**row, "neighbor": _public_properties(row["neighbor"])} if isinstance(row.get("neighbor"), dict) else row
+                for row in results
+            ],
             "depth": depth
         }
     except:
@@ -329,35 +469,58 @@ async def query_node_neighbors(node_id: str, depth: int, falkor_service: FalkorD
             "depth": depth
         }
 
+async def _fulltext_search(
+    term: str,
+    labels: List[str],
+    limit: int,
+    falkor_service: FalkorDBService
+) -> List[Dict[str, Any]]:
+    """按标签并发查询全文索引，合并后按得分取前 limit 个（多标签节点只保留一次）"""
+    per_label = await asyncio.gather(*(
+        _cached_query(falkor_service, _CYPHER["fulltext_search"], params={
+            "label": label,
+            "q": term,
+            "limit": limit
+        })
+        for label in labels
+    ))
+    unique = {}
+    for result in chain.from_iterable(per_label):
+        key = result.get("id") or id(result)
+        if key not in unique or result.get("score", 0) > unique[key].get("score", 0):
+            unique[key] = result
+    return heapq.nlargest(limit, unique.values(), key=lambda result: result.get("score", 0))
+
 async def search_nodes_in_graph(
     query: str, 
     node_types: Optional[List[str]], 
     limit: int,
     falkor_service: FalkorDBService
 ) -> List[Dict[str, Any]]:
-    """在图中搜索节点"""
-    
-    # 构建类型过滤条件
-    type_filter = ""
-    if node_types:
-        type_conditions = " OR ".join([f"'{t}' IN labels(n)" for t in node_types])
-        type_filter = f" AND ({type_conditions})"
-    
-    cypher_query = f"""
-    MATCH (n)
-    WHERE (n.name CONTAINS '{query}' OR n.label CONTAINS '{query}'){type_filter}
-    RETURN n.id as id, n.name as name, labels(n) as types, n as properties
-    LIMIT {limit}
+    """
+    在图中搜索节点
+
+    指定的类型全部建有全文索引时走全文索引，按词前缀匹配（每个词须为某个词的前缀，
+    多个词须同时出现，按得分排序）；未指定类型或包含未建索引的类型（如 TemporalEvent）
+    时退回 CONTAINS 扫描，对 name/label 做子串匹配，覆盖任意标签的节点
     """
     
     try:
-        results = await falkor_service.execute_query(cypher_query)
+        term = _fulltext_term(query)
+        if term and node_types and all(label in FULLTEXT_SEARCH_LABELS for label in node_types):
+            results = await _fulltext_search(term, node_types, limit, falkor_service)
+        else:
+            results = await _cached_query(falkor_service, _CYPHER["search_nodes"], params={
+                "q": query,
+                "node_types": node_types or None,
+                "limit": limit
+            })
         return [
             {
                 "id": result.get("id", "unknown"),
                 "name": result.get("name", "Unknown"),
                 "types": result.get("types", []),
-                "properties": result.get("properties", {})
+                "properties": _public_properties(result.get("properties") or {})
             }
             for result in results
         ]
@@ -372,36 +535,44 @@ async def search_nodes_in_graph(
             }
         ]
 
+async def _compute_graph_stats(falkor_service: FalkorDBService) -> Dict[str, Any]:
+    """计算图统计：先取标签列表，再并发执行按标签计数与边计数"""
+    labels = [row["label"] for row in await falkor_service.execute_query(_CYPHER["labels"])]
+    
+    async def count_labels() -> List[Dict[str, Any]]:
+        if not labels:
+            return []
+        return await falkor_service.execute_query(_label_counts_cypher(labels))
+    
+    results, edge_results = await asyncio.gather(
+        count_labels(),
+        falkor_service.execute_query(_CYPHER["edge_count"])
+    )
+    
+    node_counts = {}
+    total_nodes = 0
+    for result in results:
+        node_type = result.get("node_type", "unknown")
+        count = result.get("count", 0)
+        node_counts[node_type] = count
+        total_nodes += count
+    
+    total_edges = edge_results[0].get("edge_count", 0) if edge_results else 0
+    
+    return {
+        "total_nodes": total_nodes,
+        "total_edges": total_edges,
+        "node_types": node_counts,
+        "graph_density": total_edges / max(1, total_nodes * (total_nodes - 1)) if total_nodes > 1 else 0
+    }
+
 async def get_graph_stats(falkor_service: FalkorDBService) -> Dict[str, Any]:
-    """获取图统计信息"""
+    """获取图统计信息（60 秒缓存，预热写入的条目保留到下次预热；查询失败时不缓存，返回空统计）"""
     try:
-        stats_query = """
-        MATCH (n)
-        WITH labels(n) as node_types
-        UNWIND node_types as node_type
-        RETURN node_type, count(*) as count
-        """
-        
-        results = await falkor_service.execute_query(stats_query)
-        
-        node_counts = {}
-        total_nodes = 0
-        for result in results:
-            node_type = result.get("node_type", "unknown")
-            count = result.get("count", 0)
-            node_counts[node_type] = count
-            total_nodes += count
-        
-        edge_query = "MATCH ()-[r]->() RETURN count(r) as edge_count"
-        edge_results = await falkor_service.execute_query(edge_query)
-        total_edges = edge_results[0].get("edge_count", 0) if edge_results else 0
-        
-        return {
-            "total_nodes": total_nodes,
-            "total_edges": total_edges,
-            "node_types": node_counts,
-            "graph_density": total_edges / max(1, total_nodes * (total_nodes - 1)) if total_nodes > 1 else 0
-        }
+        warm_ttl = _warming.get()
+        if warm_ttl is None:
+            return await _graph_stats_cache.get_or_set("graph_stats", lambda: _compute_graph_stats(falkor_service))
+        return await _graph_stats_cache.refresh("graph_stats", lambda: _compute_graph_stats(falkor_service), ttl=warm_ttl)
     except:
         return {
             "total_nodes": 0,
@@ -410,6 +581,48 @@ async def get_graph_stats(falkor_service: FalkorDBService) -> Dict[str, Any]:
             "graph_density": 0
         }
 
+# =============================================================================
+# 缓存预热
+# =============================================================================
+
+async def warm_graph_cache(falkor_service: FalkorDBService, top_k: int, ttl: float) -> int:
+    """重新计算图统计以及受影响事件最多的 top_k 个受管对象的关系图并以 ttl 秒过期写入缓存，返回预热的对象数"""
+    token = _warming.set(ttl)
+    try:
+        await get_graph_stats(falkor_service)
+        rows = await falkor_service.execute_query(_CYPHER["hot_managed_objects"], params={"limit": top_k})
+        names = [row["name"] for row in rows if row.get("name")]
+        # gather 创建的子任务复制当前上下文，同样处于预热模式
+        await asyncio.gather(*(
+            build_managed_object_graph(
+                managed_object=name,
+                depth=2,
+                include_events=True,
+                include_services=True,
+                include_dependencies=True,
+                falkor_service=falkor_service
+            )
+            for name in names
+        ))
+        return len(names)
+    finally:
+        _warming.reset(token)
+
+async def run_graph_cache_warmer(falkor_service: FalkorDBService, interval: float, top_k: int):
+    """后台任务：启动时立即预热一次，之后每隔 interval 秒清理过期条目并重新预热"""
+    # 预热条目需存活到下一轮预热完成，在间隔之外再留出一个常规 TTL 的余量
+    warm_ttl = interval + GRAPH_CACHE_TTL
+    while True:
+        try:
+            # 数据版本变化后的旧条目不会再被命中，顺带清掉已过期的部分释放内存
+            _graph_cache.purge_expired()
+            _graph_stats_cache.purge_expired()
+            warmed = await warm_graph_cache(falkor_service, top_k, warm_ttl)
+            logger.debug(f"图缓存预热完成: {warmed} 个受管对象")
+        except Exception as e:
+            logger.warning(f"图缓存预热失败: {e}")
+        await asyncio.sleep(interval)
+
 def generate_mock_graph_data(managed_object: str) -> Dict[str, Any]:
     """生成模拟图数据"""
     return {
@@ -436,7 +649,7 @@ def generate_mock_graph_data(managed_object: str) -> Dict[str, Any]:
                 "id": "evt-001",
                 "label": "CPU使用率告警",
                 "type": "event",
-                "properties": {"severity": "warning", "timestamp": datetime.utcnow().isoformat()}
+                "properties": {"severity": "warning", "timestamp": datetime.now(timezone.utc).isoformat()}
             },
             {
                 "id": "dep-001",
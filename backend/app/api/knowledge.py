@@ -1,29 +1,97 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from typing import List, Optional
-from ..models.schemas import KnowledgeNodeCreate, KnowledgeNodeResponse, KnowledgeNodeUpdate
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
+from ..models.schemas import (
+    KnowledgeNodeCreate, KnowledgeNodeResponse, KnowledgeNodeUpdate, NodeType,
+    VALID_NODE_TYPES, normalize_node_type
+)
 from ..services.graphiti_service import GraphitiService
+from ..services.query_cache import TTLCache, get_data_version
+from .responses import MsgspecJSONResponse
+from .dependencies import get_graphiti_service
+import base64
+import hashlib
+import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 
-router = APIRouter()
+router = APIRouter(default_response_class=MsgspecJSONResponse)
 
-def get_graphiti_service(request: Request) -> GraphitiService:
-    return request.app.state.graphiti_service
+# Listing pages keyed by (search, limit, offset, cursor, data version); node writes
+# bump the data version, so cached pages never outlive a change. Bounded by entry count.
+_list_cache = TTLCache(maxsize=512, ttl=30)
 
-def _normalize_node_type(raw_type: str) -> str:
-    """Normalize node type from various formats to valid enum values"""
-    if not isinstance(raw_type, str):
-        return 'entity'
-    
-    # Handle enum-like strings (e.g., "NodeType.ENTITY", "nodetype.entity" -> "entity")
-    type_str = raw_type.split('.')[-1].lower() if '.' in raw_type else raw_type.lower()
-    # Remove any prefix like "nodetype"
-    node_type = type_str.replace('nodetype', '').strip('.')
-    
-    if node_type not in ['entity', 'event', 'concept', 'episode']:
-        node_type = 'entity'
-    
-    return node_type
+# Hot read routes declare response_model=None (the type stays in the OpenAPI
+# responses= mapping) and return pre-encoded JSON, so FastAPI neither re-validates
+# nor re-serializes the model_construct output
+_node_list_adapter = TypeAdapter(List[KnowledgeNodeResponse])
+
+def _json_response(content: bytes, headers: Optional[dict] = None) -> Response:
+    return Response(content=content, media_type="application/json", headers=headers)
+
+# Python 3.11+ fromisoformat accepts a trailing 'Z'; repeated timestamps hit the cache
+_parse_iso_timestamp = lru_cache(maxsize=4096)(datetime.fromisoformat)
+
+def _parse_timestamp(value) -> datetime:
+    """Parse a stored created_at value (datetime or ISO string), defaulting to now"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return _parse_iso_timestamp(value)
+    return datetime.now(timezone.utc)
+
+def _encode_cursor(node: dict) -> str:
+    """Encode the (created_at, id) of a page's last node as an opaque cursor"""
+    created_at = node['created_at']
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, node['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by _encode_cursor into (created_at, id)"""
+    try:
+        created_at, node_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+    return created_at, node_id
+
+def _row_to_node(node: dict, node_type: str) -> KnowledgeNodeResponse:
+    """Wrap a trusted graph row as a response model without re-running field validation"""
+    updated_at = node.get('updated_at')
+    return KnowledgeNodeResponse.model_construct(
+        id=node['id'],
+        name=node['name'],
+        type=NodeType(node_type),
+        content=node['content'],
+        properties=node.get('properties', {}),
+        created_at=_parse_timestamp(node['created_at']),
+        updated_at=_parse_timestamp(updated_at) if updated_at else None
+    )
+
+def _node_version(node: KnowledgeNodeResponse) -> str:
+    """Last-modified stamp of a node: updated_at when present, otherwise created_at"""
+    ts = node.updated_at or node.created_at
+    return ts.isoformat() if isinstance(ts, datetime) else str(ts)
+
+def _node_etag(node: KnowledgeNodeResponse) -> str:
+    return f'W/"{node.id}-{_node_version(node)}"'
+
+def _collection_etag(nodes: List[KnowledgeNodeResponse], next_cursor: Optional[str]) -> str:
+    """Weak ETag over the (id, last-modified) pairs of a listing page"""
+    digest = hashlib.blake2b(digest_size=8)
+    for node in nodes:
+        digest.update(f"{node.id}\x00{_node_version(node)}\x00".encode())
+    digest.update((next_cursor or "").encode())
+    return f'W/"{digest.hexdigest()}"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header already names this ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
 
 @router.post("/", response_model=KnowledgeNodeResponse)
 async def create_knowledge_node(
@@ -46,82 +114,100 @@ async def create_knowledge_node(
             type=node.type,
             content=node.content,
             properties=node.properties or {},
-            created_at=datetime.utcnow()
+            created_at=datetime.now(timezone.utc)
         )
         
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/", response_model=List[KnowledgeNodeResponse])
+async def _load_knowledge_page(
+    graphiti_service: GraphitiService,
+    search: str,
+    limit: int,
+    offset: int,
+    cursor: Optional[str]
+) -> Tuple[bytes, Optional[str], str]:
+    """Fetch one listing page as encoded JSON, the cursor for the next one (keyset mode only) and its ETag"""
+    next_cursor = None
+    if cursor is not None:
+        after_created_at, after_id = _decode_cursor(cursor) if cursor else (None, None)
+        nodes = await graphiti_service.list_nodes_keyset(
+            search, after_created_at=after_created_at, after_id=after_id, limit=limit
+        )
+        if nodes and len(nodes) == limit:
+            next_cursor = _encode_cursor(nodes[-1])
+    elif search:
+        # Pagination is applied by the database (SKIP/LIMIT)
+        nodes = await graphiti_service.search_nodes(search, limit=limit, offset=offset)
+    else:
+        nodes = await graphiti_service.list_nodes(limit=limit, offset=offset)
+    
+    # Unknown or missing types default to episode for GraphitiService nodes
+    result = [
+        _row_to_node(node, node.get('type') if node.get('type') in VALID_NODE_TYPES else 'episode')
+        for node in nodes
+    ]
+    body = _node_list_adapter.dump_json(result, warnings=False)
+    return body, next_cursor, _collection_etag(result, next_cursor)
+
+@router.get("/", response_model=None, responses={200: {"model": List[KnowledgeNodeResponse]}})
 async def list_knowledge_nodes(
+    request: Request,
     limit: Optional[int] = 50,
     offset: Optional[int] = 0,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
     graphiti_service: GraphitiService = Depends(get_graphiti_service)
 ):
-    """List knowledge nodes with optional search and pagination"""
+    """List knowledge nodes with optional search and pagination
+
+    Passing ``cursor`` (empty for the first page) switches to keyset pagination:
+    nodes come newest first and the ``X-Next-Cursor`` response header holds the
+    cursor for the following page. ``offset`` pagination is deprecated.
+    A matching ``If-None-Match`` header yields ``304 Not Modified``.
+    """
     try:
-        if search:
-            # For search, get more results to ensure we find matches
-            nodes = await graphiti_service.search_nodes(search, limit=limit * 2)
-        else:
-            nodes = await graphiti_service.search_nodes("", limit=limit + offset)
-        
-        # Apply offset for pagination
-        if offset > 0:
-            nodes = nodes[offset:offset + limit]
-        else:
-            nodes = nodes[:limit]
-        
-        result = []
-        for node in nodes:
-            # Handle node type mapping and validation
-            node_type = node.get('type', 'episode')
-            if not node_type or node_type not in ['entity', 'event', 'concept', 'episode']:
-                node_type = 'episode'  # Default to episode for GraphitiService nodes
-            
-            result.append(KnowledgeNodeResponse(
-                id=node['id'],
-                name=node['name'],
-                type=node_type,
-                content=node['content'],
-                properties=node.get('properties', {}),
-                created_at=node['created_at'] if isinstance(node['created_at'], datetime) else datetime.fromisoformat(node['created_at'].replace('Z', '+00:00')) if isinstance(node['created_at'], str) else datetime.utcnow(),
-                updated_at=node.get('updated_at')
-            ))
-        
-        return result
+        cache_key = (search or "", limit, offset, cursor, get_data_version())
+        body, next_cursor, etag = await _list_cache.get_or_set(
+            cache_key,
+            lambda: _load_knowledge_page(graphiti_service, search or "", limit, offset, cursor)
+        )
+        headers = {"ETag": etag}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return _json_response(body, headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{node_id}", response_model=KnowledgeNodeResponse)
+@router.get("/{node_id}", response_model=None, responses={200: {"model": KnowledgeNodeResponse}})
 async def get_knowledge_node(
     node_id: str,
+    request: Request,
     graphiti_service: GraphitiService = Depends(get_graphiti_service)
 ):
-    """Get a specific knowledge node"""
+    """Get a specific knowledge node; a matching ``If-None-Match`` yields ``304 Not Modified``"""
     try:
         node = await graphiti_service.get_node_by_id(node_id)
         
         if not node:
             raise HTTPException(status_code=404, detail="Node not found")
         
-        return KnowledgeNodeResponse(
-            id=node['id'],
-            name=node['name'],
-            type=_normalize_node_type(node.get('type', 'entity')),
-            content=node['content'],
-            properties=node.get('properties', {}),
-            created_at=node['created_at'] if isinstance(node['created_at'], datetime) else datetime.fromisoformat(node['created_at'].replace('Z', '+00:00')) if isinstance(node['created_at'], str) else datetime.utcnow(),
-            updated_at=node.get('updated_at')
-        )
+        result = _row_to_node(node, normalize_node_type(node.get('type', 'entity')))
+        etag = _node_etag(result)
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return _json_response(result.model_dump_json(warnings=False).encode(), {"ETag": etag})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.put("/{node_id}", response_model=KnowledgeNodeResponse)
+@router.put("/{node_id}", response_model=None, responses={200: {"model": KnowledgeNodeResponse}})
 async def update_knowledge_node(
     node_id: str,
     update: KnowledgeNodeUpdate,
@@ -129,8 +215,8 @@ async def update_knowledge_node(
 ):
     """Update a knowledge node"""
     try:
-        # Update the node
-        updated = await graphiti_service.update_node(
+        # The update returns the updated node, so no separate read is needed
+        node = await graphiti_service.update_node(
             node_id=node_id,
             name=update.name,
             content=update.content,
@@ -138,24 +224,11 @@ async def update_knowledge_node(
             properties=update.properties
         )
         
-        if not updated:
-            raise HTTPException(status_code=404, detail="Node not found")
-        
-        # Get the updated node
-        node = await graphiti_service.get_node_by_id(node_id)
-        
         if not node:
-            raise HTTPException(status_code=404, detail="Node not found after update")
+            raise HTTPException(status_code=404, detail="Node not found")
         
-        return KnowledgeNodeResponse(
-            id=node['id'],
-            name=node['name'],
-            type=_normalize_node_type(node.get('type', 'entity')),
-            content=node['content'],
-            properties=node.get('properties', {}),
-            created_at=node['created_at'] if isinstance(node['created_at'], datetime) else datetime.fromisoformat(node['created_at'].replace('Z', '+00:00')) if isinstance(node['created_at'], str) else datetime.utcnow(),
-            updated_at=node.get('updated_at')
-        )
+        result = _row_to_node(node, normalize_node_type(node.get('type', 'entity')))
+        return _json_response(result.model_dump_json(warnings=False).encode())
     except HTTPException:
         raise
     except Exception as e:
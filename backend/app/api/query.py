@@ -1,13 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import Optional
-from ..models.schemas import QueryRequest, QueryResult, KnowledgeNodeResponse, RelationResponse
+from ..models.schemas import QueryRequest, QueryResult, KnowledgeNodeResponse, RelationResponse, normalize_node_type
+from ..models.structs import NodeStruct
 from ..services.graphiti_service import GraphitiService
+from ..services.query_cache import TTLCache, get_data_version
+from .responses import MsgspecJSONResponse
+from .dependencies import get_graphiti_service
 from datetime import datetime
+import msgspec
 
-router = APIRouter()
+router = APIRouter(default_response_class=MsgspecJSONResponse)
 
-def get_graphiti_service(request: Request) -> GraphitiService:
-    return request.app.state.graphiti_service
+_encoder = msgspec.json.Encoder()
+
+# Encoded /search responses keyed by (q, limit, data version); see query_cache
+_search_cache = TTLCache(maxsize=1024, ttl=30)
 
 @router.post("/", response_model=QueryResult)
 async def query_knowledge_graph(
@@ -22,11 +29,12 @@ async def query_knowledge_graph(
             limit=query_req.limit
         )
         
+        # graphiti output is trusted, so skip field validation when wrapping it
         nodes = [
-            KnowledgeNodeResponse(
+            KnowledgeNodeResponse.model_construct(
                 id=node['id'],
                 name=node['name'],
-                type=node['type'],
+                type=normalize_node_type(node['type']),
                 content=node['content'],
                 properties=node['properties'],
                 created_at=node['created_at'],
@@ -35,7 +43,7 @@ async def query_knowledge_graph(
         ]
         
         relations = [
-            RelationResponse(
+            RelationResponse.model_construct(
                 id=rel['id'],
                 source_id=rel['source_id'],
                 target_id=rel['target_id'],
@@ -48,21 +56,57 @@ async def query_knowledge_graph(
             ) for rel in relations_data
         ]
         
-        confidence = min(0.9, len(nodes) / query_req.limit) if nodes else 0.1
+        # limit is optional and unbounded in the schema; clamp it so 0/None can't divide by zero
+        limit = max(query_req.limit or 1, 1)
+        node_count = len(nodes)
+        if not node_count:
+            confidence = 0.1
+        elif node_count * 10 >= limit * 9:
+            confidence = 0.9
+        else:
+            confidence = node_count / limit
         explanation = f"Found {len(nodes)} nodes and {len(relations)} relations matching your query"
         
         if query_req.timestamp:
             explanation += f" at timestamp {query_req.timestamp}"
         
-        return QueryResult(
+        result = QueryResult.model_construct(
             nodes=nodes,
             relations=relations,
             confidence=confidence,
             explanation=explanation
         )
+        # Returning a Response avoids FastAPI re-validating the constructed model
+        # against response_model; raw graph values (e.g. ISO strings) pass through as-is.
+        return Response(
+            content=result.model_dump_json(warnings=False),
+            media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _encode_search_results(graphiti_service: GraphitiService, q: str, limit: int) -> bytes:
+    """Run a node search and encode the /search response body"""
+    nodes_data = await graphiti_service.search_nodes(q, limit=limit)
+    
+    nodes = [
+        NodeStruct(
+            id=node['id'],
+            name=node['name'],
+            type=normalize_node_type(node['type']),
+            content=node['content'],
+            properties=node['properties'],
+            created_at=node['created_at'],
+            updated_at=node.get('updated_at')
+        ) for node in nodes_data
+    ]
+    
+    return _encoder.encode({
+        "query": q,
+        "results": nodes,
+        "count": len(nodes)
+    })
+
 @router.get("/search")
 async def search_nodes(
     q: str,
@@ -71,44 +115,34 @@ async def search_nodes(
 ):
     """Simple node search endpoint"""
     try:
-        nodes_data = await graphiti_service.search_nodes(q, limit=limit)
-        
-        nodes = [
-            KnowledgeNodeResponse(
-                id=node['id'],
-                name=node['name'],
-                type=node['type'],
-                content=node['content'],
-                properties=node['properties'],
-                created_at=node['created_at'],
-                updated_at=node.get('updated_at')
-            ) for node in nodes_data
-        ]
-        
-        return {
-            "query": q,
-            "results": nodes,
-            "count": len(nodes)
-        }
+        content = await _search_cache.get_or_set(
+            (q, limit, get_data_version()),
+            lambda: _encode_search_results(graphiti_service, q, limit)
+        )
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def parse_iso_ts(timestamp: Optional[str] = None) -> Optional[datetime]:
+    """Parse the ``timestamp`` query parameter, rejecting non-ISO input before the handler runs"""
+    if not timestamp:
+        return None
+    try:
+        # Python 3.11+ fromisoformat accepts a trailing 'Z' directly
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid timestamp format")
+
 @router.get("/temporal")
 async def temporal_query(
     q: str,
     timestamp: Optional[str] = None,
+    parsed_timestamp: Optional[datetime] = Depends(parse_iso_ts),
     limit: Optional[int] = 10,
     graphiti_service: GraphitiService = Depends(get_graphiti_service)
 ):
     """Temporal query endpoint"""
     try:
-        parsed_timestamp = None
-        if timestamp:
-            try:
-                parsed_timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid timestamp format")
-        
         nodes_data, relations_data = await graphiti_service.query_temporal(
             query=q,
             timestamp=parsed_timestamp,
@@ -117,6 +151,7 @@ async def temporal_query(
         
         return {
             "query": q,
+            # Echo the caller's original string; parsing only validates it
             "timestamp": timestamp,
             "nodes": nodes_data,
             "relations": relations_data,
@@ -1,14 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from ..models.schemas import RelationCreate, RelationResponse, RelationUpdate
 from ..services.graphiti_service import GraphitiService
+from .responses import MsgspecJSONResponse
+from .dependencies import get_graphiti_service
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-router = APIRouter()
-
-def get_graphiti_service(request: Request) -> GraphitiService:
-    return request.app.state.graphiti_service
+router = APIRouter(default_response_class=MsgspecJSONResponse)
 
 @router.post("/", response_model=RelationResponse)
 async def create_relation(
@@ -17,23 +16,34 @@ async def create_relation(
 ):
     """Create a new relation between nodes"""
     try:
-        # Add relation as episode
-        content = f"Relation: {relation.source_id} {relation.relation_type} {relation.target_id}"
+        # Write the edge directly (a single Cypher statement) rather than ingesting
+        # an episode, so no extraction work sits on the request path
+        properties = dict(relation.properties or {})
+        properties['weight'] = relation.weight or 1.0
         if relation.description:
-            content += f" - {relation.description}"
+            properties['description'] = relation.description
         
-        episode_id = await graphiti_service.add_episode(content)
+        rel_id = await graphiti_service.create_relationship(
+            source_id=relation.source_id,
+            target_id=relation.target_id,
+            relation_type=relation.relation_type.value,
+            properties=properties
+        )
+        if rel_id is None:
+            raise HTTPException(status_code=404, detail="Source or target node not found")
         
         return RelationResponse(
-            id=episode_id,
+            id=rel_id,
             source_id=relation.source_id,
             target_id=relation.target_id,
             relation_type=relation.relation_type,
             description=relation.description,
             weight=relation.weight or 1.0,
             properties=relation.properties or {},
-            created_at=datetime.utcnow()
+            created_at=datetime.now(timezone.utc)
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -99,10 +109,12 @@ async def delete_relation(
 ):
     """Delete a relation"""
     try:
-        await graphiti_service.add_episode(
-            content=f"Deleted relation: {relation_id}"
-        )
+        deleted = await graphiti_service.delete_relationship(relation_id)
+        if not deleted:
+            raise HTTPException(status_code=404, detail="Relation not found")
         
         return {"message": "Relation deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from typing import Any
+
+import msgspec
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+_encoder = msgspec.json.Encoder()
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response rendered with msgspec instead of the stdlib json module"""
+
+    def render(self, content: Any) -> bytes:
+        return _encoder.encode(content)
+
+
+def encoded_response(message: str, data: Any, success: bool = True) -> Response:
+    """Encode a BaseResponse-shaped body directly, skipping pydantic validation and jsonable_encoder"""
+    return Response(
+        content=_encoder.encode({
+            "success": success,
+            "message": message,
+            "data": data,
+            "timestamp": datetime.now(timezone.utc)
+        }),
+        media_type="application/json"
+    )
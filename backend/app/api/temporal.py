@@ -1,19 +1,127 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict, Any
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pydantic import BaseModel, Field
+import msgspec
 from ..models.schemas import (
     TemporalQueryRequest, TemporalQueryResult, TimeInterval, 
-    TemporalValidityState, KnowledgeNodeResponse, RelationResponse, BaseResponse
+    TemporalValidityState, KnowledgeNodeResponse, RelationResponse, BaseResponse,
+    NodeType, normalize_node_type
 )
 from ..services.graphiti_service import GraphitiService
-from ..services.temporal_graphiti_service import temporal_graphiti_service
+from ..services.temporal_graphiti_service import TemporalGraphitiService, temporal_graphiti_service
+from ..services.query_cache import TTLCache, get_data_version
+from .responses import encoded_response
+from .dependencies import get_graphiti_service, get_temporal_graphiti_service
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_json_encoder = msgspec.json.Encoder()
+
+# 流式 NDJSON 输出时每次编码并发送的转换记录条数
+_NDJSON_CHUNK_SIZE = 500
+
+# Python 3.11+ 的 fromisoformat 直接支持结尾的 'Z'；节点间 valid_from 等时间戳重复度高，缓存解析结果
+_parse_iso = lru_cache(maxsize=8192)(datetime.fromisoformat)
+
+
+@lru_cache(maxsize=8192)
+def _utc_epoch(value: str) -> float:
+    """ISO 时间字符串转 UTC 秒级时间戳（无时区按 UTC 处理，与 TimeInterval 的归一化规则一致）"""
+    dt = _parse_iso(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _validity_properties(valid_from: Optional[datetime] = None,
+                         valid_until: Optional[datetime] = None) -> Dict[str, Any]:
+    """有效期节点属性（ISO 字符串）；对应的 *_epoch 由 FalkorDBService 写入节点时统一生成"""
+    properties: Dict[str, Any] = {}
+    for name, value in (('valid_from', valid_from), ('valid_until', valid_until)):
+        if value is not None:
+            properties[name] = value.isoformat()
+    return properties
+
+
+def _validity_bound(properties: Dict[str, Any], name: str) -> Optional[float]:
+    """读取有效期边界的 UTC 秒数，优先使用 *_epoch 属性，旧数据回退到解析 ISO 字符串"""
+    epoch = properties.get(f'{name}_epoch')
+    if isinstance(epoch, (int, float)):
+        return epoch
+    value = properties.get(name)
+    return _utc_epoch(value) if value else None
+
+
+@dataclass(frozen=True)
+class _ValidityIndex:
+    """节点有效期索引：有效区间的起止时间各自排序，任意时间点的状态分布可用二分查找计数"""
+    total_nodes: int
+    untimed: int  # 无时序属性，视为有效
+    unknown: int  # 时间无法解析或区间倒置
+    starts: List[float]  # 有起始时间的区间，升序
+    ends: List[float]  # 有结束时间的区间，升序
+    interval_count: int
+
+    def counts_at(self, now: float) -> Dict[str, int]:
+        # 区间合法（end > start），故 end < now 的区间不可能同时处于 pending
+        pending = len(self.starts) - bisect_right(self.starts, now)
+        expired = bisect_left(self.ends, now)
+        return {
+            "valid": self.untimed + self.interval_count - pending - expired,
+            "invalid": 0,
+            "pending": pending,
+            "expired": expired,
+            "unknown": self.unknown
+        }
+
+
+def _build_validity_index(rows: List[Dict[str, Any]]) -> _ValidityIndex:
+    """由 get_validity_bounds 返回的有效期属性行构建索引"""
+    untimed = unknown = interval_count = 0
+    starts: List[float] = []
+    ends: List[float] = []
+    for properties in rows:
+        valid_from_str = properties.get('valid_from')
+        valid_until_str = properties.get('valid_until')
+        
+        if not valid_from_str and not valid_until_str:
+            untimed += 1
+            continue
+        
+        try:
+            start = _validity_bound(properties, 'valid_from')
+            end = _validity_bound(properties, 'valid_until')
+        except (TypeError, ValueError):
+            unknown += 1
+            continue
+        
+        if start is not None and end is not None and end <= start:
+            unknown += 1  # 与 TimeInterval 校验一致：倒置区间计为 unknown
+            continue
+        
+        interval_count += 1
+        if start is not None:
+            starts.append(start)
+        if end is not None:
+            ends.append(end)
+    
+    starts.sort()
+    ends.sort()
+    return _ValidityIndex(len(rows), untimed, unknown, starts, ends, interval_count)
+
+
+# 按数据版本缓存有效期索引；节点写入会递增版本号，索引随之重建
+_validity_index_cache = TTLCache(maxsize=4, ttl=300)
+
 # === Enhanced Request Models for New Temporal Features ===
 
 class TemporalEventCreate(BaseModel):
@@ -59,24 +167,6 @@ class TimeRangeQueryRequest(BaseModel):
     states: Optional[List[str]] = Field(None, description="状态过滤")
     include_lifecycle: Optional[bool] = Field(False, description="是否包含生命周期分析")
 
-def get_graphiti_service(request: Request) -> GraphitiService:
-    return request.app.state.graphiti_service
-
-def _normalize_node_type(raw_type: str) -> str:
-    """Normalize node type from various formats to valid enum values"""
-    if not isinstance(raw_type, str):
-        return 'entity'
-    
-    # Handle enum-like strings (e.g., "NodeType.ENTITY", "nodetype.entity" -> "entity")
-    type_str = raw_type.split('.')[-1].lower() if '.' in raw_type else raw_type.lower()
-    # Remove any prefix like "nodetype"
-    node_type = type_str.replace('nodetype', '').strip('.')
-    
-    if node_type not in ['entity', 'event', 'concept', 'episode']:
-        node_type = 'entity'
-    
-    return node_type
-
 @router.post("/query", response_model=TemporalQueryResult)
 async def temporal_query(
     query_req: TemporalQueryRequest,
@@ -93,7 +183,7 @@ async def temporal_query(
         filtered_nodes = []
         validity_counts = {"valid": 0, "invalid": 0, "pending": 0, "expired": 0}
         
-        query_time = query_req.at_time or datetime.utcnow()
+        query_time = query_req.at_time or datetime.now(timezone.utc)
         
         for node in all_nodes:
             # Create time interval from node properties
@@ -107,13 +197,13 @@ async def temporal_query(
                 
                 if valid_from_str:
                     try:
-                        start_time = datetime.fromisoformat(valid_from_str.replace('Z', '+00:00'))
+                        start_time = _parse_iso(valid_from_str)
                     except:
                         pass
                         
                 if valid_until_str:
                     try:
-                        end_time = datetime.fromisoformat(valid_until_str.replace('Z', '+00:00'))
+                        end_time = _parse_iso(valid_until_str)
                     except:
                         pass
                         
@@ -124,10 +214,10 @@ async def temporal_query(
             validity_state = TemporalValidityState.VALID
             if valid_time:
                 validity_state = valid_time.get_validity_state(query_time)
-                if query_req.at_time:  # Point-in-time query
-                    is_valid_at_time = valid_time.is_valid_at(query_req.at_time)
-                    if not is_valid_at_time:
-                        validity_state = TemporalValidityState.INVALID
+                # Point-in-time query: query_time is at_time, so any non-valid state
+                # means the interval does not contain it
+                if query_req.at_time and validity_state != TemporalValidityState.VALID:
+                    validity_state = TemporalValidityState.INVALID
             
             # Apply validity filter
             if query_req.validity_filter and validity_state != query_req.validity_filter:
@@ -135,16 +225,21 @@ async def temporal_query(
             
             validity_counts[validity_state.value] += 1
             
-            # Create enhanced node response
-            enhanced_node = KnowledgeNodeResponse(
+            # Create enhanced node response; graph rows are trusted, so skip field validation
+            created_at = node['created_at']
+            if not isinstance(created_at, datetime):
+                created_at = _parse_iso(created_at)
+            updated_at = node.get('updated_at')
+            if isinstance(updated_at, str):
+                updated_at = _parse_iso(updated_at)
+            enhanced_node = KnowledgeNodeResponse.model_construct(
                 id=node['id'],
                 name=node['name'],
-                type=_normalize_node_type(node.get('type', 'entity')),
+                type=NodeType(normalize_node_type(node.get('type', 'entity'))),
                 content=node['content'],
                 properties=node.get('properties', {}),
-                created_at=node['created_at'] if isinstance(node['created_at'], datetime) 
-                    else datetime.fromisoformat(node['created_at'].replace('Z', '+00:00')),
-                updated_at=node.get('updated_at'),
+                created_at=created_at,
+                updated_at=updated_at,
                 valid_time=valid_time,
                 validity_state=validity_state
             )
@@ -184,39 +279,16 @@ async def get_validity_states(
 ):
     """Get count of nodes by validity state"""
     try:
-        all_nodes = await graphiti_service.search_nodes("", limit=1000)  # Get all nodes
+        async def build_index() -> _ValidityIndex:
+            # 只取回四个有效期属性，而非完整节点
+            return _build_validity_index(await graphiti_service.get_validity_bounds(limit=1000))
         
-        validity_counts = {"valid": 0, "invalid": 0, "pending": 0, "expired": 0, "unknown": 0}
-        current_time = datetime.utcnow()
-        
-        for node in all_nodes:
-            # Check for temporal properties
-            properties = node.get('properties', {})
-            valid_from_str = properties.get('valid_from')
-            valid_until_str = properties.get('valid_until')
-            
-            if not valid_from_str and not valid_until_str:
-                validity_counts["valid"] += 1  # Default to valid if no temporal info
-                continue
-                
-            try:
-                start_time = None
-                end_time = None
-                
-                if valid_from_str:
-                    start_time = datetime.fromisoformat(valid_from_str.replace('Z', '+00:00'))
-                if valid_until_str:
-                    end_time = datetime.fromisoformat(valid_until_str.replace('Z', '+00:00'))
-                
-                time_interval = TimeInterval(start_time=start_time, end_time=end_time)
-                validity_state = time_interval.get_validity_state(current_time)
-                validity_counts[validity_state.value] += 1
-                
-            except Exception:
-                validity_counts["unknown"] += 1
+        index = await _validity_index_cache.get_or_set(get_data_version(), build_index)
+        current_time = datetime.now(timezone.utc)
+        validity_counts = index.counts_at(current_time.timestamp())
         
         return {
-            "total_nodes": len(all_nodes),
+            "total_nodes": index.total_nodes,
             "validity_breakdown": validity_counts,
             "query_time": current_time
         }
@@ -241,10 +313,7 @@ async def set_node_validity(
         
         # Update properties with temporal info
         properties = node.get('properties', {})
-        if valid_from:
-            properties['valid_from'] = valid_from.isoformat()
-        if valid_until:
-            properties['valid_until'] = valid_until.isoformat()
+        properties.update(_validity_properties(valid_from, valid_until))
         
         # Update the node
         await graphiti_service.update_node(
@@ -271,7 +340,7 @@ async def create_temporal_demo_data(
 ):
     """Create demo data to showcase temporal features"""
     try:
-        current_time = datetime.utcnow()
+        current_time = datetime.now(timezone.utc)
         
         # Create nodes with different temporal states
         demo_nodes = [
@@ -280,7 +349,7 @@ async def create_temporal_demo_data(
                 "content": "Software engineer currently employed at the company",
                 "type": "entity",
                 "properties": {
-                    "valid_from": (current_time - timedelta(days=365)).isoformat(),
+                    **_validity_properties(current_time - timedelta(days=365)),
                     "employment_status": "active"
                 }
             },
@@ -289,8 +358,7 @@ async def create_temporal_demo_data(
                 "content": "Former project manager who left the company",
                 "type": "entity",
                 "properties": {
-                    "valid_from": (current_time - timedelta(days=730)).isoformat(),
-                    "valid_until": (current_time - timedelta(days=30)).isoformat(),
+                    **_validity_properties(current_time - timedelta(days=730), current_time - timedelta(days=30)),
                     "employment_status": "terminated"
                 }
             },
@@ -299,8 +367,7 @@ async def create_temporal_demo_data(
                 "content": "Upcoming AI project scheduled to start next month",
                 "type": "event",
                 "properties": {
-                    "valid_from": (current_time + timedelta(days=30)).isoformat(),
-                    "valid_until": (current_time + timedelta(days=365)).isoformat(),
+                    **_validity_properties(current_time + timedelta(days=30), current_time + timedelta(days=365)),
                     "project_status": "planned"
                 }
             },
@@ -309,22 +376,26 @@ async def create_temporal_demo_data(
                 "content": "Old remote work policy that was replaced",
                 "type": "concept",
                 "properties": {
-                    "valid_from": (current_time - timedelta(days=1000)).isoformat(), 
-                    "valid_until": (current_time - timedelta(days=90)).isoformat(),
+                    **_validity_properties(current_time - timedelta(days=1000), current_time - timedelta(days=90)),
                     "policy_version": "1.0"
                 }
             }
         ]
         
-        created_nodes = []
-        for node_data in demo_nodes:
-            node_id = await graphiti_service.create_node(
+        # Independent writes: issue them concurrently
+        node_ids = await asyncio.gather(*[
+            graphiti_service.create_node(
                 name=node_data["name"],
                 content=node_data["content"],
                 node_type=node_data["type"],
                 properties=node_data["properties"]
             )
-            created_nodes.append({"id": node_id, "name": node_data["name"]})
+            for node_data in demo_nodes
+        ])
+        created_nodes = [
+            {"id": node_id, "name": node_data["name"]}
+            for node_id, node_data in zip(node_ids, demo_nodes)
+        ]
         
         return {
             "message": "Temporal demo data created successfully",
@@ -344,15 +415,14 @@ async def create_temporal_demo_data(
 # === Enhanced Temporal API Endpoints ===
 
 @router.post("/events", response_model=BaseResponse)
-async def create_temporal_event(event_data: TemporalEventCreate):
+async def create_temporal_event(
+    event_data: TemporalEventCreate,
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
     """创建时序事件"""
     try:
-        # 初始化服务
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
-        # 转换为服务期望的格式
-        event_dict = event_data.dict()
+        # 转换为服务期望的格式；省略 None 字段，服务端的 .get(key, 默认值) 才能生效
+        event_dict = event_data.model_dump(exclude_none=True, mode='json')
         
         # 设置默认时间
         if not event_dict.get('occurrence_time'):
@@ -361,7 +431,7 @@ async def create_temporal_event(event_data: TemporalEventCreate):
             event_dict['validity_start'] = event_dict['occurrence_time']
         
         # 创建事件
-        event_id = await temporal_graphiti_service.create_temporal_event(event_dict)
+        event_id = await temporal_service.create_temporal_event(event_dict)
         
         logger.info(f"Created temporal event via API: {event_id}")
         
@@ -376,14 +446,14 @@ async def create_temporal_event(event_data: TemporalEventCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/events/{event_id}", response_model=BaseResponse)
-async def get_temporal_event(event_id: str):
+async def get_temporal_event(
+    event_id: str,
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
     """获取指定时序事件"""
     try:
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
         # 获取事件数据
-        event_data = await temporal_graphiti_service.temporal_db_service.get_temporal_event(event_id)
+        event_data = await temporal_service.temporal_db_service.get_temporal_event(event_id)
         
         if not event_data:
             raise HTTPException(status_code=404, detail="事件未找到")
@@ -400,14 +470,15 @@ async def get_temporal_event(event_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/events/{event_id}/transition", response_model=BaseResponse)
-async def trigger_state_transition(event_id: str, request: StateTransitionRequest):
+async def trigger_state_transition(
+    event_id: str,
+    request: StateTransitionRequest,
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
     """触发事件状态转换"""
     try:
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
         # 执行状态转换
-        result = await temporal_graphiti_service.trigger_event_state_transition(
+        result = await temporal_service.trigger_event_state_transition(
             event_id, 
             request.trigger_data
         )
@@ -423,14 +494,15 @@ async def trigger_state_transition(event_id: str, request: StateTransitionReques
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/events/{event_id}/state", response_model=BaseResponse)
-async def manual_state_change(event_id: str, request: ManualStateChangeRequest):
+async def manual_state_change(
+    event_id: str,
+    request: ManualStateChangeRequest,
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
     """手动变更事件状态"""
     try:
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
         # 执行手动状态变更
-        result = await temporal_graphiti_service.manual_state_change(
+        result = await temporal_service.manual_state_change(
             event_id=event_id,
             target_state=request.target_state,
             reason=request.reason,
@@ -448,14 +520,14 @@ async def manual_state_change(event_id: str, request: ManualStateChangeRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/events/{event_id}/lifecycle", response_model=BaseResponse)
-async def get_event_lifecycle(event_id: str):
+async def get_event_lifecycle(
+    event_id: str,
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
     """获取事件完整生命周期"""
     try:
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
         # 获取生命周期数据
-        lifecycle = await temporal_graphiti_service.get_event_lifecycle(event_id)
+        lifecycle = await temporal_service.get_event_lifecycle(event_id)
         
         if not lifecycle:
             raise HTTPException(status_code=404, detail="事件生命周期未找到")
@@ -472,12 +544,12 @@ async def get_event_lifecycle(event_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/query/time-point", response_model=BaseResponse)
-async def query_events_at_time_point(request: TimePointQueryRequest):
+async def query_events_at_time_point(
+    request: TimePointQueryRequest,
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
     """查询指定时间点的有效事件"""
     try:
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
         # 构建过滤器
         filters = {}
         if request.event_types:
@@ -488,22 +560,24 @@ async def query_events_at_time_point(request: TimePointQueryRequest):
             filters['states'] = request.states
         
         # 执行查询
-        events = await temporal_graphiti_service.get_temporal_events_at_time(
+        events = await temporal_service.get_temporal_events_at_time(
             request.query_time, 
             filters if filters else None
         )
         
         # 如果需要包含状态转换历史
         if request.include_transitions:
-            enhanced_events = []
-            for event in events:
-                event_id = event.get('event_id')
+            # 一次批量查询取回所有事件的转换历史，避免逐个事件往返数据库
+            # 结果行形如 {'event': {...}}，事件属性在 'event' 键下
+            event_ids = [
+                row['event']['event_id'] for row in events
+                if row.get('event', {}).get('event_id')
+            ]
+            transitions = await temporal_service.temporal_db_service.get_state_transitions_for_events(event_ids)
+            for row in events:
+                event_id = row.get('event', {}).get('event_id')
                 if event_id:
-                    lifecycle = await temporal_graphiti_service.get_event_lifecycle(event_id)
-                    if lifecycle:
-                        event['transitions'] = lifecycle.get('state_transitions', [])
-                enhanced_events.append(event)
-            events = enhanced_events
+                    row['transitions'] = transitions[event_id]
         
         return BaseResponse(
             success=True,
@@ -520,59 +594,56 @@ async def query_events_at_time_point(request: TimePointQueryRequest):
         logger.error(f"Failed to query events at time point: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _ndjson_lines(records: List[Dict[str, Any]]):
+    """按块把记录编码为 NDJSON（每行一条），客户端可边接收边解析"""
+    for start in range(0, len(records), _NDJSON_CHUNK_SIZE):
+        yield _json_encoder.encode_lines(records[start:start + _NDJSON_CHUNK_SIZE])
+
 @router.post("/query/time-range", response_model=BaseResponse)
-async def query_events_in_time_range(request: TimeRangeQueryRequest):
-    """查询时间范围内的事件状态转换"""
+async def query_events_in_time_range(
+    request: TimeRangeQueryRequest,
+    http_request: Request,
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
+    """查询时间范围内的事件状态转换
+
+    请求头 ``Accept: application/x-ndjson`` 且不需要生命周期分析时，转换记录以 NDJSON 流式返回，
+    每行一条；否则返回 BaseResponse 结构的 JSON。
+    """
     try:
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
-        # 获取时间范围内的状态转换
-        transitions = await temporal_graphiti_service.temporal_db_service.get_state_transitions_in_range(
+        # 获取时间范围内的状态转换，过滤条件由数据库执行
+        transitions = await temporal_service.temporal_db_service.get_state_transitions_in_range(
             start_time=request.start_time,
-            end_time=request.end_time
+            end_time=request.end_time,
+            event_types=request.event_types,
+            categories=request.categories,
+            to_states=request.states
         )
         
-        # 如果指定了过滤条件，进一步过滤
-        if request.event_types or request.categories or request.states:
-            filtered_transitions = []
-            for transition in transitions:
-                event_data = transition.get('event', {})
-                
-                # 检查事件类型
-                if request.event_types and event_data.get('event_type') not in request.event_types:
-                    continue
-                    
-                # 检查分类
-                if request.categories and event_data.get('category') not in request.categories:
-                    continue
-                    
-                # 检查状态
-                if request.states and transition.get('t', {}).get('to_state') not in request.states:
-                    continue
-                
-                filtered_transitions.append(transition)
-            
-            transitions = filtered_transitions
+        if not request.include_lifecycle and "application/x-ndjson" in http_request.headers.get("accept", ""):
+            return StreamingResponse(_ndjson_lines(transitions), media_type="application/x-ndjson")
         
         # 如果需要生命周期分析
         lifecycle_analysis = {}
         if request.include_lifecycle and transitions:
-            # 按事件分组分析
-            events_analysis = {}
-            for transition in transitions:
-                event_id = transition.get('event', {}).get('event_id')
-                if event_id and event_id not in events_analysis:
-                    lifecycle = await temporal_graphiti_service.get_event_lifecycle(event_id)
-                    if lifecycle:
-                        events_analysis[event_id] = lifecycle['lifecycle_analysis']
-            
-            lifecycle_analysis = events_analysis
+            # 按事件分组分析，各事件的生命周期并发获取
+            event_ids = list(dict.fromkeys(
+                event_id for transition in transitions
+                if (event_id := transition.get('event', {}).get('event_id'))
+            ))
+            lifecycles = await asyncio.gather(*[
+                temporal_service.get_event_lifecycle(event_id) for event_id in event_ids
+            ])
+            lifecycle_analysis = {
+                event_id: lifecycle['lifecycle_analysis']
+                for event_id, lifecycle in zip(event_ids, lifecycles)
+                if lifecycle
+            }
         
-        return BaseResponse(
-            success=True,
-            message=f"查询到时间范围 {request.start_time} 至 {request.end_time} 内的 {len(transitions)} 个状态转换",
-            data={
+        # 转换记录可能很多，直接以 msgspec 编码响应，跳过 BaseResponse 校验
+        return encoded_response(
+            f"查询到时间范围 {request.start_time} 至 {request.end_time} 内的 {len(transitions)} 个状态转换",
+            {
                 'start_time': request.start_time,
                 'end_time': request.end_time,
                 'transitions': transitions,
@@ -586,17 +657,16 @@ async def query_events_in_time_range(request: TimeRangeQueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/statistics/enhanced", response_model=BaseResponse)
-async def get_enhanced_statistics():
+async def get_enhanced_statistics(
+    temporal_service: TemporalGraphitiService = Depends(get_temporal_graphiti_service)
+):
     """获取增强的时序统计信息"""
     try:
-        if not temporal_graphiti_service.initialized:
-            await temporal_graphiti_service.initialize()
-        
         # 获取统计信息
-        stats = await temporal_graphiti_service.get_transition_statistics()
+        stats = await temporal_service.get_transition_statistics()
         
         # 获取失效规则统计
-        invalidation_engine = temporal_graphiti_service.transition_engine.invalidation_engine
+        invalidation_engine = temporal_service.transition_engine.invalidation_engine
         invalidation_stats = invalidation_engine.get_rule_statistics()
         
         return BaseResponse(
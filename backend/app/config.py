@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
 class Settings(BaseSettings):
     # API Settings
@@ -17,6 +18,12 @@ class Settings(BaseSettings):
     falkordb_port: int = 6380
     falkordb_password: str = "falkordb"
     falkordb_graph_name: str = "tkg_knowledge_graph"
+    # Event write-behind batching
+    falkordb_event_batch_size: int = 500
+    falkordb_event_flush_interval: float = 0.1
+    # Graph read-cache warming: once at startup, then every interval seconds (0 disables)
+    graph_cache_warm_interval: float = 300.0
+    graph_cache_warm_top_k: int = 20
     
     # OpenAI Settings
     openai_api_key: str = "sk-test-dummy-key"
@@ -33,4 +40,13 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings on first use and reuse them; tests can call get_settings.cache_clear()"""
+    return Settings()
+
+def __getattr__(name: str) -> Any:
+    # Back-compat for ``from .config import settings``
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
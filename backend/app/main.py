@@ -1,27 +1,79 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 from .api import knowledge, relations, query, chat, temporal, events, graph
+from .api.responses import MsgspecJSONResponse
 from .services.graphiti_service import GraphitiService
+from .services.temporal_graphiti_service import temporal_graphiti_service
+from .services.event_normalization_service import EventNormalizationService
+from .services.causality_engine import CausalityOrchestrator
+from .services.state_machine_service import StateManager
+from .services.event_deduplication_service import EventDeduplicationService
+from .services.falkor_event_writer import FalkorEventWriter
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    settings = get_settings()
     graphiti_service = GraphitiService()
     await graphiti_service.initialize()
     app.state.graphiti_service = graphiti_service
+    # Temporal endpoints rely on the shared service being ready; a failure here
+    # leaves it uninitialized (reported by /api/temporal/health/enhanced) rather
+    # than taking down the rest of the API
+    try:
+        await temporal_graphiti_service.initialize()
+    except RuntimeError as e:
+        logger.error(f"Temporal service unavailable: {e}")
+    # Process-wide singletons shared by request dependencies
+    app.state.falkordb_service = graphiti_service.falkordb
+    app.state.normalization_service = EventNormalizationService()
+    app.state.causality_orchestrator = CausalityOrchestrator()
+    state_manager = StateManager()
+    state_manager.start_worker()
+    app.state.state_manager = state_manager
+    app.state.deduplication_service = EventDeduplicationService()
+    event_writer = FalkorEventWriter(
+        graphiti_service.falkordb,
+        max_batch=settings.falkordb_event_batch_size,
+        flush_interval=settings.falkordb_event_flush_interval
+    )
+    event_writer.start()
+    app.state.event_writer = event_writer
+    cache_warmer = None
+    if settings.graph_cache_warm_interval > 0:
+        cache_warmer = asyncio.create_task(graph.run_graph_cache_warmer(
+            graphiti_service.falkordb,
+            interval=settings.graph_cache_warm_interval,
+            top_k=settings.graph_cache_warm_top_k
+        ))
     
     yield
     
     # Shutdown
+    if cache_warmer is not None:
+        cache_warmer.cancel()
+        try:
+            await cache_warmer
+        except asyncio.CancelledError:
+            pass
+    await state_manager.stop_worker()
+    await event_writer.close()
+    await temporal_graphiti_service.close()
     await graphiti_service.close()
 
 app = FastAPI(
     title="TKG Context Engine API",
     description="Time-aware Knowledge Graph Context Management System",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=MsgspecJSONResponse
 )
 
 # CORS middleware
@@ -31,6 +83,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include routers
@@ -40,6 +93,7 @@ app.include_router(query.router, prefix="/api/query", tags=["query"])
 app.include_router(chat.router, prefix="/api/chat", tags=["chat"])
 app.include_router(temporal.router, prefix="/api/temporal", tags=["temporal"])
 app.include_router(events.router, tags=["events"])
+app.include_router(graph.router, tags=["graph"])
 
 @app.get("/")
 async def root():
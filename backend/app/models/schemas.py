@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional, Dict, Any, List, Union
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from functools import cached_property, lru_cache
 import hashlib
 import json
 
@@ -11,6 +12,23 @@ class NodeType(str, Enum):
     CONCEPT = "concept"
     EPISODE = "episode"
 
+VALID_NODE_TYPES = frozenset(node_type.value for node_type in NodeType)
+
+def normalize_node_type(raw_type: Any) -> str:
+    """Normalize node type from various formats (e.g. "NodeType.ENTITY") to a valid enum value"""
+    if not isinstance(raw_type, str):
+        return 'entity'
+    # Fast path: already a plain valid type
+    if raw_type in VALID_NODE_TYPES:
+        return raw_type
+    return _normalize_node_type_str(raw_type)
+
+@lru_cache(maxsize=512)
+def _normalize_node_type_str(raw_type: str) -> str:
+    # One pass over the segment after the last '.', minus any "nodetype" prefix
+    node_type = raw_type.rpartition('.')[2].lower().replace('nodetype', '')
+    return node_type if node_type in VALID_NODE_TYPES else 'entity'
+
 class RelationType(str, Enum):
     RELATED_TO = "related_to"
     CAUSES = "causes"
@@ -45,7 +63,6 @@ class TimeInterval(BaseModel):
     
     def _normalize_datetime(self, dt: datetime) -> datetime:
         """Normalize datetime to UTC and make timezone-aware if needed"""
-        from datetime import timezone
         if dt.tzinfo is None:
             return dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
@@ -67,9 +84,8 @@ class TimeInterval(BaseModel):
     
     def get_validity_state(self, current_time: Optional[datetime] = None) -> TemporalValidityState:
         """Get current validity state"""
-        from datetime import timezone
         if current_time is None:
-            current_time = datetime.utcnow()
+            current_time = datetime.now(timezone.utc)
         
         # Normalize current_time
         current_time = self._normalize_datetime(current_time)
@@ -167,6 +183,12 @@ class ComponentType(str, Enum):
 # 统一事件Schema - 核心数据模型
 # =============================================================================
 
+def truncate_text(text: str, limit: int) -> str:
+    """截断文本用于展示，超出 limit 时以 ... 结尾"""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + "..."
+
 class UnifiedEvent(BaseModel):
     """统一事件Schema - 基于设计文档规范"""
     
@@ -214,6 +236,16 @@ class UnifiedEvent(BaseModel):
         use_enum_values = True
         validate_assignment = True
     
+    @cached_property
+    def message_preview(self) -> str:
+        """消息预览（前200字符），首次访问时计算并缓存在实例上"""
+        return truncate_text(self.message, 200)
+    
+    @cached_property
+    def message_summary(self) -> str:
+        """消息摘要（前100字符），首次访问时计算并缓存在实例上"""
+        return truncate_text(self.message, 100)
+    
     @validator('fingerprint', pre=True, always=True)
     def generate_fingerprint(cls, v, values):
         """自动生成事件指纹"""
@@ -228,7 +260,7 @@ class UnifiedEvent(BaseModel):
             values.get('message', '')
         ]
         template = '|'.join(str(part) for part in template_parts)
-        return hashlib.md5(template.encode()).hexdigest()[:16]
+        return hashlib.blake2b(template.encode(), digest_size=8).hexdigest()
     
     @validator('event_id', pre=True, always=True)
     def generate_event_id(cls, v):
@@ -240,13 +272,22 @@ class UnifiedEvent(BaseModel):
         import uuid
         return f"evt_{uuid.uuid4().hex[:16]}"
 
+    @validator('timestamp', 'observed_start', 'observed_end')
+    def normalize_to_utc(cls, v):
+        """无时区的时间按 UTC 处理，统一转换为带时区的 UTC 时间"""
+        if v is None:
+            return v
+        if v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v.astimezone(timezone.utc)
+
 class UnifiedEventCreate(BaseModel):
     """创建统一事件的请求模型"""
     event_type: EventType
     severity: EventSeverity = Field(default=EventSeverity.INFO)
     confidence: float = Field(default=1.0, ge=0.0, le=1.0)
     
-    timestamp: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    timestamp: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
     observed_start: Optional[datetime] = None
     observed_end: Optional[datetime] = None
     
@@ -272,9 +313,18 @@ class UnifiedEventCreate(BaseModel):
     
     ttl_sec: Optional[int] = Field(default=3600)
 
+    @validator('timestamp', 'observed_start', 'observed_end')
+    def normalize_to_utc(cls, v):
+        """无时区的时间按 UTC 处理，统一转换为带时区的 UTC 时间"""
+        if v is None:
+            return v
+        if v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v.astimezone(timezone.utc)
+
 class UnifiedEventResponse(UnifiedEvent):
     """统一事件响应模型"""
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: Optional[datetime] = None
     
     # 时效状态
@@ -399,7 +449,7 @@ class TemporalQueryResult(BaseModel):
     confidence: float
     explanation: str
     # Temporal query metadata
-    query_time: datetime = Field(default_factory=datetime.utcnow)
+    query_time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     temporal_scope: Optional[str] = Field(None, description="Description of temporal scope")
     validity_summary: Optional[Dict[str, int]] = Field(None, description="Count by validity state")
 
@@ -412,7 +462,7 @@ class QueryResult(BaseModel):
 class ChatMessage(BaseModel):
     role: str = Field(..., description="Message role: user, assistant, system")
     content: str = Field(..., description="Message content")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class ChatRequest(BaseModel):
     message: str = Field(..., description="User message")
@@ -428,4 +478,4 @@ class BaseResponse(BaseModel):
     success: bool = Field(..., description="请求是否成功")
     message: Optional[str] = Field(None, description="响应消息")
     data: Optional[Any] = Field(None, description="响应数据")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="响应时间戳")
\ No newline at end of file
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="响应时间戳")
\ No newline at end of file
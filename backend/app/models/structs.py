@@ -0,0 +1,58 @@
+"""
+msgspec wire-format structs mirroring the pydantic response schemas.
+
+Used on hot read paths where the payload is built from trusted graph output and
+encoded directly, skipping pydantic validation. Structs are slotted and created
+with gc=False: they only hold plain JSON-like values, so they never form
+reference cycles and need no GC tracking.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import msgspec
+
+
+class NodeStruct(msgspec.Struct, gc=False):
+    """Mirror of KnowledgeNodeResponse"""
+    id: str
+    name: str
+    type: str
+    content: str
+    properties: Dict[str, Any]
+    created_at: Any
+    updated_at: Any = None
+    valid_time: Any = None
+    effective_time: Any = None
+    validity_state: Optional[str] = None
+    version: Optional[int] = 1
+
+
+class RelationStruct(msgspec.Struct, gc=False):
+    """Mirror of RelationResponse"""
+    id: str
+    source_id: str
+    target_id: str
+    relation_type: str
+    description: Optional[str]
+    weight: float
+    properties: Dict[str, Any]
+    created_at: Any
+    updated_at: Any = None
+    valid_time: Any = None
+    effective_time: Any = None
+    validity_state: Optional[str] = None
+
+
+class QueryResultStruct(msgspec.Struct, gc=False):
+    """Mirror of QueryResult"""
+    nodes: List[NodeStruct]
+    relations: List[RelationStruct]
+    confidence: float
+    explanation: str
+
+
+class ChatResponseStruct(msgspec.Struct, gc=False):
+    """Mirror of ChatResponse"""
+    response: str
+    session_id: str
+    query_result: Optional[QueryResultStruct] = None
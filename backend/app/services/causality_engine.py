@@ -148,6 +148,8 @@ class TopologyBasedCausalityEngine(BaseCausalityEngine):
     def __init__(self):
         super().__init__("Topology_Causality_Engine", CausalityMethod.TOPOLOGY)
         self.service_topology: Dict[str, ServiceTopology] = {}
+        # 拓扑版本号：拓扑变更时递增，用于生成拓扑接口的 ETag
+        self.topology_version = 0
         self._initialize_rules()
         self._initialize_topology()
     
@@ -206,6 +208,11 @@ class TopologyBasedCausalityEngine(BaseCausalityEngine):
         for topo in topologies:
             self.service_topology[topo.service_name] = topo
     
+    def update_service_topology(self, topology: ServiceTopology):
+        """新增或更新服务拓扑"""
+        self.service_topology[topology.service_name] = topology
+        self.topology_version += 1
+    
     async def infer_causality(self, events: List[UnifiedEvent]) -> List[CausalityRelation]:
         """基于服务拓扑推理因果关系"""
         causality_relations = []
@@ -536,8 +543,11 @@ class CausalityOrchestrator:
     
     def __init__(self):
         self.engines: List[BaseCausalityEngine] = []
+        self.engines_by_name: Dict[str, BaseCausalityEngine] = {}
         self.enabled = True
         self.min_confidence_threshold = 0.5
+        # 配置版本号：引擎开关或阈值变化时递增，用于生成状态接口的 ETag
+        self.config_version = 0
         
         # 初始化推理引擎
         self._initialize_engines()
@@ -549,9 +559,15 @@ class CausalityOrchestrator:
             TraceBasedCausalityEngine(), 
             PatternBasedCausalityEngine()
         ]
+        self.engines_by_name = {engine.name: engine for engine in self.engines}
     
-    async def infer_causality_relations(self, events: List[UnifiedEvent]) -> List[CausalityRelation]:
-        """推理事件间的因果关系"""
+    async def infer_causality_relations(self, events: List[UnifiedEvent],
+                                        min_confidence: Optional[float] = None) -> List[CausalityRelation]:
+        """推理事件间的因果关系
+
+        min_confidence 仅作用于本次调用（默认使用实例阈值），不修改共享的编排器状态
+        """
+        threshold = self.min_confidence_threshold if min_confidence is None else min_confidence
         if not self.enabled or len(events) < 2:
             return []
         
@@ -574,7 +590,7 @@ class CausalityOrchestrator:
                 print(f"因果推理引擎异常: {result}")
         
         # 过滤低置信度关系
-        filtered_relations = [r for r in final_relations if r.confidence >= self.min_confidence_threshold]
+        filtered_relations = [r for r in final_relations if r.confidence >= threshold]
         
         # 去重（相同的因果对只保留置信度最高的）
         deduplicated_relations = self._deduplicate_relations(filtered_relations)
@@ -646,18 +662,21 @@ class CausalityOrchestrator:
     
     def set_confidence_threshold(self, threshold: float):
         """设置置信度阈值"""
-        self.min_confidence_threshold = max(0.0, min(1.0, threshold))
+        threshold = max(0.0, min(1.0, threshold))
+        if threshold != self.min_confidence_threshold:
+            self.min_confidence_threshold = threshold
+            self.config_version += 1
     
     def enable_engine(self, engine_name: str):
         """启用指定引擎"""
-        for engine in self.engines:
-            if engine.name == engine_name:
-                engine.enabled = True
-                break
+        engine = self.engines_by_name.get(engine_name)
+        if engine and not engine.enabled:
+            engine.enabled = True
+            self.config_version += 1
     
     def disable_engine(self, engine_name: str):
         """禁用指定引擎"""
-        for engine in self.engines:
-            if engine.name == engine_name:
-                engine.enabled = False
-                break
\ No newline at end of file
+        engine = self.engines_by_name.get(engine_name)
+        if engine and engine.enabled:
+            engine.enabled = False
+            self.config_version += 1
\ No newline at end of file
@@ -5,7 +5,7 @@
 """
 
 from typing import Dict, List, Any, Optional, Tuple, Callable
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from abc import ABC, abstractmethod
 from enum import Enum
 import asyncio
@@ -165,7 +165,7 @@ class SLOBreachInferenceEngine(BaseInferenceEngine):
                     event_type=EventType.SLO_BREACH,
                     severity=EventSeverity.CRITICAL,
                     confidence=0.9,
-                    timestamp=datetime.utcnow(),
+                    timestamp=datetime.now(timezone.utc),
                     source="derived_engine",
                     detection_method=DetectionMethod.THRESHOLD,
                     service=service,
@@ -214,7 +214,7 @@ class SLOBreachInferenceEngine(BaseInferenceEngine):
                     event_type=EventType.SLO_BREACH,
                     severity=EventSeverity.MAJOR,
                     confidence=0.85,
-                    timestamp=datetime.utcnow(),
+                    timestamp=datetime.now(timezone.utc),
                     source="derived_engine",
                     detection_method=DetectionMethod.THRESHOLD,
                     service=service,
@@ -318,14 +318,14 @@ class AnomalyInferenceEngine(BaseInferenceEngine):
             # 简化的异常检测：短时间内大量错误事件
             time_window = timedelta(minutes=rule.conditions['time_window_minutes'])
             recent_errors = [e for e in error_events 
-                           if e.timestamp >= (datetime.utcnow() - time_window)]
+                           if e.timestamp >= (datetime.now(timezone.utc) - time_window)]
             
             if len(recent_errors) >= 5:  # 5分钟内5个或更多错误事件
                 spike_event = UnifiedEventCreate(
                     event_type=EventType.ERROR_RATE_SPIKE,
                     severity=EventSeverity.MAJOR,
                     confidence=0.8,
-                    timestamp=datetime.utcnow(),
+                    timestamp=datetime.now(timezone.utc),
                     source="anomaly_engine",
                     detection_method=DetectionMethod.ANOMALY,
                     service=service,
@@ -378,7 +378,7 @@ class AnomalyInferenceEngine(BaseInferenceEngine):
                     event_type=EventType.SATURATION,
                     severity=EventSeverity.MAJOR,
                     confidence=0.9,
-                    timestamp=datetime.utcnow(),
+                    timestamp=datetime.now(timezone.utc),
                     source="anomaly_engine",
                     detection_method=DetectionMethod.THRESHOLD,
                     service=service,
@@ -405,7 +405,7 @@ class AnomalyInferenceEngine(BaseInferenceEngine):
                     event_type=EventType.SATURATION,
                     severity=EventSeverity.CRITICAL,  # 内存饱和比CPU更严重
                     confidence=0.95,
-                    timestamp=datetime.utcnow(),
+                    timestamp=datetime.now(timezone.utc),
                     source="anomaly_engine",
                     detection_method=DetectionMethod.THRESHOLD,
                     service=service,
@@ -503,7 +503,7 @@ class DerivedEventOrchestrator:
     
     def _get_inference_context(self, time_window_minutes: int = 30) -> List[UnifiedEvent]:
         """获取推理上下文（最近相关事件）"""
-        cutoff_time = datetime.utcnow() - timedelta(minutes=time_window_minutes)
+        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=time_window_minutes)
         return [e for e in self.event_history if e.timestamp >= cutoff_time]
     
     def _deduplicate_events(self, events: List[UnifiedEventCreate]) -> List[UnifiedEventCreate]:
@@ -10,12 +10,15 @@
 """
 
 import hashlib
+import heapq
 import json
+import re
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 
 from ..models.schemas import (
     UnifiedEvent, EventType, EventSeverity, 
@@ -23,6 +26,56 @@ from ..models.schemas import (
 )
 
 
+# 消息标准化使用的正则在模块加载时一次性编译，按原有顺序依次替换
+_NUMBER_PATTERN = re.compile(r'\d+')
+_TIMESTAMP_PATTERNS = (
+    re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}'),  # ISO timestamp
+    re.compile(r'\d{2}:\d{2}:\d{2}'),  # Time only
+    re.compile(r'\d{4}/\d{2}/\d{2}'),  # Date slash format
+)
+_ID_PATTERNS = (
+    re.compile(r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}', re.IGNORECASE),  # UUID
+    re.compile(r'[a-f0-9]{32}', re.IGNORECASE),  # MD5
+    re.compile(r'[a-f0-9]{40}', re.IGNORECASE),  # SHA1
+    re.compile(r'id[:\s=]+[a-zA-Z0-9]+', re.IGNORECASE),  # ID fields
+)
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_TOKEN_PATTERN = re.compile(r'\w+')
+_STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were'})
+
+
+@lru_cache(maxsize=4096)
+def _normalize_message_cached(message: str, ignore_numbers: bool, ignore_timestamps: bool, ignore_ids: bool) -> str:
+    """标准化消息内容（按原始消息与配置开关缓存结果，重复消息直接命中）"""
+    normalized = message.lower()
+    
+    if ignore_numbers:
+        # 替换数字为占位符
+        normalized = _NUMBER_PATTERN.sub('<NUM>', normalized)
+    
+    if ignore_timestamps:
+        # 替换时间戳模式
+        for pattern in _TIMESTAMP_PATTERNS:
+            normalized = pattern.sub('<TIMESTAMP>', normalized)
+    
+    if ignore_ids:
+        # 替换ID模式
+        for pattern in _ID_PATTERNS:
+            normalized = pattern.sub('<ID>', normalized)
+    
+    # 移除多余空格
+    return _WHITESPACE_PATTERN.sub(' ', normalized).strip()
+
+
+@lru_cache(maxsize=4096)
+def _tokenize_message_cached(message: str) -> Tuple[str, ...]:
+    """将消息分词用于相似度计算：按空格和标点分割，并移除停用词"""
+    return tuple(
+        token for token in _TOKEN_PATTERN.findall(message.lower())
+        if token not in _STOP_WORDS and len(token) > 2
+    )
+
+
 class DeduplicationStrategy(Enum):
     """去重策略枚举"""
     EXACT_MATCH = "exact_match"          # 完全匹配
@@ -55,6 +108,26 @@ class FingerprintConfig:
     ignore_numbers: bool = True  # 忽略数字差异
     ignore_timestamps: bool = True  # 忽略时间戳
     ignore_ids: bool = True  # 忽略ID类字符串
+    
+    # 预指纹缓存：原始字段 -> 模糊指纹，重复出现的事件跳过消息标准化
+    prefingerprint_cache_size: int = 10000
+    
+    # 是否在分组中保留每一条重复事件；关闭后只累计计数和聚合数据
+    keep_duplicate_events: bool = True
+
+
+@dataclass(frozen=True)
+class PreprocessedEvent:
+    """指纹计算所需字段的预处理结果（枚举已转为字符串），多个策略共用"""
+    event_type: str
+    severity: str
+    component_type: str
+    service: str
+    component: str
+    namespace: str
+    cluster: str
+    message: str
+    timestamp: datetime
 
 
 @dataclass
@@ -63,19 +136,23 @@ class EventGroup:
     fingerprint: str
     canonical_event: UnifiedEvent  # 代表事件
     events: List[UnifiedEvent] = field(default_factory=list)
-    first_seen: datetime = field(default_factory=datetime.utcnow)
-    last_seen: datetime = field(default_factory=datetime.utcnow)
+    first_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    last_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     occurrence_count: int = 0
     aggregated_data: Dict[str, Any] = field(default_factory=dict)
 
 
+def _occurrence_count(group: EventGroup) -> int:
+    return group.occurrence_count
+
+
 class EventDeduplicationService:
     """事件去重服务"""
     
     def __init__(self, config: FingerprintConfig = None):
         self.config = config or FingerprintConfig()
         self.event_groups: Dict[str, EventGroup] = {}
-        self.fingerprint_cache: Dict[str, str] = {}
+        self.fingerprint_cache: Dict[Tuple[str, ...], str] = {}
         
         # 统计信息
         self.stats = {
@@ -96,159 +173,155 @@ class EventDeduplicationService:
         Returns:
             生成的指纹字符串
         """
+        return self.fingerprint_from_preprocessed(self.preprocess(event), strategy)
+    
+    def preprocess(self, event: UnifiedEvent) -> PreprocessedEvent:
+        """
+        提取各策略共用的指纹字段
+        
+        对同一事件计算多种策略的指纹时，先调用一次本方法，再对每个策略调用
+        fingerprint_from_preprocessed；消息标准化与分词结果按消息内容缓存，
+        各策略只需计算各自的哈希。
+        """
+        # 安全地获取枚举值
+        return PreprocessedEvent(
+            event_type=event.event_type.value if hasattr(event.event_type, 'value') else str(event.event_type),
+            severity=event.severity.value if hasattr(event.severity, 'value') else str(event.severity),
+            component_type=event.component_type.value if hasattr(event.component_type, 'value') else str(event.component_type),
+            service=event.service,
+            component=event.component,
+            namespace=event.namespace,
+            cluster=event.cluster,
+            message=event.message,
+            timestamp=event.timestamp
+        )
+    
+    def fingerprint_from_preprocessed(self, pre: PreprocessedEvent, strategy: DeduplicationStrategy = DeduplicationStrategy.FUZZY_MATCH) -> str:
+        """基于预处理结果生成指定策略的指纹"""
         if strategy == DeduplicationStrategy.EXACT_MATCH:
-            return self._generate_exact_fingerprint(event)
+            return self._generate_exact_fingerprint(pre)
         elif strategy == DeduplicationStrategy.FUZZY_MATCH:
-            return self._generate_fuzzy_fingerprint(event)
+            return self._generate_fuzzy_fingerprint(pre)
         elif strategy == DeduplicationStrategy.TIME_WINDOW:
-            return self._generate_time_window_fingerprint(event)
+            return self._generate_time_window_fingerprint(pre)
         elif strategy == DeduplicationStrategy.SIMILARITY_BASED:
-            return self._generate_similarity_fingerprint(event)
+            return self._generate_similarity_fingerprint(pre)
         else:
-            return self._generate_fuzzy_fingerprint(event)  # 默认策略
+            return self._generate_fuzzy_fingerprint(pre)  # 默认策略
     
-    def _generate_exact_fingerprint(self, event: UnifiedEvent) -> str:
+    def _generate_exact_fingerprint(self, pre: PreprocessedEvent) -> str:
         """生成精确匹配指纹"""
         # 包含所有关键字段的完整指纹
-        # 安全地获取枚举值
-        event_type_val = event.event_type.value if hasattr(event.event_type, 'value') else str(event.event_type)
-        component_type_val = event.component_type.value if hasattr(event.component_type, 'value') else str(event.component_type)
-        severity_val = event.severity.value if hasattr(event.severity, 'value') else str(event.severity)
-        
         fingerprint_parts = [
-            event_type_val,
-            event.service,
-            event.component,
-            component_type_val,
-            event.namespace,
-            event.cluster,
-            event.message,
-            severity_val
+            pre.event_type,
+            pre.service,
+            pre.component,
+            pre.component_type,
+            pre.namespace,
+            pre.cluster,
+            pre.message,
+            pre.severity
         ]
         
         fingerprint_data = "|".join(str(part) for part in fingerprint_parts)
-        return hashlib.sha256(fingerprint_data.encode()).hexdigest()[:16]
+        return hashlib.blake2b(fingerprint_data.encode(), digest_size=8).hexdigest()
     
-    def _generate_fuzzy_fingerprint(self, event: UnifiedEvent) -> str:
+    def _generate_fuzzy_fingerprint(self, pre: PreprocessedEvent) -> str:
         """生成模糊匹配指纹（忽略时间戳、数字等动态内容）"""
-        # 标准化消息内容
-        normalized_message = self._normalize_message(event.message)
-        
-        # 安全地获取枚举值
-        event_type_val = event.event_type.value if hasattr(event.event_type, 'value') else str(event.event_type)
-        component_type_val = event.component_type.value if hasattr(event.component_type, 'value') else str(event.component_type)
-        severity_val = event.severity.value if hasattr(event.severity, 'value') else str(event.severity)
+        # 预指纹：原始字段完全相同的事件（高频重复告警的常态）直接命中缓存，
+        # 跳过正则标准化与哈希计算
+        raw_key = (
+            pre.event_type,
+            pre.service,
+            pre.component,
+            pre.component_type,
+            pre.namespace,
+            pre.severity,
+            pre.message
+        )
+        cached = self.fingerprint_cache.get(raw_key)
+        if cached is not None:
+            return cached
         
         fingerprint_parts = [
-            event_type_val,
-            event.service,
-            event.component,
-            component_type_val,
-            event.namespace,
-            normalized_message,
-            severity_val
+            pre.event_type,
+            pre.service,
+            pre.component,
+            pre.component_type,
+            pre.namespace,
+            self._normalize_message(pre.message),
+            pre.severity
         ]
         
         fingerprint_data = "|".join(str(part) for part in fingerprint_parts)
-        return hashlib.sha256(fingerprint_data.encode()).hexdigest()[:16]
+        fingerprint = hashlib.blake2b(fingerprint_data.encode(), digest_size=8).hexdigest()
+        
+        if len(self.fingerprint_cache) >= self.config.prefingerprint_cache_size:
+            # 淘汰最早写入的条目
+            del self.fingerprint_cache[next(iter(self.fingerprint_cache))]
+        self.fingerprint_cache[raw_key] = fingerprint
+        return fingerprint
     
-    def _generate_time_window_fingerprint(self, event: UnifiedEvent) -> str:
+    def _generate_time_window_fingerprint(self, pre: PreprocessedEvent) -> str:
         """生成时间窗口指纹（将时间舍入到窗口边界）"""
         # 计算时间窗口
         window_minutes = self.config.time_window_minutes
-        timestamp_minutes = event.timestamp.minute // window_minutes * window_minutes
-        window_timestamp = event.timestamp.replace(minute=timestamp_minutes, second=0, microsecond=0)
-        
-        # 安全地获取枚举值
-        event_type_val = event.event_type.value if hasattr(event.event_type, 'value') else str(event.event_type)
+        timestamp_minutes = pre.timestamp.minute // window_minutes * window_minutes
+        window_timestamp = pre.timestamp.replace(minute=timestamp_minutes, second=0, microsecond=0)
         
         fingerprint_parts = [
-            event_type_val,
-            event.service,
-            event.component,
+            pre.event_type,
+            pre.service,
+            pre.component,
             window_timestamp.isoformat(),
-            self._normalize_message(event.message)
+            self._normalize_message(pre.message)
         ]
         
         fingerprint_data = "|".join(str(part) for part in fingerprint_parts)
-        return hashlib.sha256(fingerprint_data.encode()).hexdigest()[:16]
+        return hashlib.blake2b(fingerprint_data.encode(), digest_size=8).hexdigest()
     
-    def _generate_similarity_fingerprint(self, event: UnifiedEvent) -> str:
+    def _generate_similarity_fingerprint(self, pre: PreprocessedEvent) -> str:
         """生成相似度匹配指纹（用于后续相似度计算）"""
         # 提取关键特征向量
-        # 安全地获取枚举值
-        event_type_val = event.event_type.value if hasattr(event.event_type, 'value') else str(event.event_type)
-        severity_val = event.severity.value if hasattr(event.severity, 'value') else str(event.severity)
-        
         features = {
-            "service": event.service,
-            "component": event.component,
-            "event_type": event_type_val,
-            "severity": severity_val,
-            "message_tokens": self._tokenize_message(event.message),
-            "namespace": event.namespace
+            "service": pre.service,
+            "component": pre.component,
+            "event_type": pre.event_type,
+            "severity": pre.severity,
+            "message_tokens": self._tokenize_message(pre.message),
+            "namespace": pre.namespace
         }
         
         # 生成特征指纹
         feature_str = json.dumps(features, sort_keys=True)
-        return hashlib.sha256(feature_str.encode()).hexdigest()[:16]
+        return hashlib.blake2b(feature_str.encode(), digest_size=8).hexdigest()
     
     def _normalize_message(self, message: str) -> str:
         """标准化消息内容，移除动态部分"""
-        import re
-        
-        normalized = message.lower()
-        
-        if self.config.ignore_numbers:
-            # 替换数字为占位符
-            normalized = re.sub(r'\d+', '<NUM>', normalized)
-        
-        if self.config.ignore_timestamps:
-            # 替换时间戳模式
-            timestamp_patterns = [
-                r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}',  # ISO timestamp
-                r'\d{2}:\d{2}:\d{2}',  # Time only
-                r'\d{4}/\d{2}/\d{2}',  # Date slash format
-            ]
-            for pattern in timestamp_patterns:
-                normalized = re.sub(pattern, '<TIMESTAMP>', normalized)
-        
-        if self.config.ignore_ids:
-            # 替换ID模式
-            id_patterns = [
-                r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}',  # UUID
-                r'[a-f0-9]{32}',  # MD5
-                r'[a-f0-9]{40}',  # SHA1
-                r'id[:\s=]+[a-zA-Z0-9]+',  # ID fields
-            ]
-            for pattern in id_patterns:
-                normalized = re.sub(pattern, '<ID>', normalized, flags=re.IGNORECASE)
-        
-        # 移除多余空格
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return _normalize_message_cached(
+            message,
+            self.config.ignore_numbers,
+            self.config.ignore_timestamps,
+            self.config.ignore_ids
+        )
     
     def _tokenize_message(self, message: str) -> List[str]:
         """将消息分词用于相似度计算"""
-        import re
-        
-        # 简单分词：按空格和标点分割
-        tokens = re.findall(r'\w+', message.lower())
-        
-        # 移除停用词
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were'}
-        filtered_tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
-        
-        return filtered_tokens
+        return list(_tokenize_message_cached(message))
     
-    def deduplicate_event(self, event: UnifiedEvent, strategy: DeduplicationStrategy = DeduplicationStrategy.FUZZY_MATCH) -> Tuple[bool, Optional[EventGroup]]:
+    def deduplicate_event(
+        self,
+        event: UnifiedEvent,
+        strategy: DeduplicationStrategy = DeduplicationStrategy.FUZZY_MATCH,
+        fingerprint: Optional[str] = None
+    ) -> Tuple[bool, Optional[EventGroup]]:
         """
         对事件进行去重处理
         
         Args:
             event: 待处理的事件
             strategy: 去重策略
+            fingerprint: 调用方已按同一策略算好的指纹，传入可避免重复计算
             
         Returns:
             Tuple[是否为重复事件, 事件分组]
@@ -256,7 +329,8 @@ class EventDeduplicationService:
         self.stats["total_events_processed"] += 1
         
         # 生成指纹
-        fingerprint = self.generate_fingerprint(event, strategy)
+        if fingerprint is None:
+            fingerprint = self.generate_fingerprint(event, strategy)
         
         # 检查是否已存在相同指纹的分组
         if fingerprint in self.event_groups:
@@ -281,7 +355,8 @@ class EventDeduplicationService:
     
     def _update_event_group(self, group: EventGroup, event: UnifiedEvent):
         """更新事件分组"""
-        group.events.append(event)
+        if self.config.keep_duplicate_events:
+            group.events.append(event)
         group.last_seen = event.timestamp
         group.occurrence_count += 1
         
@@ -309,7 +384,7 @@ class EventDeduplicationService:
         agg = group.aggregated_data
         
         # 严重程度统计
-        severity = event.severity.value
+        severity = event.severity.value if hasattr(event.severity, 'value') else str(event.severity)
         agg["severity_counts"][severity] = agg["severity_counts"].get(severity, 0) + 1
         
         # 数据源统计
@@ -317,7 +392,7 @@ class EventDeduplicationService:
         agg["source_counts"][source] = agg["source_counts"].get(source, 0) + 1
         
         # 检测方法统计
-        method = event.detection_method.value
+        method = event.detection_method.value if hasattr(event.detection_method, 'value') else str(event.detection_method)
         agg["detection_method_counts"][method] = agg["detection_method_counts"].get(method, 0) + 1
         
         # 时间分布（按小时统计）
@@ -325,7 +400,8 @@ class EventDeduplicationService:
         agg["time_distribution"][hour] = agg["time_distribution"].get(hour, 0) + 1
         
         # 受影响组件
-        agg["affected_components"].add(f"{event.component}:{event.component_type.value}")
+        component_type = event.component_type.value if hasattr(event.component_type, 'value') else str(event.component_type)
+        agg["affected_components"].add(f"{event.component}:{component_type}")
         
         # 相关链路追踪
         if event.trace_id:
@@ -350,12 +426,23 @@ class EventDeduplicationService:
         }
         return severity_levels.get(severity, 0)
     
-    def get_event_groups_by_frequency(self, min_frequency: int = 5) -> List[EventGroup]:
-        """获取高频事件分组"""
-        return [
-            group for group in self.event_groups.values() 
+    def get_event_groups_by_frequency(self, min_frequency: int = 5, limit: Optional[int] = None) -> List[EventGroup]:
+        """
+        获取高频事件分组，按出现次数降序
+        
+        指定 limit 时使用有界堆只保留前 limit 个分组，无需对全部分组排序。
+        """
+        candidates = (
+            group for group in self.event_groups.values()
             if group.occurrence_count >= min_frequency
-        ]
+        )
+        if limit is not None:
+            return heapq.nlargest(limit, candidates, key=_occurrence_count)
+        return sorted(candidates, key=_occurrence_count, reverse=True)
+    
+    def count_event_groups_by_frequency(self, min_frequency: int = 5) -> int:
+        """统计满足最小频次的分组数量"""
+        return sum(1 for group in self.event_groups.values() if group.occurrence_count >= min_frequency)
     
     def get_event_groups_in_time_window(self, start_time: datetime, end_time: datetime) -> List[EventGroup]:
         """获取时间窗口内的事件分组"""
@@ -366,7 +453,7 @@ class EventDeduplicationService:
     
     def cleanup_old_groups(self, ttl_hours: int = 24):
         """清理过期的事件分组"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=ttl_hours)
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
         old_fingerprints = [
             fingerprint for fingerprint, group in self.event_groups.items()
             if group.last_seen < cutoff_time
@@ -440,22 +527,18 @@ class EventDeduplicationService:
     
     def _get_top_frequent_groups(self, limit: int = 10) -> List[Dict[str, Any]]:
         """获取最频繁的事件分组"""
-        sorted_groups = sorted(
-            self.event_groups.values(),
-            key=lambda g: g.occurrence_count,
-            reverse=True
-        )[:limit]
+        sorted_groups = heapq.nlargest(limit, self.event_groups.values(), key=_occurrence_count)
         
         return [
             {
                 "fingerprint": group.fingerprint,
                 "occurrence_count": group.occurrence_count,
                 "canonical_event": {
-                    "event_type": group.canonical_event.event_type.value,
+                    "event_type": group.canonical_event.event_type.value if hasattr(group.canonical_event.event_type, 'value') else str(group.canonical_event.event_type),
                     "service": group.canonical_event.service,
                     "component": group.canonical_event.component,
-                    "message": group.canonical_event.message[:100] + "..." if len(group.canonical_event.message) > 100 else group.canonical_event.message,
-                    "severity": group.canonical_event.severity.value
+                    "message": group.canonical_event.message_summary,
+                    "severity": group.canonical_event.severity.value if hasattr(group.canonical_event.severity, 'value') else str(group.canonical_event.severity)
                 },
                 "first_seen": group.first_seen.isoformat(),
                 "last_seen": group.last_seen.isoformat(),
@@ -80,7 +80,7 @@ class BaseEventNormalizer(ABC):
             # 如果都失败，尝试ISO格式解析
             return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
         except:
-            return datetime.utcnow()
+            return datetime.now(timezone.utc)
 
 class PrometheusNormalizer(BaseEventNormalizer):
     """Prometheus指标数据标准化器"""
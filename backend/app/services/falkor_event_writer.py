@@ -0,0 +1,121 @@
+"""
+FalkorDB 事件批量写入器（write-behind）
+
+逐条 CREATE 会让每个事件独占一次 Redis 往返。写入器把短时间窗口内提交的
+事件属性攒成一批，用一条 UNWIND 查询写入：
+1. submit() 将事件放入队列并等待所属批次写入完成
+2. 后台任务攒满 max_batch 条或等待 flush_interval 秒后统一刷写
+3. 批次写入失败时，该批所有提交方都会收到同一个异常
+4. close() 不取消后台任务，而是通知其写完正在处理的批次后退出
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .falkordb_service import FalkorDBService
+from .query_cache import EVENTS_CACHE_SCOPE, bump_data_version
+
+logger = logging.getLogger(__name__)
+
+# close() 放入队列的停止标记：后台任务写完手上的批次后退出，而不是被取消
+_STOP = object()
+
+_BATCH_CREATE_CYPHER = """
+UNWIND $events AS ev
+CREATE (e:Event)
+SET e = ev
+RETURN e.event_id AS event_id
+"""
+
+
+class FalkorEventWriter:
+    """将事件节点写入合并为批量 UNWIND 查询"""
+
+    def __init__(self, falkor_service: FalkorDBService, max_batch: int = 500, flush_interval: float = 0.1):
+        self.falkor_service = falkor_service
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        # 元素为 (属性, future)，或 close() 放入的 _STOP
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """启动后台刷写任务（重复调用无副作用）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """通知后台任务写完当前批次后退出，再把队列中剩余的事件写完"""
+        if self._task is not None:
+            if not self._task.done():
+                self._queue.put_nowait(_STOP)
+            try:
+                await self._task
+            except Exception as e:
+                logger.error(f"Event writer task failed: {e}")
+            self._task = None
+
+        pending = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                pending.append(item)
+        for start in range(0, len(pending), self.max_batch):
+            await self._flush(pending[start:start + self.max_batch])
+
+    async def submit(self, props: Dict[str, Any]) -> None:
+        """提交一个事件节点的属性，在其所属批次写入完成后返回"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((props, future))
+        await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        try:
+            await self.falkor_service.execute_query(
+                _BATCH_CREATE_CYPHER,
+                params={"events": [props for props, _ in batch]}
+            )
+        except asyncio.CancelledError:
+            # 任务被外部取消：该批次已不会再写，让等待中的提交方失败而不是永远挂起
+            error = RuntimeError("Event writer cancelled before the batch was written")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+        except Exception as e:
+            logger.error(f"Batch event write failed ({len(batch)} events): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # 新事件已落库：只使依赖事件数据的读缓存失效，拓扑类查询缓存保留
+        bump_data_version(EVENTS_CACHE_SCOPE)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
@@ -1,8 +1,10 @@
+import json
 import uuid
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any, Tuple
-from ..config import settings
+from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,67 @@ except ImportError:
     FalkorDBClient = None
     FALKORDB_AVAILABLE = False
 
+# The FalkorDB client raises redis exceptions: ResponseError for query
+# errors, other RedisError subclasses for connection/transport failures.
+try:
+    from redis.exceptions import RedisError as FalkorDBError, ResponseError as FalkorDBQueryError
+except ImportError:
+    class FalkorDBError(Exception):
+        """Fallback base error when the redis client is not installed"""
+
+    class FalkorDBQueryError(FalkorDBError):
+        """Fallback query error when the redis client is not installed"""
+
+# Validity bounds are stored as ISO strings for display plus *_epoch
+# (integer UTC seconds) so validity statistics compare numbers without parsing.
+VALIDITY_FIELDS = ("valid_from", "valid_until")
+# Derived, storage-only properties that API responses must not expose
+INTERNAL_NODE_PROPERTIES = frozenset(f"{name}_epoch" for name in VALIDITY_FIELDS)
+
+def _validity_epoch(value: Any) -> Optional[int]:
+    """Convert a validity bound to UTC epoch seconds; naive values are treated as UTC"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+def _with_validity_epochs(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive *_epoch for every validity bound being written (None clears a stale epoch)"""
+    for name in VALIDITY_FIELDS:
+        if name in properties:
+            value = properties[name]
+            if isinstance(value, datetime):
+                properties[name] = value.isoformat()
+            properties[f"{name}_epoch"] = _validity_epoch(value)
+    return properties
+
+# Event lookups match on event_id/fingerprint, listings filter and sort on
+# timestamp/service; without these FalkorDB falls back to a label scan.
+EVENT_INDEX_QUERIES = (
+    "CREATE INDEX FOR (e:Event) ON (e.event_id)",
+    "CREATE INDEX FOR (e:Event) ON (e.fingerprint)",
+    "CREATE INDEX FOR (e:Event) ON (e.timestamp)",
+    "CREATE INDEX FOR (e:Event) ON (e.service)",
+)
+
+# Labels covered by the full-text index used for graph node search
+# (knowledge node types plus the managed-object graph labels).
+FULLTEXT_SEARCH_LABELS = (
+    "Entity", "Event", "Concept", "Episode",
+    "ManagedObject", "Service", "Dependency",
+)
+
+FULLTEXT_INDEX_QUERIES = tuple(
+    f"CALL db.idx.fulltext.createNodeIndex('{label}', 'name', 'label')"
+    for label in FULLTEXT_SEARCH_LABELS
+)
+
 class FalkorDBService:
     """FalkorDB service for graph database operations"""
     
@@ -33,6 +96,7 @@ class FalkorDBService:
             return
             
         try:
+            settings = get_settings()
             # Connect to FalkorDB
             self.db = FalkorDBClient(
                 host=settings.falkordb_host,
@@ -47,6 +111,7 @@ class FalkorDBService:
             result = self._execute_query_sync("RETURN 1 as test")
             if result:
                 self.connected = True
+                await self._ensure_indexes()
                 logger.info("FalkorDB service initialized successfully")
             else:
                 raise Exception("Connection test failed")
@@ -56,6 +121,16 @@ class FalkorDBService:
             self.connected = False
             self.use_mock = True
     
+    async def _ensure_indexes(self):
+        """Create the Event property indexes and the full-text indexes used by node search"""
+        for query in EVENT_INDEX_QUERIES + FULLTEXT_INDEX_QUERIES:
+            try:
+                await self._execute_query(query)
+                logger.debug(f"Created index: {query}")
+            except Exception as e:
+                # Index may already exist
+                logger.debug(f"Index creation skipped (may exist): {e}")
+
     def _execute_query_sync(self, query: str, params: Optional[Dict] = None) -> Any:
         """Execute a synchronous Cypher query on FalkorDB for initialization"""
         if self.use_mock:
@@ -99,13 +174,34 @@ class FalkorDBService:
                 raise RuntimeError("FalkorDB service not initialized")
             
             logger.debug(f"Executing query: {query}")
-            # FalkorDB query method is synchronous
-            result = self.graph.query(query, params or {})
+            # FalkorDB query method is synchronous; run it in a worker thread so
+            # it doesn't block the event loop and concurrent callers overlap
+            result = await asyncio.to_thread(self.graph.query, query, params or {})
             return result
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise
-    
+
+    async def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Execute a parameterized Cypher query and return rows as dicts keyed by column alias.
+
+        Values are passed via ``params`` so identical query strings share one
+        cached execution plan. Node and edge values are flattened to their
+        property dicts.
+        """
+        result = await self._execute_query(query, params)
+        if self.use_mock or not result or not result.result_set:
+            return []
+
+        columns = [column[1] for column in result.header]
+        return [
+            {
+                column: value.properties if hasattr(value, 'properties') else value
+                for column, value in zip(columns, row)
+            }
+            for row in result.result_set
+        ]
+
     async def create_node(self, node_type: str, properties: Dict[str, Any]) -> str:
         """Create a new node in the graph"""
         if self.use_mock:
@@ -116,11 +212,14 @@ class FalkorDBService:
         try:
             node_id = str(uuid.uuid4())
             properties['id'] = node_id
-            properties['created_at'] = datetime.utcnow().isoformat()
+            properties['created_at'] = datetime.now(timezone.utc).isoformat()
+            _with_validity_epochs(properties)
             
             # Build property string for Cypher query
             prop_strings = []
             for key, value in properties.items():
+                if value is None:
+                    continue
                 if isinstance(value, str):
                     prop_strings.append(f"{key}: '{value}'")
                 else:
@@ -159,33 +258,25 @@ class FalkorDBService:
             logger.error(f"Failed to get node {node_id}: {e}")
             raise
     
-    async def update_node(self, node_id: str, properties: Dict[str, Any]) -> bool:
-        """Update a node's properties"""
+    async def update_node(self, node_id: str, properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update a node's properties and return the updated node (None if it does not exist)"""
         if self.use_mock:
             logger.info(f"Mock updated node: {node_id}")
-            return True
+            return {'id': node_id, **properties}
             
         try:
-            properties['updated_at'] = datetime.utcnow().isoformat()
-            
-            # Build SET clause
-            set_clauses = []
-            for key, value in properties.items():
-                if isinstance(value, str):
-                    set_clauses.append(f"n.{key} = '{value}'")
-                else:
-                    set_clauses.append(f"n.{key} = {value}")
+            properties['updated_at'] = datetime.now(timezone.utc).isoformat()
+            _with_validity_epochs(properties)
             
-            set_str = ", ".join(set_clauses)
-            
-            query = f"MATCH (n) WHERE n.id = '{node_id}' SET {set_str} RETURN n.id"
-            result = await self._execute_query(query)
+            # Return the node from the same statement to avoid a read-after-write round trip
+            query = "MATCH (n) WHERE n.id = $node_id SET n += $props RETURN n"
+            result = await self._execute_query(query, {"node_id": node_id, "props": properties})
             
             if result and result.result_set:
                 logger.info(f"Updated node: {node_id}")
-                return True
+                return self._format_node(result.result_set[0][0])
             
-            return False
+            return None
         except Exception as e:
             logger.error(f"Failed to update node {node_id}: {e}")
             raise
@@ -206,8 +297,8 @@ class FalkorDBService:
             logger.error(f"Failed to delete node {node_id}: {e}")
             raise
     
-    async def search_nodes(self, query_text: str, node_type: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search nodes by text content"""
+    async def search_nodes(self, query_text: str, node_type: Optional[str] = None, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """Search nodes by text content, paginated server-side with SKIP/LIMIT in a stable (created_at, id) order"""
         if self.use_mock:
             # Return mock data for testing
             if query_text:
@@ -216,19 +307,19 @@ class FalkorDBService:
                 return []  # No mock results
         
         try:
+            if not query_text.strip():
+                return await self.list_nodes(node_type=node_type, limit=limit, offset=offset)
+            
             # Build search query
             match_clause = "MATCH (n)"
             if node_type:
                 match_clause = f"MATCH (n:{node_type})"
             
             # Simple text search in name and content properties
-            where_clause = f"WHERE n.name CONTAINS '{query_text}' OR n.content CONTAINS '{query_text}'"
-            
-            if not query_text.strip():
-                where_clause = ""  # Return all nodes if no query
+            where_clause = "WHERE n.name CONTAINS $q OR n.content CONTAINS $q"
             
-            query = f"{match_clause} {where_clause} RETURN n LIMIT {limit}"
-            result = await self._execute_query(query)
+            query = f"{match_clause} {where_clause} RETURN n ORDER BY n.created_at, n.id SKIP $offset LIMIT $limit"
+            result = await self._execute_query(query, {"q": query_text, "offset": offset, "limit": limit})
             
             nodes = []
             if result and result.result_set:
@@ -243,8 +334,88 @@ class FalkorDBService:
             logger.error(f"Failed to search nodes: {e}")
             raise
     
-    async def create_relationship(self, source_id: str, target_id: str, relation_type: str, properties: Optional[Dict[str, Any]] = None) -> str:
-        """Create a relationship between two nodes"""
+    async def list_nodes(self, node_type: Optional[str] = None, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """List nodes without any text filter, paginated server-side with SKIP/LIMIT in a stable (created_at, id) order"""
+        if self.use_mock:
+            return []
+        
+        try:
+            match_clause = f"MATCH (n:{node_type})" if node_type else "MATCH (n)"
+            query = f"{match_clause} RETURN n ORDER BY n.created_at, n.id SKIP $offset LIMIT $limit"
+            result = await self._execute_query(query, {"offset": offset, "limit": limit})
+            
+            nodes = []
+            if result and result.result_set:
+                for row in result.result_set:
+                    node_data = self._format_node(row[0])
+                    if node_data:
+                        nodes.append(node_data)
+            return nodes
+        except Exception as e:
+            logger.error(f"Failed to list nodes: {e}")
+            raise
+    
+    async def get_validity_bounds(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Return only the validity properties of up to ``limit`` nodes (missing values are None)"""
+        if self.use_mock:
+            return []
+        
+        try:
+            return await self.execute_query(
+                """
+                MATCH (n)
+                RETURN n.valid_from AS valid_from, n.valid_until AS valid_until,
+                       n.valid_from_epoch AS valid_from_epoch, n.valid_until_epoch AS valid_until_epoch
+                LIMIT $limit
+                """,
+                {"limit": limit}
+            )
+        except Exception as e:
+            logger.error(f"Failed to get validity bounds: {e}")
+            raise
+    
+    async def list_nodes_keyset(self, query_text: str = "", after_created_at: Optional[str] = None,
+                                after_id: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """List nodes newest first, resuming after the (created_at, id) of the previous page's last node"""
+        if self.use_mock:
+            return []
+        
+        try:
+            query = """
+            MATCH (n)
+            WHERE ($q = '' OR n.name CONTAINS $q OR n.content CONTAINS $q)
+              AND ($after_ts IS NULL OR n.created_at < $after_ts
+                   OR (n.created_at = $after_ts AND n.id < $after_id))
+            RETURN n
+            ORDER BY n.created_at DESC, n.id DESC
+            LIMIT $limit
+            """
+            result = await self._execute_query(query, {
+                "q": query_text,
+                "after_ts": after_created_at,
+                "after_id": after_id,
+                "limit": limit
+            })
+            
+            nodes = []
+            if result and result.result_set:
+                for row in result.result_set:
+                    node_data = self._format_node(row[0])
+                    if node_data:
+                        nodes.append(node_data)
+            return nodes
+        except Exception as e:
+            logger.error(f"Failed to list nodes: {e}")
+            raise
+    
+    async def create_relationship(self, source_id: str, target_id: str, relation_type: str,
+                                  properties: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Create a relationship between two nodes; returns None if either node does not exist"""
+        # Relationship types cannot be passed as query parameters, so only plain
+        # identifiers are interpolated
+        if not relation_type.isidentifier():
+            raise ValueError(f"Invalid relationship type: {relation_type!r}")
+        
         if self.use_mock:
             rel_id = str(uuid.uuid4())
             logger.info(f"Mock created relationship: {rel_id}")
@@ -252,39 +423,54 @@ class FalkorDBService:
             
         try:
             rel_id = str(uuid.uuid4())
-            rel_props = properties or {}
+            # Graph properties hold primitives and lists only; nested maps are stored as JSON text
+            rel_props = {
+                key: json.dumps(value) if isinstance(value, dict) else value
+                for key, value in (properties or {}).items()
+            }
             rel_props['id'] = rel_id
-            rel_props['created_at'] = datetime.utcnow().isoformat()
-            
-            # Build property string
-            prop_strings = []
-            for key, value in rel_props.items():
-                if isinstance(value, str):
-                    prop_strings.append(f"{key}: '{value}'")
-                else:
-                    prop_strings.append(f"{key}: {value}")
-            
-            prop_str = "{" + ", ".join(prop_strings) + "}" if prop_strings else ""
+            rel_props['created_at'] = datetime.now(timezone.utc).isoformat()
             
             query = f"""
-            MATCH (a) WHERE a.id = '{source_id}'
-            MATCH (b) WHERE b.id = '{target_id}'
-            CREATE (a)-[r:{relation_type} {prop_str}]->(b)
+            MATCH (a {{id: $source_id}}), (b {{id: $target_id}})
+            CREATE (a)-[r:{relation_type}]->(b)
+            SET r = $props
             RETURN r.id as id
             """
             
-            result = await self._execute_query(query)
+            result = await self._execute_query(query, {
+                "source_id": source_id,
+                "target_id": target_id,
+                "props": rel_props
+            })
             
-            if result and result.result_set:
-                logger.info(f"Created relationship: {rel_id}")
-                return rel_id
-            else:
-                raise Exception("Relationship creation failed")
+            if not result or not result.result_set:
+                logger.info(f"Relationship not created, missing node: {source_id} -> {target_id}")
+                return None
+            logger.info(f"Created relationship: {rel_id}")
+            return rel_id
                 
         except Exception as e:
             logger.error(f"Failed to create relationship: {e}")
             raise
     
+    async def delete_relationship(self, rel_id: str) -> bool:
+        """Delete a relationship by id; returns False if it does not exist"""
+        if self.use_mock:
+            logger.info(f"Mock deleted relationship: {rel_id}")
+            return True
+            
+        try:
+            query = "MATCH ()-[r]->() WHERE r.id = $rel_id DELETE r RETURN count(r) AS deleted"
+            result = await self._execute_query(query, {"rel_id": rel_id})
+            deleted = bool(result and result.result_set and result.result_set[0][0])
+            if deleted:
+                logger.info(f"Deleted relationship: {rel_id}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Failed to delete relationship {rel_id}: {e}")
+            raise
+    
     async def get_node_relationships(self, node_id: str) -> List[Dict[str, Any]]:
         """Get all relationships for a node"""
         if self.use_mock:
@@ -353,7 +539,8 @@ class FalkorDBService:
                 'type': properties.get('type', ''),
                 'content': properties.get('content', ''),
                 'properties': {k: v for k, v in properties.items() 
-                             if k not in ['id', 'name', 'type', 'content']},
+                             if k not in ['id', 'name', 'type', 'content']
+                             and k not in INTERNAL_NODE_PROPERTIES},
                 'created_at': properties.get('created_at', ''),
                 'updated_at': properties.get('updated_at')
             }
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from ..config import settings
 from .falkordb_service import FalkorDBService
+from .query_cache import bump_data_version
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +33,13 @@ class GraphitiService:
         if self.falkordb:
             await self.falkordb.close()
     
-    async def create_node(self, name: str, content: str, node_type: str = 'entity', properties: Optional[Dict[str, Any]] = None) -> str:
-        """Create a new node in the graph database"""
+    async def create_node(self, name: str, content: str, node_type: str = 'entity', properties: Optional[Dict[str, Any]] = None,
+                          cache_scope: Optional[str] = None) -> str:
+        """Create a new node in the graph database
+
+        ``cache_scope`` limits cache invalidation to one scope (e.g. EVENTS_CACHE_SCOPE
+        for event nodes); by default every cached read is invalidated.
+        """
         if not self.falkordb or not self.falkordb.connected:
             raise RuntimeError("FalkorDB service not available")
         
@@ -47,6 +53,7 @@ class GraphitiService:
                     **(properties or {})
                 }
             )
+            bump_data_version(cache_scope)
             logger.info(f"Created node: {node_id} of type {node_type}")
             return node_id
         except Exception as e:
@@ -66,8 +73,12 @@ class GraphitiService:
             raise
     
     async def update_node(self, node_id: str, name: Optional[str] = None, content: Optional[str] = None, 
-                         node_type: Optional[str] = None, properties: Optional[Dict[str, Any]] = None) -> bool:
-        """Update a node in the graph database"""
+                         node_type: Optional[str] = None, properties: Optional[Dict[str, Any]] = None,
+                         cache_scope: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Update a node in the graph database and return the updated node (None if not found)
+
+        ``cache_scope`` is passed to bump_data_version, as in create_node.
+        """
         if not self.falkordb or not self.falkordb.connected:
             raise RuntimeError("FalkorDB service not available")
         
@@ -83,12 +94,13 @@ class GraphitiService:
                 update_data.update(properties)
             
             if not update_data:
-                return True  # Nothing to update
+                return await self.get_node_by_id(node_id)  # Nothing to update
             
-            success = await self.falkordb.update_node(node_id, update_data)
-            if success:
+            node = await self.falkordb.update_node(node_id, update_data)
+            if node:
+                bump_data_version(cache_scope)
                 logger.info(f"Updated node: {node_id}")
-            return success
+            return node
         except Exception as e:
             logger.error(f"Failed to update node {node_id}: {e}")
             raise
@@ -101,25 +113,62 @@ class GraphitiService:
         try:
             success = await self.falkordb.delete_node(node_id)
             if success:
+                bump_data_version()
                 logger.info(f"Deleted node: {node_id}")
             return success
         except Exception as e:
             logger.error(f"Failed to delete node {node_id}: {e}")
             raise
     
-    async def search_nodes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def search_nodes(self, query: str, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
         """Search for nodes in the graph database"""
         if not self.falkordb or not self.falkordb.connected:
             raise RuntimeError("FalkorDB service not available")
         
         try:
-            nodes = await self.falkordb.search_nodes(query, limit=limit)
+            nodes = await self.falkordb.search_nodes(query, limit=limit, offset=offset)
             logger.info(f"Search returned {len(nodes)} nodes for query: {query}")
             return nodes
         except Exception as e:
             logger.error(f"Failed to search nodes: {e}")
             raise
     
+    async def list_nodes(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """List nodes with plain SKIP/LIMIT pagination and no search filter"""
+        if not self.falkordb or not self.falkordb.connected:
+            raise RuntimeError("FalkorDB service not available")
+        
+        try:
+            return await self.falkordb.list_nodes(limit=limit, offset=offset)
+        except Exception as e:
+            logger.error(f"Failed to list nodes: {e}")
+            raise
+    
+    async def get_validity_bounds(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Fetch just the validity properties of nodes, for aggregate validity statistics"""
+        if not self.falkordb or not self.falkordb.connected:
+            raise RuntimeError("FalkorDB service not available")
+        
+        try:
+            return await self.falkordb.get_validity_bounds(limit=limit)
+        except Exception as e:
+            logger.error(f"Failed to get validity bounds: {e}")
+            raise
+    
+    async def list_nodes_keyset(self, query: str, after_created_at: Optional[str], after_id: Optional[str],
+                                limit: int = 10) -> List[Dict[str, Any]]:
+        """List nodes newest first using keyset pagination"""
+        if not self.falkordb or not self.falkordb.connected:
+            raise RuntimeError("FalkorDB service not available")
+        
+        try:
+            return await self.falkordb.list_nodes_keyset(
+                query, after_created_at=after_created_at, after_id=after_id, limit=limit
+            )
+        except Exception as e:
+            logger.error(f"Failed to list nodes: {e}")
+            raise
+    
     async def get_node_relations(self, node_id: str) -> List[Dict[str, Any]]:
         """Get relations for a specific node"""
         if not self.falkordb or not self.falkordb.connected:
@@ -144,21 +193,38 @@ class GraphitiService:
             logger.error(f"Failed to get graph stats: {e}")
             return {'nodes': 0, 'relationships': 0}
     
-    async def create_relationship(self, source_id: str, target_id: str, relation_type: str, properties: Optional[Dict[str, Any]] = None) -> str:
-        """Create a relationship between two nodes"""
+    async def create_relationship(self, source_id: str, target_id: str, relation_type: str, properties: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Create a relationship between two nodes (None if either node does not exist)"""
         if not self.falkordb or not self.falkordb.connected:
             raise RuntimeError("FalkorDB service not available")
         
         try:
             rel_id = await self.falkordb.create_relationship(source_id, target_id, relation_type, properties)
-            logger.info(f"Created relationship: {rel_id}")
+            if rel_id:
+                bump_data_version()
+                logger.info(f"Created relationship: {rel_id}")
             return rel_id
         except Exception as e:
             logger.error(f"Failed to create relationship: {e}")
             raise
     
+    async def delete_relationship(self, rel_id: str) -> bool:
+        """Delete a relationship by id"""
+        if not self.falkordb or not self.falkordb.connected:
+            raise RuntimeError("FalkorDB service not available")
+        
+        try:
+            success = await self.falkordb.delete_relationship(rel_id)
+            if success:
+                bump_data_version()
+                logger.info(f"Deleted relationship: {rel_id}")
+            return success
+        except Exception as e:
+            logger.error(f"Failed to delete relationship {rel_id}: {e}")
+            raise
+    
     async def process_chat_query(self, message: str, session_id: str, limit: int = 20) -> Tuple[str, Optional[Dict[str, Any]]]:
-        """Process chat message and return response with knowledge graph results"""
+        """Process chat message and return response with knowledge graph results (errors propagate)"""
         try:
             # Search for relevant knowledge - use same search strategy as temporal queries
             nodes = await self.search_nodes(message, limit=limit * 2)  # Get more results initially
@@ -185,4 +251,4 @@ class GraphitiService:
             return response, query_result
         except Exception as e:
             logger.error(f"Failed to process chat query: {e}")
-            return "Sorry, I encountered an error processing your query.", None
\ No newline at end of file
+            raise
\ No newline at end of file
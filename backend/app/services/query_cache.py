@@ -0,0 +1,164 @@
+"""
+进程内查询结果缓存
+
+提供轻量的 TTL + LRU 缓存，用于缓存图查询等读多写少的结果：
+1. 基于 OrderedDict 的 LRU 淘汰与单调时钟 TTL 过期
+2. 按 key 的 asyncio.Lock 合并并发请求（singleflight），避免缓存击穿
+3. 全局数据版本号，写入路径调用 bump_data_version() 即可使所有缓存失效；
+   只影响某一类数据的写入可按作用域递增，其他作用域的缓存不受影响
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+_MISSING = object()
+
+# 全局数据版本号：拼入缓存 key，写入后递增即可让旧条目自然失效
+_data_version = 0
+# 未指定作用域的写入次数，以及各作用域各自的写入次数
+_unscoped_version = 0
+_scope_versions: Dict[str, int] = defaultdict(int)
+
+# 只写入事件节点、不改变图拓扑的写入路径使用的作用域
+EVENTS_CACHE_SCOPE = "events"
+
+
+def get_data_version(scope: Optional[str] = None) -> Union[int, Tuple[int, int]]:
+    """
+    获取当前数据版本号
+
+    不指定 scope 时任何写入都会改变返回值；指定 scope 时只有未限定作用域的写入
+    或该作用域内的写入才会改变返回值。
+    """
+    if scope is None:
+        return _data_version
+    return (_unscoped_version, _scope_versions[scope])
+
+
+def bump_data_version(scope: Optional[str] = None) -> int:
+    """图数据发生变更时调用；scope 为空时使全部缓存失效，否则只影响该作用域"""
+    global _data_version, _unscoped_version
+    _data_version += 1
+    if scope is None:
+        _unscoped_version += 1
+    else:
+        _scope_versions[scope] += 1
+    return _data_version
+
+
+class TTLCache:
+    """带过期时间的 LRU 缓存（单事件循环内使用，无需线程锁）"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _lookup(self, key: Hashable) -> Any:
+        """读取未过期的条目（不计入命中统计），未命中返回 _MISSING"""
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取缓存，过期条目视为未命中"""
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目；ttl 为空时使用缓存默认的过期时间"""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def purge_expired(self) -> int:
+        """清除已过期的条目（包括因数据版本变化已不可达的旧条目），返回清除数量"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "data_version": _data_version,
+            "unscoped_version": _unscoped_version,
+            "scope_versions": dict(_scope_versions)
+        }
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        命中则直接返回，否则调用 factory 计算并写入缓存。
+
+        同一 key 的并发请求只会执行一次 factory，其余请求等待结果。
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        lock = self._lock_for(key)
+        try:
+            async with lock:
+                # 等锁期间可能已由其他请求写入；复查不重复计入命中统计
+                value = self._lookup(key)
+                if value is _MISSING:
+                    value = await factory()
+                    self.set(key, value)
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    async def refresh(self, key: Hashable, factory: Callable[[], Awaitable[Any]],
+                      ttl: Optional[float] = None) -> Any:
+        """无论是否命中都重新计算并写入（用于预热，重置条目的过期时间，可单独指定 ttl）"""
+        lock = self._lock_for(key)
+        try:
+            async with lock:
+                value = await factory()
+                self.set(key, value, ttl)
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    def _lock_for(self, key: Hashable) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
@@ -5,18 +5,21 @@
 """
 
 from typing import Dict, List, Any, Optional, Set
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 import asyncio
 import json
+import logging
 
 from ..models.schemas import (
     UnifiedEvent, EventType, EventSeverity, 
     TemporalValidityState
 )
 
+logger = logging.getLogger(__name__)
+
 class ServiceHealthState(str, Enum):
     """服务健康状态"""
     HEALTHY = "healthy"
@@ -48,12 +51,12 @@ class ServiceCondition:
     # 状态机控制
     hold_duration_seconds: int = 0  # 防抖时间
     transition_count: int = 0       # 状态转换次数
-    last_updated: datetime = field(default_factory=datetime.utcnow)
+    last_updated: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     
     def is_active(self, current_time: Optional[datetime] = None) -> bool:
         """检查状态是否当前有效"""
         if current_time is None:
-            current_time = datetime.utcnow()
+            current_time = datetime.now(timezone.utc)
         
         if current_time < self.valid_from:
             return False
@@ -64,7 +67,7 @@ class ServiceCondition:
     def get_duration_seconds(self, current_time: Optional[datetime] = None) -> float:
         """获取状态持续时间"""
         if current_time is None:
-            current_time = datetime.utcnow()
+            current_time = datetime.now(timezone.utc)
         
         end_time = self.valid_to if self.valid_to else current_time
         return (end_time - self.valid_from).total_seconds()
@@ -97,7 +100,7 @@ class Episode:
     def get_duration_seconds(self, current_time: Optional[datetime] = None) -> float:
         """获取Episode持续时间"""
         if current_time is None:
-            current_time = datetime.utcnow()
+            current_time = datetime.now(timezone.utc)
             
         end_time = self.end_time if self.end_time else current_time
         return (end_time - self.start_time).total_seconds()
@@ -109,7 +112,7 @@ class Episode:
     
     def close(self, resolution_event_id: str, end_time: Optional[datetime] = None):
         """关闭Episode"""
-        self.end_time = end_time or datetime.utcnow()
+        self.end_time = end_time or datetime.now(timezone.utc)
         self.resolution_event_id = resolution_event_id
         self.status = EpisodeStatus.RESOLVED
         
@@ -212,7 +215,7 @@ class ServiceHealthStateMachine:
                 component=component,
                 status=ServiceHealthState.HEALTHY,
                 severity=EventSeverity.INFO,
-                valid_from=datetime.utcnow() - timedelta(days=1)  # 默认已经健康1天
+                valid_from=datetime.now(timezone.utc) - timedelta(days=1)  # 默认已经健康1天
             )
             self.current_conditions[component] = current_condition
         
@@ -251,7 +254,7 @@ class ServiceHealthStateMachine:
                     "rule": rule,
                     "event": event,
                     "condition": condition,
-                    "start_time": datetime.utcnow()
+                    "start_time": datetime.now(timezone.utc)
                 }
                 
                 # 设置定时器
@@ -260,7 +263,7 @@ class ServiceHealthStateMachine:
             else:
                 # 检查是否达到防抖时间
                 pending = self.pending_transitions[pending_key]
-                elapsed = (datetime.utcnow() - pending["start_time"]).total_seconds()
+                elapsed = (datetime.now(timezone.utc) - pending["start_time"]).total_seconds()
                 
                 if elapsed >= rule.hold_duration_seconds:
                     # 执行状态转换
@@ -279,7 +282,7 @@ class ServiceHealthStateMachine:
         old_state = condition.status
         new_state = rule.to_state
         component = condition.component
-        current_time = datetime.utcnow()
+        current_time = datetime.now(timezone.utc)
         
         # 关闭当前状态
         condition.valid_to = current_time
@@ -289,7 +292,7 @@ class ServiceHealthStateMachine:
             service_name=self.service_name,
             component=component,
             status=new_state,
-            severity=event.severity,
+            severity=EventSeverity(event.severity),
             valid_from=current_time,
             reason=event.message,
             evidence_event_ids=[event.event_id],
@@ -327,7 +330,7 @@ class ServiceHealthStateMachine:
                 service_name=self.service_name,
                 component=component,
                 start_time=event.timestamp,
-                max_severity=event.severity,
+                max_severity=EventSeverity(event.severity),
                 trigger_event_id=event.event_id
             )
             
@@ -338,7 +341,7 @@ class ServiceHealthStateMachine:
             episode_actions = {
                 "action": "episode_started",
                 "episode_id": episode.episode_id,
-                "severity": event.severity.value
+                "severity": EventSeverity(event.severity).value
             }
         
         # 转为健康状态 -> 关闭Episode
@@ -359,8 +362,8 @@ class ServiceHealthStateMachine:
         # 其他状态转换 -> 更新Episode严重程度
         elif component in self.active_episodes:
             episode = self.active_episodes[component]
-            if event.severity.value > episode.max_severity.value:
-                episode.max_severity = event.severity
+            if EventSeverity(event.severity).value > episode.max_severity.value:
+                episode.max_severity = EventSeverity(event.severity)
             
             episode.add_supporting_event(event.event_id)
             episode_actions = {
@@ -452,6 +455,44 @@ class StateManager:
     def __init__(self):
         self.service_state_machines: Dict[str, ServiceHealthStateMachine] = {}
         self.enabled = True
+        # 后台状态机处理队列：写入接口只负责入队，由单个worker按序处理
+        self._event_queue: "asyncio.Queue[UnifiedEvent]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+    
+    def start_worker(self):
+        """启动后台事件处理worker（重复调用无副作用）"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run_worker())
+    
+    async def stop_worker(self):
+        """停止worker，并处理完队列中剩余的事件"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        while not self._event_queue.empty():
+            await self._process_queued_event(self._event_queue.get_nowait())
+    
+    def enqueue_event(self, event: UnifiedEvent) -> int:
+        """将事件放入后台队列异步处理，返回当前队列长度"""
+        self.start_worker()
+        self._event_queue.put_nowait(event)
+        return self._event_queue.qsize()
+    
+    async def _run_worker(self):
+        while True:
+            event = await self._event_queue.get()
+            await self._process_queued_event(event)
+    
+    async def _process_queued_event(self, event: UnifiedEvent):
+        try:
+            await self.process_event(event)
+        except Exception as e:
+            logger.error(f"后台状态机处理事件 {event.event_id} 失败: {e}")
         
     async def process_event(self, event: UnifiedEvent) -> Optional[Dict[str, Any]]:
         """处理事件并更新相关服务状态"""
@@ -5,6 +5,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 from ..services.falkordb_service import FalkorDBService
+from .query_cache import EVENTS_CACHE_SCOPE, bump_data_version
 from ..models.temporal_schemas import TemporalEventNode, StateTransition, InvalidationCondition
 
 logger = logging.getLogger(__name__)
@@ -149,6 +150,8 @@ class TemporalDatabaseService:
         result = await self.falkordb.execute_query(create_query, {'props': event_props})
         
         if result and len(result) > 0:
+            # 时序事件写入后使事件相关的查询缓存失效
+            bump_data_version(EVENTS_CACHE_SCOPE)
             logger.info(f"Created temporal event: {event_id}")
             return event_id
         
@@ -212,35 +215,61 @@ class TemporalDatabaseService:
     async def get_state_transitions_in_range(self,
                                            start_time: str,
                                            end_time: str,
-                                           event_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """获取时间范围内的状态转换"""
+                                           event_id: Optional[str] = None,
+                                           event_types: Optional[List[str]] = None,
+                                           categories: Optional[List[str]] = None,
+                                           to_states: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """获取时间范围内的状态转换；事件类型、分类、目标状态过滤条件下推到数据库执行"""
         
         if event_id:
-            query = """
-            MATCH (event:TemporalEvent {event_id: $event_id})-[t:STATE_TRANSITION]->(event)
-            WHERE t.transition_time >= $start_time AND t.transition_time <= $end_time
-            RETURN event, t
-            ORDER BY t.transition_time ASC
-            """
-            params = {
-                'event_id': event_id,
-                'start_time': start_time,
-                'end_time': end_time
-            }
+            match_clause = "MATCH (event:TemporalEvent {event_id: $event_id})-[t:STATE_TRANSITION]->(event)"
         else:
-            query = """
-            MATCH (event:TemporalEvent)-[t:STATE_TRANSITION]->(event)
-            WHERE t.transition_time >= $start_time AND t.transition_time <= $end_time  
-            RETURN event, t
-            ORDER BY t.transition_time ASC
-            """
-            params = {
-                'start_time': start_time,
-                'end_time': end_time
-            }
+            match_clause = "MATCH (event:TemporalEvent)-[t:STATE_TRANSITION]->(event)"
+        
+        conditions = ["t.transition_time >= $start_time", "t.transition_time <= $end_time"]
+        params = {
+            'start_time': start_time,
+            'end_time': end_time
+        }
+        if event_id:
+            params['event_id'] = event_id
+        # 仅为实际给出的过滤条件生成谓词，查询文本组合有限，执行计划仍可复用
+        if event_types:
+            conditions.append("event.event_type IN $event_types")
+            params['event_types'] = event_types
+        if categories:
+            conditions.append("event.category IN $categories")
+            params['categories'] = categories
+        if to_states:
+            conditions.append("t.to_state IN $to_states")
+            params['to_states'] = to_states
+        
+        query = f"""
+        {match_clause}
+        WHERE {" AND ".join(conditions)}
+        RETURN event, t
+        ORDER BY t.transition_time ASC
+        """
         
         return await self.falkordb.execute_query(query, params)
     
+    async def get_state_transitions_for_events(self, event_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """一次查询批量获取多个事件的全部状态转换，按 event_id 分组（组内按转换时间升序）"""
+        transitions: Dict[str, List[Dict[str, Any]]] = {event_id: [] for event_id in event_ids}
+        if not event_ids:
+            return transitions
+        
+        query = """
+        MATCH (event:TemporalEvent)-[t:STATE_TRANSITION]->(event)
+        WHERE event.event_id IN $event_ids
+        RETURN event, t
+        ORDER BY t.transition_time ASC
+        """
+        rows = await self.falkordb.execute_query(query, {'event_ids': list(transitions)})
+        for row in rows:
+            transitions[row['event']['event_id']].append(row)
+        return transitions
+    
     async def update_event_state(self, event_id: str, 
                                new_state: str,
                                trigger: str,
@@ -292,4 +321,6 @@ class TemporalDatabaseService:
             'automatic': automatic
         })
         
+        if result:
+            bump_data_version(EVENTS_CACHE_SCOPE)
         return bool(result)
\ No newline at end of file
@@ -1,5 +1,6 @@
 # 状态转换引擎集成服务
 
+import asyncio
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
@@ -18,9 +19,17 @@ class TemporalGraphitiService:
         self.temporal_db_service = None
         self.transition_engine = None
         self.initialized = False
+        # 并发请求同时触发初始化时只执行一次
+        self._init_lock = asyncio.Lock()
     
     async def initialize(self):
-        """初始化所有服务组件"""
+        """初始化所有服务组件（幂等）"""
+        async with self._init_lock:
+            if self.initialized:
+                return
+            await self._initialize()
+    
+    async def _initialize(self):
         try:
             # 初始化原有的Graphiti服务
             self.graphiti_service = GraphitiService()
@@ -52,12 +61,13 @@ class TemporalGraphitiService:
             await self.graphiti_service.close()
     
     # 兼容原有GraphitiService接口
-    async def create_node(self, name: str, content: str, node_type: str = 'entity', properties: Optional[Dict[str, Any]] = None) -> str:
+    async def create_node(self, name: str, content: str, node_type: str = 'entity', properties: Optional[Dict[str, Any]] = None,
+                          cache_scope: Optional[str] = None) -> str:
         """创建节点（兼容模式）"""
         if not self.initialized:
             await self.initialize()
         
-        return await self.graphiti_service.create_node(name, content, node_type, properties)
+        return await self.graphiti_service.create_node(name, content, node_type, properties, cache_scope=cache_scope)
     
     async def get_node_by_id(self, node_id: str) -> Optional[Dict[str, Any]]:
         """获取节点（兼容模式）"""
@@ -66,7 +76,7 @@ class TemporalGraphitiService:
         
         return await self.graphiti_service.get_node_by_id(node_id)
     
-    async def update_node(self, node_id: str, **kwargs) -> bool:
+    async def update_node(self, node_id: str, **kwargs) -> Optional[Dict[str, Any]]:
         """更新节点（增强模式）"""
         if not self.initialized:
             await self.initialize()
@@ -86,12 +96,19 @@ class TemporalGraphitiService:
         
         return await self.graphiti_service.delete_node(node_id)
     
-    async def search_nodes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def search_nodes(self, query: str, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
         """搜索节点（兼容模式）"""
         if not self.initialized:
             await self.initialize()
         
-        return await self.graphiti_service.search_nodes(query, limit)
+        return await self.graphiti_service.search_nodes(query, limit, offset)
+    
+    async def list_nodes(self, limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """列出节点（兼容模式，无搜索条件）"""
+        if not self.initialized:
+            await self.initialize()
+        
+        return await self.graphiti_service.list_nodes(limit, offset)
     
     # 新增时序功能
     async def create_temporal_event(self, event_data: Dict[str, Any]) -> str:
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.services.falkor_event_writer import FalkorEventWriter
+
+
+class FakeFalkor:
+    """Records each batch write; optionally fails or delays them"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.batches = []
+
+    async def execute_query(self, query, params=None):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.batches.append([props["event_id"] for props in params["events"]])
+        return []
+
+
+def test_submissions_are_batched():
+    falkor = FakeFalkor()
+
+    async def run():
+        writer = FalkorEventWriter(falkor, max_batch=3, flush_interval=0.05)
+        await asyncio.gather(*(writer.submit({"event_id": i}) for i in range(7)))
+        await writer.close()
+
+    asyncio.run(run())
+    assert [len(batch) for batch in falkor.batches] == [3, 3, 1]
+    assert sorted(i for batch in falkor.batches for i in batch) == list(range(7))
+
+
+def test_batch_failure_reaches_every_submitter():
+    falkor = FakeFalkor(error=RuntimeError("write failed"))
+
+    async def run():
+        writer = FalkorEventWriter(falkor, max_batch=10, flush_interval=0.01)
+        results = await asyncio.gather(
+            *(writer.submit({"event_id": i}) for i in range(3)),
+            return_exceptions=True
+        )
+        await writer.close()
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_close_finishes_in_flight_batch():
+    falkor = FakeFalkor(delay=0.1)
+
+    async def run():
+        writer = FalkorEventWriter(falkor, max_batch=2, flush_interval=0.01)
+        submissions = [asyncio.create_task(writer.submit({"event_id": i})) for i in range(5)]
+        # Let the worker start writing the first batch, then close mid-write
+        await asyncio.sleep(0.05)
+        await writer.close()
+        await asyncio.wait_for(asyncio.gather(*submissions), timeout=1)
+
+    asyncio.run(run())
+    assert sorted(i for batch in falkor.batches for i in batch) == list(range(5))
+
+
+def test_cancelled_worker_fails_pending_submitters():
+    falkor = FakeFalkor(delay=1)
+
+    async def run():
+        writer = FalkorEventWriter(falkor, max_batch=10, flush_interval=0.01)
+        submission = asyncio.create_task(writer.submit({"event_id": 1}))
+        await asyncio.sleep(0.05)
+        writer._task.cancel()
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(submission, timeout=1)
+
+    asyncio.run(run())
@@ -0,0 +1,35 @@
+import base64
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.knowledge import _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = _encode_cursor({"created_at": "2026-01-01T00:00:00+00:00", "id": "node-1"})
+    assert tuple(_decode_cursor(cursor)) == ("2026-01-01T00:00:00+00:00", "node-1")
+
+
+def test_cursor_accepts_datetime_created_at():
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    cursor = _encode_cursor({"created_at": created_at, "id": "node-1"})
+    assert tuple(_decode_cursor(cursor)) == (created_at.isoformat(), "node-1")
+
+
+def test_cursor_is_url_safe():
+    cursor = _encode_cursor({"created_at": "2026-01-01T00:00:00+00:00", "id": "???>>>"})
+    assert "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'["only-one"]').decode(),
+    base64.urlsafe_b64encode(b"42").decode(),
+])
+def test_invalid_cursor_is_rejected_with_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        _decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
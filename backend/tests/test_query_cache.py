@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+from app.services.query_cache import (
+    EVENTS_CACHE_SCOPE,
+    TTLCache,
+    bump_data_version,
+    get_data_version,
+)
+
+
+def test_get_set_and_hit_stats():
+    cache = TTLCache(maxsize=4, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    cache = TTLCache(ttl=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("a", 1)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(monkeypatch):
+    cache = TTLCache(ttl=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("short", 1)
+    cache.set("long", 2, ttl=100)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 50)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.purge_expired() == 0
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_get_or_set_runs_factory_once_for_concurrent_callers():
+    cache = TTLCache(ttl=60)
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_set("k", factory) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert calls == 1
+    # One lookup per call: the re-check under the lock is not counted again
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 5)
+    assert not cache._locks
+
+
+def test_get_or_set_does_not_cache_failures():
+    cache = TTLCache(ttl=60)
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    async def ok():
+        return 1
+
+    async def run():
+        try:
+            await cache.get_or_set("k", failing)
+        except RuntimeError:
+            pass
+        return await cache.get_or_set("k", ok)
+
+    assert asyncio.run(run()) == 1
+
+
+def test_refresh_recomputes_cached_entries():
+    cache = TTLCache(ttl=60)
+    cache.set("k", "stale")
+
+    async def factory():
+        return "fresh"
+
+    assert asyncio.run(cache.refresh("k", factory)) == "fresh"
+    assert cache.get("k") == "fresh"
+
+
+def test_scoped_bump_leaves_other_scopes_untouched():
+    topology_before = get_data_version("topology")
+    events_before = get_data_version(EVENTS_CACHE_SCOPE)
+    global_before = get_data_version()
+
+    bump_data_version(EVENTS_CACHE_SCOPE)
+
+    assert get_data_version("topology") == topology_before
+    assert get_data_version(EVENTS_CACHE_SCOPE) != events_before
+    assert get_data_version() == global_before + 1
+
+
+def test_unscoped_bump_invalidates_every_scope():
+    topology_before = get_data_version("topology")
+    events_before = get_data_version(EVENTS_CACHE_SCOPE)
+
+    bump_data_version()
+
+    assert get_data_version("topology") != topology_before
+    assert get_data_version(EVENTS_CACHE_SCOPE) != events_before
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+from app.api.temporal import _build_validity_index
+
+
+def epoch(value: str) -> float:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+ROWS = [
+    {},  # untimed: counted as valid
+    {"valid_from": "2026-01-01T00:00:00"},
+    {"valid_from": "2026-01-01T00:00:00", "valid_until": "2026-06-01T00:00:00"},
+    {"valid_from": "2026-03-01T00:00:00", "valid_until": "2026-12-01T00:00:00"},
+    {"valid_until": "2026-02-01T00:00:00"},
+    {"valid_from": "2026-05-01T00:00:00", "valid_until": "2026-04-01T00:00:00"},  # inverted
+    {"valid_from": "not a date"},
+]
+
+
+def test_counts_at_each_boundary_region():
+    index = _build_validity_index(ROWS)
+    assert index.total_nodes == len(ROWS)
+
+    assert index.counts_at(epoch("2025-12-01T00:00:00")) == {
+        "valid": 2, "invalid": 0, "pending": 3, "expired": 0, "unknown": 2
+    }
+    assert index.counts_at(epoch("2026-04-01T00:00:00")) == {
+        "valid": 4, "invalid": 0, "pending": 0, "expired": 1, "unknown": 2
+    }
+    assert index.counts_at(epoch("2027-01-01T00:00:00")) == {
+        "valid": 2, "invalid": 0, "pending": 0, "expired": 3, "unknown": 2
+    }
+
+
+def test_counts_at_exact_bounds_are_valid():
+    index = _build_validity_index([
+        {"valid_from": "2026-01-01T00:00:00", "valid_until": "2026-02-01T00:00:00"}
+    ])
+    assert index.counts_at(epoch("2026-01-01T00:00:00"))["valid"] == 1
+    assert index.counts_at(epoch("2026-02-01T00:00:00"))["valid"] == 1
+
+
+def test_epoch_properties_take_precedence_over_iso_strings():
+    index = _build_validity_index([
+        {"valid_from": "2026-01-01T00:00:00", "valid_from_epoch": epoch("2030-01-01T00:00:00")}
+    ])
+    assert index.counts_at(epoch("2027-01-01T00:00:00"))["pending"] == 1
+
+
+def test_aware_timestamps_are_compared_in_utc():
+    index = _build_validity_index([{"valid_from": "2026-01-01T08:00:00+08:00"}])
+    assert index.counts_at(epoch("2026-01-01T00:00:00"))["valid"] == 1
+    assert index.counts_at(epoch("2025-12-31T23:59:59"))["pending"] == 1